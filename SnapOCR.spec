@@ -12,12 +12,36 @@ a = Analysis(
         'mss',
         'snapocr',
         'snapocr.main',
+        'snapocr.daemon',
+        'snapocr.core.batch',
+        'snapocr.core.capture_queue',
         'snapocr.core.config',
+        'snapocr.core.dir_watch',
         'snapocr.core.ocr',
+        'snapocr.core.ocr_index',
+        'snapocr.core.region_watch',
+        'snapocr.core.scroll_capture',
+        'snapocr.core.stream_filter',
         'snapocr.core.clipboard',
+        'snapocr.core.clipboard_watch',
+        'snapocr.core.columnar',
+        'snapocr.core.documents',
+        'snapocr.core.image_loader',
+        'snapocr.core.trace',
         'snapocr.platform.base',
+        'snapocr.platform.capture_backends',
+        'snapocr.platform.frame_buffer',
+        'snapocr.platform.inotify',
         'snapocr.platform.macos',
         'snapocr.platform.macos_native',
+        'snapocr.platform.monitors',
+        'snapocr.platform.notify',
+        'snapocr.platform.x11_clipboard',
+        'snapocr.platform.x11_shm',
+        'snapocr.ui',
+        'snapocr.ui.result_dialog',
+        'snapocr.ui.selection_overlay',
+        'snapocr.ui.session',
     ],
     hookspath=[],
     hooksconfig={},
@@ -15,11 +15,20 @@ Usage:
 __version__ = '2.0.0'
 __author__ = 'SnapOCR Contributors'
 
-from .main import SnapOCR, main
-from .core.config import Config
-from .core.ocr import extract_text, format_result
-from .core.clipboard import ClipboardManager
-from .platform.base import PlatformManager
+import importlib
+
+# Public names and the submodules that define them. Submodules are only
+# imported on first attribute access so that `import snapocr` stays cheap
+# (every hotkey press is a cold start).
+_LAZY_ATTRS = {
+    'SnapOCR': '.main',
+    'main': '.main',
+    'Config': '.core.config',
+    'extract_text': '.core.ocr',
+    'format_result': '.core.ocr',
+    'ClipboardManager': '.core.clipboard',
+    'PlatformManager': '.platform.base',
+}
 
 __all__ = [
     'SnapOCR',
@@ -30,3 +39,16 @@ __all__ = [
     'PlatformManager',
     'main',
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
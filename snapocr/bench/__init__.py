@@ -0,0 +1,38 @@
+"""
+Reproducible OCR benchmark suite.
+
+This module provides:
+- generate_corpus: Deterministic synthetic screen-text corpus rendered with PIL
+- run_benchmark: Per-stage latency, character error rate and LaTeX exact-match per profile
+- compare_results: Regression check against a saved baseline
+- run_capture_bench: Screen and region grab timings per capture backend
+"""
+
+from .capture import format_capture_report, run_capture_bench
+from .corpus import Sample, generate_corpus, save_corpus
+from .runner import (
+    PROFILES,
+    DEFAULT_THRESHOLDS,
+    character_error_rate,
+    compare_results,
+    format_report,
+    load_result,
+    run_benchmark,
+    save_result,
+)
+
+__all__ = [
+    'Sample',
+    'generate_corpus',
+    'save_corpus',
+    'PROFILES',
+    'DEFAULT_THRESHOLDS',
+    'character_error_rate',
+    'compare_results',
+    'format_report',
+    'load_result',
+    'run_benchmark',
+    'save_result',
+    'format_capture_report',
+    'run_capture_bench',
+]
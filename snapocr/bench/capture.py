@@ -0,0 +1,94 @@
+"""
+Capture backend benchmark: time every available backend on this machine.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+from ..platform.capture_backends import available_backends, create_backend
+from .runner import percentile
+
+
+# Size of the region grab, clipped to the primary monitor
+REGION_SIZE = (800, 600)
+
+
+def _time_grabs(backend, monitor: Dict[str, int], iterations: int) -> Dict[str, float]:
+    """Time repeated grabs of one rectangle; the first grab is reported separately."""
+    timings = []
+    for _ in range(iterations + 1):
+        start = time.perf_counter()
+        backend.grab_image(monitor)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    warm = timings[1:]
+    return {
+        'first': timings[0],
+        'p50': percentile(warm, 50),
+        'p95': percentile(warm, 95),
+    }
+
+
+def run_capture_bench(backends: Optional[List[str]] = None, iterations: int = 10) -> Dict[str, Any]:
+    """
+    Benchmark capture backends with screen (primary monitor) and region grabs.
+
+    Args:
+        backends: Backend names to run (default: all available).
+        iterations: Grabs per percentile, after a first grab reported separately.
+
+    Returns:
+        Result dict with per-backend timings (or errors) and the fastest backend.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in backends or available_backends():
+        try:
+            start = time.perf_counter()
+            backend = create_backend(name, fallback=False)
+            setup_ms = (time.perf_counter() - start) * 1000.0
+
+            try:
+                screen = backend.monitors[1] if len(backend.monitors) > 1 else backend.monitors[0]
+                region = {
+                    'left': screen['left'],
+                    'top': screen['top'],
+                    'width': min(REGION_SIZE[0], screen['width']),
+                    'height': min(REGION_SIZE[1], screen['height']),
+                }
+                results[name] = {
+                    'setup_ms': setup_ms,
+                    'screen_ms': _time_grabs(backend, screen, iterations),
+                    'region_ms': _time_grabs(backend, region, iterations),
+                    'screen_size': [screen['width'], screen['height']],
+                }
+            finally:
+                backend.close()
+        except Exception as e:
+            results[name] = {'error': str(e)}
+
+    working = [name for name, r in results.items() if 'error' not in r]
+    fastest = min(
+        working,
+        key=lambda n: (results[n]['screen_ms']['p50'], results[n]['region_ms']['p50']),
+        default=None,
+    )
+    return {'iterations': iterations, 'backends': results, 'fastest': fastest}
+
+
+def format_capture_report(result: Dict[str, Any]) -> str:
+    """Format a capture benchmark result as a plain-text table."""
+    lines = []
+    for name, r in result['backends'].items():
+        if 'error' in r:
+            lines.append(f"[{name}] failed: {r['error']}")
+            continue
+        width, height = r['screen_size']
+        lines.append(f"[{name}] setup={r['setup_ms']:.1f} ms  screen={width}x{height}")
+        for kind in ('screen', 'region'):
+            stats = r[f'{kind}_ms']
+            lines.append(
+                f"  {kind:<8} first={stats['first']:>8.1f} ms  "
+                f"p50={stats['p50']:>8.1f} ms  p95={stats['p95']:>8.1f} ms"
+            )
+    fastest = result['fastest']
+    lines.append(f"Fastest: {fastest}" if fastest else "No capture backend worked")
+    return '\n'.join(lines)
@@ -0,0 +1,222 @@
+"""
+Deterministic synthetic screen-text corpus for benchmarking.
+
+Samples are rendered with PIL only, so the corpus can be regenerated
+offline and is identical for a given seed and set of installed fonts.
+"""
+
+import json
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from PIL import Image, ImageDraw, ImageFont
+
+
+# Ground truth lines rendered into the samples
+ENGLISH_LINES = [
+    "The quick brown fox jumps over the lazy dog.",
+    "Build finished in 42.7 seconds with 3 warnings.",
+    "def extract_text(image_path, language='eng'):",
+    "Error: connection refused (errno 111) on port 8080",
+    "Meeting moved to Thursday 14:30, room B-204.",
+    "Total: $1,284.50 due by 2024-03-15",
+]
+
+CHINESE_LINES = [
+    "截图文字识别工具",
+    "今天天气很好，我们去公园散步。",
+    "请将结果复制到剪贴板",
+    "数学公式转换为代码",
+    "系统设置已保存成功",
+]
+
+# (rendered text, expected LaTeX)
+FORMULAS = [
+    ("E = mc²", "E=mc^{2}"),
+    ("x² + y² = z²", "x^{2}+y^{2}=z^{2}"),
+    ("a / b = c", "a/b=c"),
+    ("α + β = γ", "\\alpha+\\beta=\\gamma"),
+    ("f(x) = 3x + 1", "f(x)=3x+1"),
+    ("√2 ≈ 1.414", "\\sqrt{2}\\approx1.414"),
+]
+
+# Foreground / background colours for screen themes
+THEMES = {
+    'light': ((20, 20, 20), (255, 255, 255)),
+    'dark': ((230, 230, 230), (30, 30, 30)),
+}
+
+FONT_SIZES = [12, 16, 24]
+
+# Common font files; only the ones present on this machine are used
+LATIN_FONT_CANDIDATES = [
+    'DejaVuSans.ttf',
+    'DejaVuSansMono.ttf',
+    'DejaVuSerif.ttf',
+    'LiberationSans-Regular.ttf',
+    'Arial.ttf',
+    'arial.ttf',
+    'Helvetica.ttc',
+    'consola.ttf',
+    'Menlo.ttc',
+]
+
+CJK_FONT_CANDIDATES = [
+    'NotoSansCJK-Regular.ttc',
+    'NotoSansCJKsc-Regular.otf',
+    'NotoSansSC-Regular.otf',
+    'wqy-microhei.ttc',
+    'wqy-zenhei.ttc',
+    'msyh.ttc',
+    'simsun.ttc',
+    'PingFang.ttc',
+    'STHeiti Medium.ttc',
+]
+
+FONT_DIRS = [
+    '/usr/share/fonts',
+    '/usr/local/share/fonts',
+    os.path.expanduser('~/.fonts'),
+    os.path.expanduser('~/.local/share/fonts'),
+    '/Library/Fonts',
+    '/System/Library/Fonts',
+    os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts'),
+]
+
+
+@dataclass
+class Sample:
+    """A single rendered benchmark sample."""
+
+    name: str
+    kind: str                                    # 'eng', 'chi_sim' or 'formula'
+    text: str                                    # Ground truth text
+    image: Image.Image
+    latex: Optional[str] = None                  # Ground truth LaTeX for formulas
+    meta: Dict[str, object] = field(default_factory=dict)
+
+
+def find_fonts(candidates: List[str]) -> List[str]:
+    """
+    Find installed font files by name.
+
+    Args:
+        candidates: Font file names to look for.
+
+    Returns:
+        Sorted list of font paths that exist, one per candidate name.
+    """
+    wanted = set(candidates)
+    found: Dict[str, str] = {}
+    for font_dir in FONT_DIRS:
+        if not os.path.isdir(font_dir):
+            continue
+        for dirpath, _dirnames, filenames in os.walk(font_dir):
+            for filename in filenames:
+                if filename in wanted and filename not in found:
+                    found[filename] = os.path.join(dirpath, filename)
+    return sorted(found.values())
+
+
+def _load_font(path: Optional[str], size: int):
+    """Load a TrueType font, or PIL's bundled default font."""
+    if path is None:
+        try:
+            return ImageFont.load_default(size=size)
+        except TypeError:
+            # Pillow < 10.1 has no sized default font
+            return ImageFont.load_default()
+    return ImageFont.truetype(path, size)
+
+
+def render_text(text: str, font, theme: str, padding: int = 12) -> Image.Image:
+    """
+    Render a line of text like a screen capture.
+
+    Args:
+        text: Text to draw.
+        font: PIL font.
+        theme: Key of THEMES.
+        padding: Margin around the text in pixels.
+
+    Returns:
+        RGB image.
+    """
+    fg, bg = THEMES[theme]
+    probe = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    left, top, right, bottom = probe.textbbox((0, 0), text, font=font)
+    width = right - left + padding * 2
+    height = bottom - top + padding * 2
+    image = Image.new('RGB', (width, height), bg)
+    ImageDraw.Draw(image).text((padding - left, padding - top), text, font=font, fill=fg)
+    return image
+
+
+def generate_corpus(seed: int = 0, per_kind: int = 6) -> List[Sample]:
+    """
+    Generate the benchmark corpus.
+
+    Args:
+        seed: Random seed controlling which line/font/size/theme combinations are used.
+        per_kind: Number of samples per kind (English, Chinese, formula).
+
+    Returns:
+        List of samples. Chinese samples are skipped if no CJK font is installed.
+    """
+    rng = random.Random(seed)
+    latin_fonts: List[Optional[str]] = [None] + find_fonts(LATIN_FONT_CANDIDATES)
+    cjk_fonts: List[Optional[str]] = list(find_fonts(CJK_FONT_CANDIDATES))
+
+    kinds = [
+        ('eng', [(line, None) for line in ENGLISH_LINES], latin_fonts),
+        ('formula', FORMULAS, latin_fonts),
+        ('chi_sim', [(line, None) for line in CHINESE_LINES], cjk_fonts),
+    ]
+
+    samples = []
+    for kind, lines, fonts in kinds:
+        if not fonts:
+            print(f"Warning: no font available for '{kind}' samples, skipping")
+            continue
+        for i in range(per_kind):
+            text, latex = lines[i % len(lines)]
+            font_path = rng.choice(fonts)
+            size = rng.choice(FONT_SIZES)
+            theme = rng.choice(sorted(THEMES))
+            image = render_text(text, _load_font(font_path, size), theme)
+            font_name = os.path.basename(font_path) if font_path else 'default'
+            samples.append(Sample(
+                name=f"{kind}-{i:02d}-{theme}-{size}px",
+                kind=kind,
+                text=text,
+                latex=latex,
+                image=image,
+                meta={'font': font_name, 'size': size, 'theme': theme},
+            ))
+    return samples
+
+
+def save_corpus(samples: List[Sample], directory: str) -> None:
+    """
+    Write samples as PNG files plus a ground truth index.
+
+    Args:
+        samples: Samples to save.
+        directory: Output directory (created if missing).
+    """
+    os.makedirs(directory, exist_ok=True)
+    index = []
+    for sample in samples:
+        filename = f"{sample.name}.png"
+        sample.image.save(os.path.join(directory, filename))
+        index.append({
+            'file': filename,
+            'kind': sample.kind,
+            'text': sample.text,
+            'latex': sample.latex,
+            **sample.meta,
+        })
+    with open(os.path.join(directory, 'corpus.json'), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,267 @@
+"""
+Benchmark runner: OCR latency per stage, character error rate and LaTeX exact-match.
+"""
+
+import json
+import math
+import platform
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from ..core.ocr import extract_text
+from ..core.trace import get_tracer
+from .corpus import Sample, generate_corpus, save_corpus
+
+
+# extract_text keyword arguments for each benchmark profile
+PROFILES: Dict[str, Dict[str, Any]] = {
+    'default': {'latex_mode': False, 'auto_detect_math': True},
+    'text': {'latex_mode': False, 'auto_detect_math': False},
+    'latex': {'latex_mode': True, 'auto_detect_math': False},
+}
+
+# Allowed regressions against a baseline before the run fails
+DEFAULT_THRESHOLDS: Dict[str, float] = {
+    'latency_p95': 0.25,     # Relative increase of total p95 latency
+    'cer': 0.02,             # Absolute increase of mean character error rate
+    'latex_exact': 0.05,     # Absolute decrease of LaTeX exact-match rate
+}
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Compute the edit distance between two strings."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        previous = current
+    return previous[-1]
+
+
+def _normalize(text: str) -> str:
+    """Drop whitespace, which Tesseract inserts inconsistently (e.g. between CJK characters)."""
+    return re.sub(r'\s+', '', text or '')
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Compute the character error rate of an OCR result.
+
+    Args:
+        reference: Ground truth text.
+        hypothesis: OCR output.
+
+    Returns:
+        Edit distance divided by reference length (whitespace ignored).
+    """
+    ref = _normalize(reference)
+    hyp = _normalize(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    return levenshtein(ref, hyp) / len(ref)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def run_profile(
+    name: str,
+    samples: List[Sample],
+    repeat: int = 1,
+    tesseract_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run every sample through extract_text with one profile.
+
+    Args:
+        name: Profile name (key of PROFILES).
+        samples: Corpus samples.
+        repeat: Number of timed runs per sample.
+        tesseract_path: Optional path to Tesseract executable.
+
+    Returns:
+        Profile result with per-stage latency percentiles and accuracy metrics.
+    """
+    options = PROFILES[name]
+    tracer = get_tracer()
+    stage_times: Dict[str, List[float]] = {}
+    cers: Dict[str, List[float]] = {}
+    latex_hits = 0
+    latex_total = 0
+
+    for sample in samples:
+        for _ in range(repeat):
+            tracer.clear()
+            with tracer.span('sample', sample=sample.name) as root:
+                text, latex = extract_text(
+                    sample.image.copy(),
+                    tesseract_path=tesseract_path,
+                    **options
+                )
+            stage_times.setdefault('total', []).append(root.duration_ms)
+            for stage, ms in tracer.stage_totals(root).items():
+                stage_times.setdefault(stage, []).append(ms)
+
+        cers.setdefault(sample.kind, []).append(character_error_rate(sample.text, text))
+        if sample.latex is not None and options['latex_mode']:
+            latex_total += 1
+            latex_hits += int(_normalize(latex) == _normalize(sample.latex))
+
+    all_cers = [v for values in cers.values() for v in values]
+    return {
+        'options': options,
+        'latency_ms': {
+            stage: {
+                'p50': round(percentile(times, 50), 3),
+                'p95': round(percentile(times, 95), 3),
+                'count': len(times),
+            }
+            for stage, times in stage_times.items()
+        },
+        'cer': round(sum(all_cers) / len(all_cers), 4) if all_cers else None,
+        'cer_by_kind': {
+            kind: round(sum(values) / len(values), 4) for kind, values in cers.items()
+        },
+        'latex_exact': round(latex_hits / latex_total, 4) if latex_total else None,
+    }
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    thresholds: Optional[Dict[str, float]] = None,
+) -> List[str]:
+    """
+    Compare a benchmark run against a baseline.
+
+    Args:
+        current: Result of run_benchmark.
+        baseline: Previously saved result.
+        thresholds: Allowed regressions, see DEFAULT_THRESHOLDS.
+
+    Returns:
+        List of human-readable regressions (empty if none).
+    """
+    limits = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    regressions = []
+
+    for name, result in current['profiles'].items():
+        base = baseline.get('profiles', {}).get(name)
+        if not base:
+            continue
+
+        cur_p95 = result['latency_ms'].get('total', {}).get('p95')
+        base_p95 = base.get('latency_ms', {}).get('total', {}).get('p95')
+        if cur_p95 and base_p95 and cur_p95 > base_p95 * (1 + limits['latency_p95']):
+            regressions.append(
+                f"{name}: p95 latency {cur_p95:.1f} ms > baseline {base_p95:.1f} ms "
+                f"(+{limits['latency_p95']:.0%} allowed)"
+            )
+
+        if result['cer'] is not None and base.get('cer') is not None:
+            if result['cer'] > base['cer'] + limits['cer']:
+                regressions.append(
+                    f"{name}: CER {result['cer']:.4f} > baseline {base['cer']:.4f} "
+                    f"(+{limits['cer']} allowed)"
+                )
+
+        if result['latex_exact'] is not None and base.get('latex_exact') is not None:
+            if result['latex_exact'] < base['latex_exact'] - limits['latex_exact']:
+                regressions.append(
+                    f"{name}: LaTeX exact-match {result['latex_exact']:.4f} < baseline "
+                    f"{base['latex_exact']:.4f} (-{limits['latex_exact']} allowed)"
+                )
+
+    return regressions
+
+
+def run_benchmark(
+    profiles: Optional[List[str]] = None,
+    seed: int = 0,
+    per_kind: int = 6,
+    repeat: int = 1,
+    tesseract_path: Optional[str] = None,
+    corpus_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Generate the corpus and benchmark each profile.
+
+    Args:
+        profiles: Profile names to run. All profiles if None.
+        seed: Corpus seed.
+        per_kind: Samples per kind.
+        repeat: Timed runs per sample.
+        tesseract_path: Optional path to Tesseract executable.
+        corpus_dir: If set, also write the generated corpus there.
+
+    Returns:
+        Benchmark result dictionary (JSON serializable).
+    """
+    samples = generate_corpus(seed=seed, per_kind=per_kind)
+    if corpus_dir:
+        save_corpus(samples, corpus_dir)
+
+    tracer = get_tracer()
+    was_enabled = tracer.enabled
+    tracer.enable()
+
+    results = {}
+    try:
+        for name in profiles or list(PROFILES):
+            print(f"Benchmarking profile '{name}' on {len(samples)} samples...")
+            results[name] = run_profile(name, samples, repeat, tesseract_path)
+    finally:
+        tracer.clear()
+        if not was_enabled:
+            tracer.disable()
+
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'seed': seed,
+        'samples': len(samples),
+        'repeat': repeat,
+        'profiles': results,
+    }
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    """Format a benchmark result as a plain-text table."""
+    lines = []
+    for name, profile in result['profiles'].items():
+        cer = profile['cer']
+        latex = profile['latex_exact']
+        lines.append(
+            f"[{name}] CER={'n/a' if cer is None else f'{cer:.4f}'} "
+            f"LaTeX exact={'n/a' if latex is None else f'{latex:.2%}'}"
+        )
+        for stage, stats in profile['latency_ms'].items():
+            lines.append(f"  {stage:<22} p50={stats['p50']:>9.1f} ms  p95={stats['p95']:>9.1f} ms")
+    return '\n'.join(lines)
+
+
+def load_result(path: str) -> Dict[str, Any]:
+    """Load a saved benchmark result."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_result(result: Dict[str, Any], path: str) -> None:
+    """Save a benchmark result as JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
@@ -1,7 +1,26 @@
 """Core modules for SnapOCR."""
 
-from .config import Config
-from .ocr import extract_text, format_result
-from .clipboard import ClipboardManager
+import importlib
+
+# Submodules are imported on first attribute access, see snapocr/__init__.py
+_LAZY_ATTRS = {
+    'Config': '.config',
+    'extract_text': '.ocr',
+    'format_result': '.ocr',
+    'ClipboardManager': '.clipboard',
+}
 
 __all__ = ['Config', 'extract_text', 'format_result', 'ClipboardManager']
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
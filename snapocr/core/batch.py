@@ -0,0 +1,586 @@
+"""
+Resumable batch OCR of image files and folders.
+
+A batch run keeps a manifest (SQLite) with two tables:
+
+- ``files``: path, size and mtime of every file seen, with its content hash.
+  A file whose size and mtime are unchanged is not even read again.
+- ``results``: text per (content hash, OCR parameters), and the word boxes
+  when they were asked for. Identical images under different names are
+  recognized once, and a change of language or LaTeX mode re-runs only
+  what was recognized with other settings.
+
+Results are checkpointed every few seconds or rows, so an interrupted run
+loses at most the last checkpoint and a re-run over a large archive with a
+few new files only costs those files. Images that fail to be recognized
+are counted and reported but never recorded, so the next run tries them
+again. Text goes to ``<name>.txt`` and
+``<name>.json`` next to each image, along with any structured outputs
+(hOCR, ALTO...) the recognizer writes itself. An output folder mirrors
+the subfolders of the inputs, so equal names in different folders do
+not overwrite each other.
+
+An optional loader decodes oversized or rotated images on a thread of its
+own a few jobs ahead of the workers (see ``image_loader``).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .dir_watch import is_image_file, sidecar_paths, write_sidecars
+from .image_loader import Prefetcher
+from .ocr import Word
+from .trace import span
+
+
+# Flush the manifest after this many new rows...
+CHECKPOINT_ROWS = 100
+
+# ...or after this many seconds, whichever comes first
+CHECKPOINT_SECONDS = 5.0
+
+# Seconds between progress reports
+PROGRESS_INTERVAL = 5.0
+
+# Default manifest file name
+MANIFEST_NAME = 'snapocr_manifest.db'
+
+# New images needed before they are recognized in list-file chunks
+LIST_FILE_MIN_IMAGES = 5
+
+# Most images per Tesseract list-file run
+LIST_FILE_CHUNK = 32
+
+
+def iter_images(inputs: Iterable[str], recursive: bool = True) -> Iterator[str]:
+    """
+    Expand files and folders into image paths.
+
+    Args:
+        inputs: Image files and/or folders.
+        recursive: Whether to descend into subfolders.
+
+    Yields:
+        Absolute image paths, folders in sorted order.
+    """
+    for item in inputs:
+        item = os.path.abspath(os.path.expanduser(item))
+        if os.path.isfile(item):
+            yield item
+        elif os.path.isdir(item):
+            for dirpath, dirnames, filenames in os.walk(item):
+                dirnames.sort()
+                if not recursive:
+                    dirnames.clear()
+                for name in sorted(filenames):
+                    if is_image_file(name):
+                        yield os.path.join(dirpath, name)
+        else:
+            print(f"Warning: Skipping missing input {item}")
+
+
+def input_root(inputs: Iterable[str]) -> Optional[str]:
+    """
+    Get the folder whose layout batch results mirror in an output folder.
+
+    Args:
+        inputs: Image files and/or folders, as given to ``iter_images``.
+
+    Returns:
+        The deepest folder containing every input, or None if there is none
+        (e.g. inputs on different Windows drives).
+    """
+    folders = []
+    for item in inputs:
+        item = os.path.abspath(os.path.expanduser(item))
+        folders.append(item if os.path.isdir(item) else os.path.dirname(item))
+    try:
+        return os.path.commonpath(folders) if folders else None
+    except ValueError:
+        return None
+
+
+def file_digest(path: str) -> str:
+    """
+    Hash a file's contents.
+
+    Args:
+        path: File path.
+
+    Returns:
+        Hex blake2b digest.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def params_key(params: Dict[str, Any]) -> str:
+    """Get a stable key for the OCR parameters that affect results."""
+    return hashlib.blake2b(json.dumps(params, sort_keys=True).encode(), digest_size=8).hexdigest()
+
+
+def _encode_words(words: List[Word]) -> str:
+    """Serialize words for the manifest (one compact JSON array per word)."""
+    return json.dumps([
+        [w.text, w.left, w.top, w.width, w.height, w.conf, *w.line, w.page] for w in words
+    ], ensure_ascii=False, separators=(',', ':'))
+
+
+def _decode_words(data: str) -> List[Word]:
+    """Restore words serialized by ``_encode_words``."""
+    return [
+        Word(text, left, top, width, height, conf, (block, paragraph, line), page)
+        for text, left, top, width, height, conf, block, paragraph, line, page in json.loads(data)
+    ]
+
+
+class Manifest:
+    """On-disk record of files seen and results produced by batch runs."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a manifest.
+
+        Args:
+            path: SQLite database file.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS files ('
+            ' path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, digest TEXT)'
+        )
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            ' digest TEXT, params TEXT, text TEXT, latex TEXT, ocr_seconds REAL, words TEXT,'
+            ' PRIMARY KEY (digest, params))'
+        )
+        # Manifests written before word boxes were stored
+        columns = [row[1] for row in self._db.execute('PRAGMA table_info(results)')]
+        if 'words' not in columns:
+            self._db.execute('ALTER TABLE results ADD COLUMN words TEXT')
+        self._db.commit()
+        self._pending_files: List[Tuple] = []
+        self._pending_results: List[Tuple] = []
+        self._last_flush = time.monotonic()
+
+    def load_files(self) -> Dict[str, Tuple[int, int, str]]:
+        """
+        Load the file table.
+
+        Returns:
+            Dict of path to (size, mtime_ns, digest).
+        """
+        with self._lock:
+            rows = self._db.execute('SELECT path, size, mtime_ns, digest FROM files').fetchall()
+        return {path: (size, mtime_ns, digest) for path, size, mtime_ns, digest in rows}
+
+    def load_results(self, params: str) -> Dict[str, Tuple[str, Optional[str], bool]]:
+        """
+        Load the results recognized with some parameters.
+
+        Word boxes are not loaded (see ``load_words``), only whether they are stored.
+
+        Args:
+            params: Key from ``params_key``.
+
+        Returns:
+            Dict of content digest to (text, latex, has_words).
+        """
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT digest, text, latex, words IS NOT NULL FROM results WHERE params = ?', (params,)
+            ).fetchall()
+        return {digest: (text, latex, bool(has_words)) for digest, text, latex, has_words in rows}
+
+    def load_words(self, digest: str, params: str) -> Tuple[List[Word], Optional[float]]:
+        """
+        Load the word boxes of one result.
+
+        Args:
+            digest: Content digest.
+            params: Key from ``params_key``.
+
+        Returns:
+            Tuple of (words, OCR seconds); no words if none are stored.
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT words, ocr_seconds FROM results WHERE digest = ? AND params = ?', (digest, params)
+            ).fetchone()
+        if row is None:
+            return [], None
+        return (_decode_words(row[0]) if row[0] else []), row[1]
+
+    def add_file(self, path: str, size: int, mtime_ns: int, digest: str) -> None:
+        """Record a file's stat and hash (written at the next checkpoint)."""
+        with self._lock:
+            self._pending_files.append((path, size, mtime_ns, digest))
+            self._maybe_flush()
+
+    def add_result(
+        self,
+        digest: str,
+        params: str,
+        text: str,
+        latex: Optional[str],
+        ocr_seconds: float,
+        words: Optional[List[Word]] = None
+    ) -> None:
+        """Record a result, with its word boxes if given (written at the next checkpoint)."""
+        encoded = _encode_words(words) if words is not None else None
+        with self._lock:
+            self._pending_results.append((digest, params, text, latex, ocr_seconds, encoded))
+            self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        rows = len(self._pending_files) + len(self._pending_results)
+        if rows >= CHECKPOINT_ROWS or (rows and time.monotonic() - self._last_flush >= CHECKPOINT_SECONDS):
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write the pending rows in one transaction (lock held)."""
+        with span('manifest_checkpoint', rows=len(self._pending_files) + len(self._pending_results)):
+            with self._db:
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO results (digest, params, text, latex, ocr_seconds, words)'
+                    ' VALUES (?, ?, ?, ?, ?, ?)', self._pending_results
+                )
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)', self._pending_files
+                )
+        self._pending_files = []
+        self._pending_results = []
+        self._last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        """Write all pending rows now."""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """Flush and close the manifest."""
+        with self._lock:
+            self._flush()
+            self._db.close()
+
+
+@dataclass
+class BatchStats:
+    """Counters of a batch run."""
+
+    files: int = 0           # Image files considered
+    unchanged: int = 0       # Skipped: same file, result already in the manifest
+    duplicates: int = 0      # Content recognized before under another name (or this run)
+    recognized: int = 0      # Distinct images recognized in this run
+    failed: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        """One-line summary."""
+        return (
+            f"{self.files} files: {self.recognized} recognized, {self.unchanged} unchanged, "
+            f"{self.duplicates} duplicates, {self.failed} failed in {self.seconds:.1f} s"
+        )
+
+
+class BatchRunner:
+    """
+    Recognize many image files, skipping everything the manifest already has.
+
+    Usage:
+        runner = BatchRunner(recognize=ocr_file, manifest=Manifest(path), params={'language': 'eng'})
+        stats = runner.run(iter_images(['~/scans']))
+    """
+
+    def __init__(
+        self,
+        recognize: Callable[[Any], Tuple[str, Optional[str]]],
+        manifest: Manifest,
+        params: Dict[str, Any],
+        workers: int = 2,
+        output_dir: Optional[str] = None,
+        report: Callable[[str], None] = print,
+        recognize_many: Optional[Callable[[List[str]], List[Tuple[str, Optional[str]]]]] = None,
+        extra_outputs: Iterable[str] = (),
+        load: Optional[Callable[[str], Any]] = None,
+        prefetch: int = 4,
+        on_result: Optional[Callable[[str, str, Tuple, Optional[float]], None]] = None,
+        words: bool = False,
+        root: Optional[str] = None
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            recognize: Returns (result text, LaTeX or None, ...) for an image path,
+                or for the image ``load`` returned. Items after the LaTeX are
+                passed on to ``on_result`` only. Must raise when recognition
+                fails: whatever it returns is stored as the image's result.
+            manifest: Manifest to read and update.
+            params: OCR parameters that affect the text (language, LaTeX mode...).
+            workers: Images recognized concurrently.
+            output_dir: Directory for the results; next to the images if None.
+            report: Receives progress messages.
+            recognize_many: Optional; like ``recognize`` for a list of paths in one
+                engine run. Used in chunks when enough images are new; a chunk
+                that fails is retried image by image.
+            extra_outputs: Extensions of files ``recognize`` writes next to the
+                ``.txt`` result (e.g. '.hocr'). Images missing one are recognized
+                again, and duplicates get copies.
+            load: Optional; decodes an image path for ``recognize``, or returns
+                None to pass the path itself. Runs on a loader thread ahead of
+                the workers; decoded images are recognized one at a time.
+            prefetch: Jobs the loader prepares ahead of the workers.
+            on_result: Optional; called with (path, digest, result, ocr_seconds)
+                for every path recognized in this run. With ``words``, it is also
+                called for unchanged and duplicate paths, with the result
+                (text, latex, words) from the manifest, so it sees every path.
+            words: ``recognize`` returns the word boxes third; they are stored in
+                the manifest, and results stored without them are recognized again.
+            root: Folder whose layout is mirrored under ``output_dir`` (see ``input_root``).
+        """
+        self._recognize = recognize
+        self._recognize_many = recognize_many
+        self._manifest = manifest
+        self._params = params
+        self._params_key = params_key(params)
+        self._workers = max(1, workers)
+        self._output_dir = output_dir
+        self._report = report
+        self._extra_outputs = tuple(extra_outputs)
+        self._load = load
+        self._prefetch = prefetch
+        self._on_result = on_result
+        self._words = words
+        self._root = root
+        self.stats = BatchStats()
+
+    def _write(self, path: str, text: str, latex: Optional[str], ocr_seconds: Optional[float]) -> None:
+        """Write the result files of one image."""
+        details = {**self._params, 'latex': latex}
+        if ocr_seconds is not None:
+            details['ocr_seconds'] = round(ocr_seconds, 3)
+        write_sidecars(path, text, details, self._output_dir, self._root)
+
+    def _output_base(self, path: str) -> str:
+        """Result path of an image without extension."""
+        return os.path.splitext(sidecar_paths(path, self._output_dir, self._root)[0])[0]
+
+    def _has_outputs(self, path: str) -> bool:
+        """Check whether the structured outputs of an image exist."""
+        base = self._output_base(path)
+        return all(os.path.exists(base + extension) for extension in self._extra_outputs)
+
+    def _known(self, path: str, digest: str, result: Tuple[str, Optional[str], bool]) -> None:
+        """Pass a result from the manifest on to ``on_result`` (with word boxes only)."""
+        if self._on_result is not None and self._words:
+            words, ocr_seconds = self._manifest.load_words(digest, self._params_key)
+            self._on_result(path, digest, (result[0], result[1], words), ocr_seconds)
+
+    def _scan(self, paths: Iterable[str], results: Dict[str, Tuple[str, Optional[str], bool]]) -> Dict[str, List[str]]:
+        """
+        Sort the inputs into known and new content.
+
+        Known content gets its result files (if missing) right away.
+
+        Returns:
+            Dict of content digest to the paths that need recognition.
+        """
+        known_files = self._manifest.load_files()
+        todo: Dict[str, List[str]] = {}
+        for path in paths:
+            self.stats.files += 1
+            try:
+                stat = os.stat(path)
+                known = known_files.get(path)
+                if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+                    digest = known[2]
+                    unchanged = True
+                else:
+                    with span('hash_file'):
+                        digest = file_digest(path)
+                    self._manifest.add_file(path, stat.st_size, stat.st_mtime_ns, digest)
+                    unchanged = False
+            except OSError as e:
+                self.stats.failed += 1
+                self._report(f"Error reading {path}: {e}")
+                continue
+
+            result = results.get(digest)
+            if (result is None or (self._words and not result[2])
+                    or (self._extra_outputs and not (unchanged and self._has_outputs(path)))):
+                # Word boxes and structured outputs can only be made by recognizing again
+                todo.setdefault(digest, []).append(path)
+            elif unchanged:
+                self.stats.unchanged += 1
+                if not os.path.exists(sidecar_paths(path, self._output_dir, self._root)[0]):
+                    self._write(path, result[0], result[1], None)
+                self._known(path, digest, result)
+            else:
+                self.stats.duplicates += 1
+                self._write(path, result[0], result[1], None)
+                self._known(path, digest, result)
+        return todo
+
+    def _store(self, digest: str, paths: List[str], result: Tuple, ocr_seconds: float) -> None:
+        """Record a result and write it for all paths with that content."""
+        text, latex = result[:2]
+        words = result[2] if self._words else None
+        self._manifest.add_result(digest, self._params_key, text, latex, ocr_seconds, words)
+        source = self._output_base(paths[0])
+        for path in paths:
+            self._write(path, text, latex, ocr_seconds)
+            target = self._output_base(path)
+            for extension in self._extra_outputs:
+                if target != source and os.path.exists(source + extension):
+                    shutil.copyfile(source + extension, target + extension)
+            if self._on_result is not None:
+                self._on_result(path, digest, result, ocr_seconds)
+
+    def _process(self, chunk: List[Tuple[str, List[str], Any]]) -> List[Tuple[List[str], Optional[Exception]]]:
+        """
+        Recognize distinct images and write their results (worker thread).
+
+        Args:
+            chunk: (digest, paths, loaded) triples; each content is recognized from
+                its loaded image, or from its first path if that is None.
+
+        Returns:
+            (paths, error or None) per pair.
+        """
+        if len(chunk) > 1 and self._recognize_many is not None:
+            started = time.perf_counter()
+            try:
+                results = self._recognize_many([paths[0] for _, paths, _ in chunk])
+            except Exception as e:
+                self._report(f"Chunk of {len(chunk)} images failed ({e}); retrying one by one")
+            else:
+                ocr_seconds = (time.perf_counter() - started) / len(chunk)
+                outcomes = []
+                for (digest, paths, _), result in zip(chunk, results):
+                    try:
+                        self._store(digest, paths, result, ocr_seconds)
+                        outcomes.append((paths, None))
+                    except Exception as e:
+                        outcomes.append((paths, e))
+                return outcomes
+
+        outcomes = []
+        for digest, paths, loaded in chunk:
+            started = time.perf_counter()
+            try:
+                if isinstance(loaded, Exception):
+                    raise loaded
+                result = self._recognize(paths[0] if loaded is None else loaded)
+                self._store(digest, paths, result, time.perf_counter() - started)
+                outcomes.append((paths, None))
+            except Exception as e:
+                outcomes.append((paths, e))
+        return outcomes
+
+    def _chunks(self, todo: Dict[str, List[str]]) -> Iterator[List[Tuple[str, List[str], Any]]]:
+        """
+        Split the new images into jobs: list-file chunks when worthwhile, else single images.
+
+        Images the loader decodes become single jobs carrying the decoded image.
+        """
+        items = list(todo.items())
+        if self._recognize_many is None or len(items) < LIST_FILE_MIN_IMAGES:
+            size = 1
+        else:
+            # Big enough to amortize the model load, small enough to keep every worker busy
+            size = max(2, min(LIST_FILE_CHUNK, -(-len(items) // self._workers)))
+        chunk = []
+        for digest, paths in items:
+            loaded = None
+            if self._load is not None:
+                try:
+                    loaded = self._load(paths[0])
+                except Exception as e:
+                    loaded = e  # Reported by the worker like any failure
+            if loaded is not None:
+                yield [(digest, paths, loaded)]
+                continue
+            chunk.append((digest, paths, None))
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def run(self, paths: Iterable[str]) -> BatchStats:
+        """
+        Run the batch.
+
+        Args:
+            paths: Image paths (see ``iter_images``).
+
+        Returns:
+            Counters of this run.
+        """
+        started = time.monotonic()
+        try:
+            with span('batch_scan'):
+                todo = self._scan(paths, self._manifest.load_results(self._params_key))
+            self._manifest.flush()
+            pending = sum(len(group) for group in todo.values())
+            self._report(
+                f"{self.stats.files} files, {len(todo)} distinct new images to recognize"
+                + (f" ({pending - len(todo)} duplicates)" if pending > len(todo) else "")
+            )
+            self._recognize_all(todo)
+        finally:
+            self._manifest.flush()
+            self.stats.seconds = time.monotonic() - started
+        return self.stats
+
+    def _recognize_all(self, todo: Dict[str, List[str]]) -> None:
+        """Recognize the new images with bounded concurrency."""
+        prefetcher = Prefetcher(self._chunks(todo), self._prefetch) if self._load is not None else None
+        chunks = iter(prefetcher) if prefetcher is not None else self._chunks(todo)
+        last_report = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='snapocr-batch') as executor:
+            running = set()
+            try:
+                while True:
+                    # Keep a few jobs per worker queued, not the whole batch
+                    for chunk in chunks:
+                        running.add(executor.submit(self._process, chunk))
+                        if len(running) >= self._workers * 2:
+                            break
+                    if not running:
+                        break
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for paths, error in future.result():
+                            if error is None:
+                                self.stats.recognized += 1
+                                self.stats.duplicates += len(paths) - 1
+                            else:
+                                self.stats.failed += len(paths)
+                                self._report(f"Error processing {paths[0]}: {error}")
+                    if time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                        last_report = time.monotonic()
+                        self._report(f"Recognized {self.stats.recognized} of {len(todo)}")
+            finally:
+                for future in running:
+                    future.cancel()
+                if prefetcher is not None:
+                    prefetcher.close()
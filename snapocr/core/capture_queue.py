@@ -0,0 +1,131 @@
+"""
+Bounded queue of captures waiting for OCR.
+
+In resident mode the overlay only has to stay open for the selection;
+recognition can run afterwards. Queued captures are handed to a single
+background worker, so results are delivered in the order the regions
+were selected while the user is already selecting the next one. Each job
+carries its own in-memory images, so no two captures share a file.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from .trace import span
+
+
+@dataclass
+class CaptureJob:
+    """One selection waiting for OCR."""
+
+    id: int
+    payload: Any                                  # What the worker processes (e.g. SelectionResult)
+    submitted_at: float = 0.0                     # time.time() when queued
+    context: dict = field(default_factory=dict)   # Extra data for the delivery callback
+
+
+class CaptureQueue:
+    """
+    FIFO of capture jobs processed by one background worker.
+
+    Usage:
+        captures = CaptureQueue(process=ocr_selection, deliver=copy_result, maxsize=4)
+        job_id = captures.submit(selection_result)   # None if the queue is full
+        ...
+        captures.stop()
+    """
+
+    def __init__(
+        self,
+        process: Callable[[CaptureJob], Any],
+        deliver: Callable[[CaptureJob, Any], None],
+        maxsize: int = 4
+    ):
+        """
+        Initialize the queue. The worker thread starts with the first job.
+
+        Args:
+            process: Called on the worker thread with each job; returns its result.
+            deliver: Called on the worker thread with each job and its result,
+                in submission order.
+            maxsize: Maximum number of jobs waiting or in progress.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._process = process
+        self._deliver = deliver
+        self._maxsize = maxsize
+        self._queue: 'queue.Queue[Optional[CaptureJob]]' = queue.Queue()
+        self._ids = itertools.count(1)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting or in progress."""
+        with self._lock:
+            return self._pending
+
+    @property
+    def full(self) -> bool:
+        """Whether a new job would be rejected."""
+        return self.pending >= self._maxsize
+
+    def submit(self, payload: Any, **context) -> Optional[int]:
+        """
+        Queue a capture for OCR.
+
+        Args:
+            payload: Data handed to ``process``.
+            **context: Extra data stored with the job.
+
+        Returns:
+            The job id, or None if the queue is full.
+        """
+        with self._lock:
+            if self._pending >= self._maxsize:
+                return None
+            self._pending += 1
+            job = CaptureJob(next(self._ids), payload, time.time(), context)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='snapocr-capture-queue', daemon=True)
+                self._thread.start()
+        self._queue.put(job)
+        return job.id
+
+    def _run(self) -> None:
+        """Worker loop: process and deliver jobs one at a time."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            try:
+                with span('queued_ocr', job=job.id):
+                    result = self._process(job)
+                self._deliver(job, result)
+            except Exception as e:
+                print(f"Error processing capture {job.id}: {e}")
+            finally:
+                with self._lock:
+                    self._pending -= 1
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        Stop the worker after the jobs already queued.
+
+        Args:
+            wait: Whether to wait for the queued jobs to finish.
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(None)
+        if wait:
+            thread.join()
@@ -11,9 +11,16 @@ class ClipboardManager:
     Cross-platform clipboard manager.
     """
 
-    def __init__(self):
-        """Initialize clipboard manager."""
+    def __init__(self, resident: bool = False):
+        """
+        Initialize clipboard manager.
+
+        Args:
+            resident: Whether the process stays alive (daemon mode), which
+                lets the platform serve the clipboard in-process.
+        """
         self._platform_clipboard = None
+        self._resident = resident
 
     def _get_platform_clipboard(self):
         """Get platform-specific clipboard implementation."""
@@ -28,23 +35,24 @@ class ClipboardManager:
                 self._platform_clipboard = WindowsClipboardManager()
             else:
                 from ..platform.linux import LinuxClipboardManager
-                self._platform_clipboard = LinuxClipboardManager()
+                self._platform_clipboard = LinuxClipboardManager(resident=self._resident)
 
         return self._platform_clipboard
 
-    def copy(self, text: str) -> bool:
+    def copy(self, text: str, latex: Optional[str] = None) -> bool:
         """
         Copy text to clipboard.
 
         Args:
             text: Text to copy.
+            latex: Optional LaTeX flavour offered alongside the text.
 
         Returns:
             True if successful, False otherwise.
         """
         try:
             clipboard = self._get_platform_clipboard()
-            return clipboard.copy(text)
+            return clipboard.copy(text, latex=latex)
         except Exception as e:
             print(f"Error copying to clipboard: {e}")
             return False
@@ -62,3 +70,29 @@ class ClipboardManager:
         except Exception as e:
             print(f"Error reading clipboard: {e}")
             return ""
+
+    def paste_image(self):
+        """
+        Get an image from clipboard, in memory.
+
+        Returns:
+            PIL Image, or None if the clipboard holds no image.
+        """
+        try:
+            clipboard = self._get_platform_clipboard()
+            return clipboard.paste_image()
+        except Exception as e:
+            print(f"Error reading clipboard image: {e}")
+            return None
+
+    def change_count(self) -> Optional[int]:
+        """
+        Get a counter that changes with every clipboard update.
+
+        Returns:
+            The counter, or None if the platform does not provide one.
+        """
+        try:
+            return self._get_platform_clipboard().change_count()
+        except Exception:
+            return None
@@ -0,0 +1,138 @@
+"""
+Replace images on the clipboard with their text.
+
+Screenshot tools often leave their result on the clipboard as an image.
+The watcher notices each new clipboard image, recognizes it and copies
+the text back. Where the platform keeps a clipboard change counter
+(macOS, Windows, X11 with XFixes or the selection TIMESTAMP) only the
+counter is polled until it moves; elsewhere the image is read and
+compared by hash. Identical images are recognized
+once: copying the same picture again reuses the cached text.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from .trace import span
+
+
+# Seconds between clipboard checks
+POLL_INTERVAL = 0.5
+
+# Recognized images whose text is kept for reuse
+TEXT_CACHE_SIZE = 32
+
+
+def image_digest(image) -> str:
+    """
+    Hash an image's pixels.
+
+    Args:
+        image: PIL image.
+
+    Returns:
+        Hex digest; equal for pixel-identical images of the same mode and size.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class ClipboardWatcher:
+    """
+    Poll the clipboard and replace each new image with its text.
+
+    Usage:
+        watcher = ClipboardWatcher(ClipboardManager(), recognize=ocr_image)
+        watcher.run()                     # until stop() or Ctrl+C
+    """
+
+    def __init__(
+        self,
+        clipboard,
+        recognize: Callable[..., Optional[str]],
+        interval: float = POLL_INTERVAL,
+        on_text: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            clipboard: ClipboardManager to read images from and write text to.
+            recognize: Returns the text of a PIL image, or None if there is none.
+            interval: Seconds between checks.
+            on_text: Called with the text of each new image.
+        """
+        self._clipboard = clipboard
+        self._recognize = recognize
+        self._interval = interval
+        self._on_text = on_text
+        self._count: Optional[int] = None
+        self._last: Optional[str] = None
+        self._texts: 'OrderedDict[str, str]' = OrderedDict()
+        self._stop = threading.Event()
+
+    def prime(self) -> None:
+        """Remember the current clipboard so only later images are recognized."""
+        self._count = self._clipboard.change_count()
+        image = self._clipboard.paste_image()
+        self._last = image_digest(image) if image is not None else None
+
+    def poll(self) -> Optional[str]:
+        """
+        Check the clipboard once.
+
+        Returns:
+            Text copied back for a new image, or None.
+        """
+        count = self._clipboard.change_count()
+        if count is not None:
+            if count == self._count:
+                return None
+            self._count = count
+
+        image = self._clipboard.paste_image()
+        if image is None:
+            self._last = None
+            return None
+        digest = image_digest(image)
+        if digest == self._last:
+            return None
+        self._last = digest
+
+        text = self._texts.get(digest)
+        if text is None:
+            with span('clipboard_ocr'):
+                text = self._recognize(image) or ''
+            self._texts[digest] = text
+            while len(self._texts) > TEXT_CACHE_SIZE:
+                self._texts.popitem(last=False)
+        else:
+            self._texts.move_to_end(digest)
+
+        if not text:
+            return None
+        self._clipboard.copy(text)
+        # The clipboard now holds text; our own write is not a new image
+        self._last = None
+        self._count = self._clipboard.change_count()
+        if self._on_text:
+            self._on_text(text)
+        return text
+
+    def run(self) -> None:
+        """Poll until ``stop()`` is called."""
+        self._stop.clear()
+        self.prime()
+        while not self._stop.wait(self._interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Warning: Clipboard check failed: {e}")
+
+    def stop(self) -> None:
+        """Stop ``run()`` after the current check."""
+        self._stop.set()
@@ -0,0 +1,159 @@
+"""
+Columnar (Parquet / Arrow IPC) output of batch results.
+
+One row per image file: its path, content hash, text, LaTeX, OCR time,
+word count, mean word confidence, and the list of words with their
+boxes and confidences. Rows are buffered and written as record batches
+of ``row_group_size`` rows, so memory stays bounded however long the run
+is, and queries that read only the text or confidence columns skip the
+word lists entirely.
+
+Needs pyarrow (optional): pip install pyarrow
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from .trace import span
+
+
+# Rows per record batch (and Parquet row group)
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+# File extensions written as Arrow IPC files; anything else is Parquet
+ARROW_EXTENSIONS = frozenset({'.arrow', '.feather', '.ipc'})
+
+
+def _schema(pa):
+    """Schema of the result table."""
+    word = pa.struct([
+        ('page', pa.int32()),
+        ('text', pa.string()),
+        ('left', pa.int32()),
+        ('top', pa.int32()),
+        ('width', pa.int32()),
+        ('height', pa.int32()),
+        ('conf', pa.float32()),
+        ('block', pa.int32()),
+        ('paragraph', pa.int32()),
+        ('line', pa.int32()),
+    ])
+    return pa.schema([
+        ('path', pa.string()),
+        ('digest', pa.string()),
+        ('text', pa.string()),
+        ('latex', pa.string()),
+        ('ocr_seconds', pa.float64()),
+        ('word_count', pa.int32()),
+        ('mean_conf', pa.float32()),
+        ('words', pa.list_(word)),
+    ])
+
+
+class ColumnarWriter:
+    """
+    Append batch results to a Parquet or Arrow IPC file.
+
+    Usage:
+        writer = ColumnarWriter('results.parquet')
+        writer.add(path, digest, text, latex, words, ocr_seconds)
+        writer.close()
+    """
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        """
+        Create the file.
+
+        Args:
+            path: Output file; ``.arrow``, ``.feather`` or ``.ipc`` for Arrow IPC, else Parquet.
+            row_group_size: Rows buffered before a record batch is written.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Columnar output needs pyarrow. Install with: pip install pyarrow") from None
+
+        self._pa = pa
+        self._schema = _schema(pa)
+        self._row_group_size = max(1, row_group_size)
+        self._lock = threading.Lock()
+        self._rows: Dict[str, List[Any]] = {name: [] for name in self._schema.names}
+        self.rows = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        if os.path.splitext(path)[1].lower() in ARROW_EXTENSIONS:
+            self._writer = pa.ipc.new_file(path, self._schema)
+        else:
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, self._schema, compression='zstd')
+
+    def add(
+        self,
+        path: str,
+        digest: str,
+        text: str,
+        latex: Optional[str],
+        words: List[Any],
+        ocr_seconds: Optional[float]
+    ) -> None:
+        """
+        Add one image's result (thread-safe).
+
+        Args:
+            path: Image path.
+            digest: Content hash of the image.
+            text: Recognized text.
+            latex: LaTeX result or None.
+            words: ``ocr.Word`` objects with boxes, confidences and page numbers.
+            ocr_seconds: Recognition time, or None if unknown.
+        """
+        # Tesseract reports -1 for boxes without a confidence
+        confs = [word.conf for word in words if word.conf >= 0]
+        with self._lock:
+            rows = self._rows
+            rows['path'].append(path)
+            rows['digest'].append(digest)
+            rows['text'].append(text)
+            rows['latex'].append(latex)
+            rows['ocr_seconds'].append(ocr_seconds)
+            rows['word_count'].append(len(words))
+            rows['mean_conf'].append(sum(confs) / len(confs) if confs else None)
+            rows['words'].append([
+                {
+                    'page': word.page,
+                    'text': word.text,
+                    'left': word.left,
+                    'top': word.top,
+                    'width': word.width,
+                    'height': word.height,
+                    'conf': word.conf,
+                    'block': word.line[0],
+                    'paragraph': word.line[1],
+                    'line': word.line[2],
+                }
+                for word in words
+            ])
+            if len(rows['path']) >= self._row_group_size:
+                self._write()
+
+    def _write(self) -> None:
+        """Write the buffered rows as one record batch (lock held)."""
+        count = len(self._rows['path'])
+        if not count:
+            return
+        with span('columnar_write', rows=count):
+            batch = self._pa.RecordBatch.from_pydict(self._rows, schema=self._schema)
+            self._writer.write_batch(batch)
+        self.rows += count
+        self._rows = {name: [] for name in self._schema.names}
+
+    def close(self) -> None:
+        """Write the remaining rows and finish the file."""
+        with self._lock:
+            self._write()
+            self._writer.close()
@@ -1,11 +1,24 @@
 """
 Configuration management for SnapOCR.
+
+Settings are resolved in memory from layers, highest priority first:
+
+1. Overrides (command line options, never saved)
+2. Environment variables (``SNAPOCR_<KEY>``, never saved)
+3. The user's config file
+4. Built-in defaults
+
+Only the file layer is ever written back, and only on an explicit save.
 """
 
+import atexit
 import json
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Callable, Dict, Tuple
 
 
 class Config:
@@ -17,8 +30,25 @@ class Config:
         "latex_conversion": False,
         "tesseract_path": None,
         "show_notification": True,
+        "capture_scope": "monitor",
+        "capture_backend": "auto",
+        "background_ocr": True,
+        "region_order": "selection",
+        "capture_queue_size": 4,
+        "presets": {},
+        "watch_dir": "~/Pictures/Screenshots",
+        "batch_max_side": 4000,
+        "frame_buffer_frames": 0,
+        "frame_buffer_interval": 1.0,
+        "frame_buffer_scale": 1.0,
     }
 
+    # Prefix of environment variables overriding config keys
+    ENV_PREFIX = 'SNAPOCR_'
+
+    # Seconds to wait for further changes before writing the file
+    SAVE_DELAY = 0.5
+
     def __init__(self, config_path: Optional[str] = None):
         """
         Initialize configuration.
@@ -28,7 +58,16 @@ class Config:
                         uses platform-specific default location.
         """
         self._config_path = config_path or self._get_default_config_path()
-        self._config: Dict[str, Any] = {}
+        self._file: Dict[str, Any] = {}
+        self._env: Dict[str, Any] = self._read_env()
+        self._overrides: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        self._atexit_registered = False
+        self._file_mtime: Optional[float] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._watch_stop = threading.Event()
         self._load()
 
     @staticmethod
@@ -47,35 +86,120 @@ class Config:
             # Linux: ~/.config/snapocr/config.json
             config_dir = Path.home() / ".config" / "snapocr"
 
-        config_dir.mkdir(parents=True, exist_ok=True)
         return str(config_dir / "config.json")
 
+    def _read_env(self) -> Dict[str, Any]:
+        """Read config overrides from SNAPOCR_<KEY> environment variables."""
+        env = {}
+        for key, default in self.DEFAULT_CONFIG.items():
+            raw = os.environ.get(self.ENV_PREFIX + key.upper())
+            if raw is None:
+                continue
+            if isinstance(default, bool):
+                env[key] = raw.strip().lower() in ('1', 'true', 'yes', 'on')
+            elif isinstance(default, (int, float)):
+                try:
+                    env[key] = type(default)(raw)
+                except ValueError:
+                    print(f"Warning: Ignoring invalid {self.ENV_PREFIX + key.upper()}={raw!r}")
+            elif isinstance(default, dict):
+                try:
+                    value = json.loads(raw)
+                    if not isinstance(value, dict):
+                        raise ValueError("expected a JSON object")
+                    env[key] = value
+                except ValueError:
+                    print(f"Warning: Ignoring invalid {self.ENV_PREFIX + key.upper()}={raw!r}")
+            else:
+                env[key] = raw
+        return env
+
     def _load(self) -> None:
-        """Load configuration from file."""
-        if os.path.exists(self._config_path):
+        """Load the file layer. A missing file is not created."""
+        with self._lock:
+            try:
+                self._file_mtime = os.stat(self._config_path).st_mtime
+            except OSError:
+                self._file_mtime = None
+                self._file = {}
+                return
+
             try:
                 with open(self._config_path, 'r', encoding='utf-8') as f:
-                    self._config = json.load(f)
-                # Merge with defaults for any missing keys
-                for key, value in self.DEFAULT_CONFIG.items():
-                    if key not in self._config:
-                        self._config[key] = value
-            except (json.JSONDecodeError, IOError) as e:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    raise ValueError("config root must be an object")
+                self._file = data
+            except (json.JSONDecodeError, ValueError, IOError) as e:
                 print(f"Warning: Could not load config file: {e}")
-                self._config = self.DEFAULT_CONFIG.copy()
-        else:
-            self._config = self.DEFAULT_CONFIG.copy()
-            self._save()
+                self._file = {}
 
     def _save(self) -> bool:
-        """Save configuration to file."""
-        try:
-            with open(self._config_path, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=2, ensure_ascii=False)
+        """Write the file layer atomically (temp file + rename)."""
+        with self._lock:
+            config_dir = os.path.dirname(self._config_path) or '.'
+            try:
+                os.makedirs(config_dir, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(
+                    prefix='.config-', suffix='.tmp', dir=config_dir
+                )
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(self._file, f, indent=2, ensure_ascii=False)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temp_path, self._config_path)
+                except BaseException:
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                    raise
+                self._file_mtime = os.stat(self._config_path).st_mtime
+                self._dirty = False
+                return True
+            except (IOError, OSError) as e:
+                print(f"Error: Could not save config file: {e}")
+                return False
+
+    def save(self, immediate: bool = False) -> bool:
+        """
+        Save the file layer.
+
+        Saves are debounced: several changes within SAVE_DELAY seconds
+        produce a single write. Pending saves are flushed at exit.
+
+        Args:
+            immediate: Write now instead of after the debounce delay.
+
+        Returns:
+            True if the write succeeded or was scheduled.
+        """
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if immediate:
+                return self._save()
+
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
             return True
-        except IOError as e:
-            print(f"Error: Could not save config file: {e}")
-            return False
+
+    def flush(self) -> bool:
+        """Write any pending changes now."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return True
+            return self._save()
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -88,20 +212,24 @@ class Config:
         Returns:
             The configuration value.
         """
-        return self._config.get(key, default)
+        for layer in (self._overrides, self._env, self._file, self.DEFAULT_CONFIG):
+            if key in layer:
+                return layer[key]
+        return default
 
     def set(self, key: str, value: Any, save: bool = True) -> None:
         """
-        Set a configuration value.
+        Set a configuration value in the user's config file.
 
         Args:
             key: The configuration key.
             value: The value to set.
-            save: Whether to save to file immediately.
+            save: Whether to save to file (debounced).
         """
-        self._config[key] = value
+        with self._lock:
+            self._file[key] = value
         if save:
-            self._save()
+            self.save()
 
     def update(self, updates: Dict[str, Any], save: bool = True) -> None:
         """
@@ -109,16 +237,92 @@ class Config:
 
         Args:
             updates: Dictionary of key-value pairs to update.
-            save: Whether to save to file immediately.
+            save: Whether to save to file (debounced).
         """
-        self._config.update(updates)
+        with self._lock:
+            self._file.update(updates)
         if save:
-            self._save()
+            self.save()
+
+    def override(self, updates: Dict[str, Any]) -> None:
+        """
+        Override values for this process only (e.g. from command line options).
+
+        Overrides take precedence over all other layers and are never saved.
+
+        Args:
+            updates: Dictionary of key-value pairs. None values are ignored.
+        """
+        self._overrides.update({k: v for k, v in updates.items() if v is not None})
+
+    @contextmanager
+    def temporary_overrides(self, updates: Dict[str, Any]):
+        """
+        Apply overrides for the duration of a ``with`` block.
+
+        Args:
+            updates: Dictionary of key-value pairs. None values are ignored.
+        """
+        previous = dict(self._overrides)
+        self.override(updates)
+        try:
+            yield self
+        finally:
+            self._overrides = previous
+
+    def reload(self) -> bool:
+        """
+        Re-read the config file if it changed on disk.
+
+        Returns:
+            True if the file layer was reloaded.
+        """
+        try:
+            mtime = os.stat(self._config_path).st_mtime
+        except OSError:
+            mtime = None
+        with self._lock:
+            if mtime == self._file_mtime or self._dirty:
+                return False
+            self._load()
+        return True
+
+    def watch(self, interval: float = 1.0, on_change: Optional[Callable[['Config'], None]] = None) -> None:
+        """
+        Hot-reload the config file in a background thread.
+
+        The file's modification time is polled, which costs a single stat
+        per interval. Writes made by this instance are not reported.
+
+        Args:
+            interval: Poll interval in seconds.
+            on_change: Optional callback invoked after a reload.
+        """
+        if self._watcher is not None:
+            return
+
+        def run():
+            while not self._watch_stop.wait(interval):
+                if self.reload():
+                    print(f"Config reloaded from {self._config_path}")
+                    if on_change:
+                        on_change(self)
+
+        self._watch_stop.clear()
+        self._watcher = threading.Thread(target=run, name='snapocr-config-watch', daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the hot-reload thread."""
+        if self._watcher is not None:
+            self._watch_stop.set()
+            self._watcher.join()
+            self._watcher = None
 
     @property
     def hotkey(self) -> str:
         """Get the configured hotkey."""
-        return self._config.get('hotkey', self.DEFAULT_CONFIG['hotkey'])
+        return self.get('hotkey', self.DEFAULT_CONFIG['hotkey'])
 
     @hotkey.setter
     def hotkey(self, value: str) -> None:
@@ -128,7 +332,7 @@ class Config:
     @property
     def language(self) -> str:
         """Get the OCR language setting."""
-        return self._config.get('language', self.DEFAULT_CONFIG['language'])
+        return self.get('language', self.DEFAULT_CONFIG['language'])
 
     @language.setter
     def language(self, value: str) -> None:
@@ -138,7 +342,7 @@ class Config:
     @property
     def latex_conversion(self) -> bool:
         """Get the LaTeX conversion setting."""
-        return self._config.get('latex_conversion', self.DEFAULT_CONFIG['latex_conversion'])
+        return self.get('latex_conversion', self.DEFAULT_CONFIG['latex_conversion'])
 
     @latex_conversion.setter
     def latex_conversion(self, value: bool) -> None:
@@ -148,13 +352,74 @@ class Config:
     @property
     def tesseract_path(self) -> Optional[str]:
         """Get the Tesseract executable path."""
-        return self._config.get('tesseract_path', self.DEFAULT_CONFIG['tesseract_path'])
+        return self.get('tesseract_path', self.DEFAULT_CONFIG['tesseract_path'])
 
     @tesseract_path.setter
     def tesseract_path(self, value: Optional[str]) -> None:
         """Set the Tesseract path."""
         self.set('tesseract_path', value)
 
+    def get_presets(self) -> Dict[str, Tuple[int, int, int, int]]:
+        """
+        Get the named capture rectangles.
+
+        Returns:
+            Mapping of preset name to (x, y, width, height); invalid entries are skipped.
+        """
+        presets = {}
+        for name, rect in (self.get('presets') or {}).items():
+            try:
+                x, y, w, h = (int(v) for v in rect)
+            except (TypeError, ValueError):
+                print(f"Warning: Ignoring invalid preset '{name}': {rect!r}")
+                continue
+            presets[name] = (x, y, w, h)
+        return presets
+
+    def get_preset(self, name: str) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Get a named capture rectangle.
+
+        Args:
+            name: Preset name.
+
+        Returns:
+            (x, y, width, height), or None if there is no such preset.
+        """
+        return self.get_presets().get(name)
+
+    def set_preset(self, name: str, rect: Tuple[int, int, int, int], save: bool = True) -> None:
+        """
+        Store a named capture rectangle in the user's config file.
+
+        Args:
+            name: Preset name.
+            rect: (x, y, width, height) in screen coordinates.
+            save: Whether to save to file (debounced).
+        """
+        with self._lock:
+            presets = dict(self._file.get('presets') or {})
+            presets[name] = [int(v) for v in rect]
+        self.set('presets', presets, save=save)
+
+    def remove_preset(self, name: str, save: bool = True) -> bool:
+        """
+        Delete a named capture rectangle from the user's config file.
+
+        Args:
+            name: Preset name.
+            save: Whether to save to file (debounced).
+
+        Returns:
+            True if the preset existed.
+        """
+        with self._lock:
+            presets = dict(self._file.get('presets') or {})
+            if presets.pop(name, None) is None:
+                return False
+        self.set('presets', presets, save=save)
+        return True
+
     @property
     def config_path(self) -> str:
         """Get the configuration file path."""
@@ -162,9 +427,13 @@ class Config:
 
     def reset(self) -> None:
         """Reset configuration to defaults."""
-        self._config = self.DEFAULT_CONFIG.copy()
-        self._save()
+        with self._lock:
+            self._file = {}
+        self.save()
 
     def to_dict(self) -> Dict[str, Any]:
-        """Get configuration as dictionary."""
-        return self._config.copy()
\ No newline at end of file
+        """Get the resolved configuration as dictionary."""
+        resolved = dict(self.DEFAULT_CONFIG)
+        for layer in (self._file, self._env, self._overrides):
+            resolved.update(layer)
+        return resolved
@@ -0,0 +1,415 @@
+"""
+Automatic OCR of images dropped into a folder.
+
+On Linux the folder is watched with inotify: a file is noticed when its
+writer closes it or when it is moved in, so nothing is polled. Other
+platforms fall back to rescanning the folder. Either way a file is only
+queued once its size and mtime have stopped changing for a settle period,
+so partially written screenshots are never read.
+
+Queued files live in a small SQLite database next to the config file;
+work that was pending when the service stopped is picked up again after a
+restart. Results are written next to each image as ``<name>.txt`` (the
+text) and ``<name>.json`` (text, LaTeX and timings).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .trace import span
+
+
+# File extensions treated as images
+IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff', '.webp'})
+
+# Seconds a file's size and mtime must stay unchanged before it is queued
+SETTLE_SECONDS = 1.0
+
+# Seconds between throughput reports
+REPORT_INTERVAL = 60.0
+
+
+def is_image_file(path: str) -> bool:
+    """Check whether a path has an image extension."""
+    return os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS
+
+
+def sidecar_paths(path: str, output_dir: Optional[str] = None, root: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Get the result file paths for an image.
+
+    Args:
+        path: Image path.
+        output_dir: Directory for the results; next to the image if None.
+        root: Folder whose layout is mirrored under ``output_dir`` (the image's
+            path relative to it is kept); results go flat into ``output_dir`` if None.
+
+    Returns:
+        Tuple of (text path, JSON path).
+    """
+    base = os.path.splitext(path)[0]
+    if output_dir:
+        relative = os.path.relpath(base, root) if root else os.path.basename(base)
+        base = os.path.join(output_dir, relative)
+    return base + '.txt', base + '.json'
+
+
+def _write_atomic(path: str, content: str) -> None:
+    """Write a file so readers never see it half written."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def write_sidecars(
+    path: str,
+    text: str,
+    details: Dict[str, Any],
+    output_dir: Optional[str] = None,
+    root: Optional[str] = None
+) -> None:
+    """
+    Write the text and JSON results of an image.
+
+    Args:
+        path: Image path.
+        text: Recognized text (formatted result).
+        details: Extra fields for the JSON file.
+        output_dir: Directory for the results; next to the image if None.
+        root: See ``sidecar_paths``.
+    """
+    text_path, json_path = sidecar_paths(path, output_dir, root)
+    if output_dir:
+        os.makedirs(os.path.dirname(text_path), exist_ok=True)
+    _write_atomic(text_path, text)
+    record = {'source': os.path.basename(path), 'text': text, **details}
+    _write_atomic(json_path, json.dumps(record, ensure_ascii=False, indent=2))
+
+
+class WorkQueue:
+    """
+    Persistent FIFO of image paths waiting for OCR.
+
+    Paths stay in the database until ``done()``; anything taken but not
+    finished when the process died is handed out again on the next start.
+    """
+
+    def __init__(self, db_path: str, directory: str):
+        """
+        Open (or create) the queue.
+
+        Args:
+            db_path: SQLite database file.
+            directory: Watched directory; only its entries are handed out.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS queue ('
+            ' path TEXT PRIMARY KEY, directory TEXT NOT NULL,'
+            ' queued_at REAL NOT NULL, taken INTEGER NOT NULL DEFAULT 0)'
+        )
+        self._db.execute('UPDATE queue SET taken = 0 WHERE directory = ?', (directory,))
+
+    def put(self, path: str, queued_at: Optional[float] = None) -> bool:
+        """
+        Queue a path.
+
+        Args:
+            path: Image path.
+            queued_at: time.time() when the file appeared (default: now).
+
+        Returns:
+            True if queued, False if it was already waiting.
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                'INSERT OR IGNORE INTO queue (path, directory, queued_at) VALUES (?, ?, ?)',
+                (path, self._directory, queued_at or time.time())
+            )
+            return cursor.rowcount > 0
+
+    def take(self) -> Optional[Tuple[str, float]]:
+        """
+        Hand out the oldest waiting path.
+
+        Returns:
+            Tuple of (path, queued_at), or None if nothing is waiting.
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT path, queued_at FROM queue WHERE directory = ? AND taken = 0'
+                ' ORDER BY queued_at LIMIT 1',
+                (self._directory,)
+            ).fetchone()
+            if row is not None:
+                self._db.execute('UPDATE queue SET taken = 1 WHERE path = ?', (row[0],))
+            return row
+
+    def done(self, path: str) -> None:
+        """Remove a finished (or failed) path."""
+        with self._lock:
+            self._db.execute('DELETE FROM queue WHERE path = ?', (path,))
+
+    @property
+    def pending(self) -> int:
+        """Number of paths waiting or in progress."""
+        with self._lock:
+            return self._db.execute(
+                'SELECT COUNT(*) FROM queue WHERE directory = ?', (self._directory,)
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+class _ScanWatch:
+    """Fallback for platforms without inotify: rescan the folder."""
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self.overflowed = False
+        self._seen = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, float]]:
+        files = {}
+        with os.scandir(self._directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_size, stat.st_mtime)
+        return files
+
+    def read(self, timeout: Optional[float] = None) -> List[str]:
+        time.sleep(timeout or 1.0)
+        current = self._snapshot()
+        changed = [path for path, state in current.items() if self._seen.get(path) != state]
+        self._seen = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+def open_directory_watch(directory: str):
+    """
+    Watch a directory with inotify, or by rescanning where inotify is unavailable.
+
+    Returns:
+        Object with ``read(timeout) -> List[str]``, ``overflowed`` and ``close()``.
+    """
+    from ..platform import inotify
+
+    if inotify.is_available():
+        try:
+            return inotify.DirectoryWatch(directory)
+        except OSError as e:
+            print(f"Warning: inotify unavailable, rescanning the folder instead: {e}")
+    return _ScanWatch(directory)
+
+
+class DirectoryService:
+    """
+    Watch a folder and OCR every image that lands in it.
+
+    Usage:
+        service = DirectoryService(folder, recognize=ocr_file, queue_path=db)
+        service.run()                     # until stop() or Ctrl+C
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        recognize: Callable[[str], Tuple[str, Optional[str]]],
+        queue_path: str,
+        workers: int = 2,
+        settle: float = SETTLE_SECONDS,
+        output_dir: Optional[str] = None,
+        include_existing: bool = False,
+        details: Optional[Dict[str, Any]] = None,
+        report: Callable[[str], None] = print
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            directory: Folder to watch.
+            recognize: Returns (result text, LaTeX or None) for an image path.
+            queue_path: SQLite file of the persistent queue.
+            workers: Images recognized concurrently.
+            settle: Seconds a new file must stay unchanged before it is queued.
+            output_dir: Directory for the results; next to the images if None.
+            include_existing: Also queue images already in the folder without results.
+            details: Extra fields for every JSON result (e.g. the language).
+            report: Receives progress and throughput messages.
+        """
+        self._directory = os.path.abspath(directory)
+        self._recognize = recognize
+        self._queue = WorkQueue(queue_path, self._directory)
+        self._workers = max(1, workers)
+        self._settle = settle
+        self._output_dir = output_dir
+        self._include_existing = include_existing
+        self._details = details or {}
+        self._report = report
+        self._settling: Dict[str, Tuple[Tuple[int, float], float, float]] = {}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        # Throughput counters
+        self._processed = 0
+        self._failed = 0
+        self._lag_total = 0.0
+        self._started = time.monotonic()
+
+    def _has_result(self, path: str) -> bool:
+        return os.path.exists(sidecar_paths(path, self._output_dir)[0])
+
+    def _queue_existing(self) -> int:
+        """Queue images in the folder that have no result yet."""
+        queued = 0
+        with os.scandir(self._directory) as entries:
+            for entry in entries:
+                if entry.is_file() and is_image_file(entry.name) and not self._has_result(entry.path):
+                    queued += self._queue.put(entry.path, entry.stat().st_mtime)
+        return queued
+
+    def _track(self, path: str) -> None:
+        """Start waiting for a new or rewritten file to settle."""
+        if is_image_file(path) and path not in self._settling:
+            self._settling[path] = ((-1, 0.0), time.monotonic(), time.time())
+
+    def _settle_files(self) -> None:
+        """Queue the files whose size and mtime stopped changing."""
+        now = time.monotonic()
+        for path, (state, changed_at, seen_at) in list(self._settling.items()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._settling[path]  # Deleted or renamed before it settled
+                continue
+            current = (stat.st_size, stat.st_mtime)
+            if current != state:
+                self._settling[path] = (current, now, seen_at)
+            elif stat.st_size > 0 and now - changed_at >= self._settle:
+                del self._settling[path]
+                self._queue.put(path, seen_at)
+
+    def _process(self, path: str, queued_at: float) -> None:
+        """Recognize one image and write its results (worker thread)."""
+        started = time.perf_counter()
+        try:
+            with span('watch_dir_ocr', file=os.path.basename(path)):
+                text, latex = self._recognize(path)
+            ocr_seconds = time.perf_counter() - started
+            lag = time.time() - queued_at
+            write_sidecars(path, text, {
+                **self._details,
+                'latex': latex,
+                'ocr_seconds': round(ocr_seconds, 3),
+                'lag_seconds': round(lag, 3),
+                'processed_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }, self._output_dir)
+            with self._lock:
+                self._processed += 1
+                self._lag_total += lag
+            self._report(
+                f"{os.path.basename(path)}: {len(text)} characters, "
+                f"OCR {ocr_seconds:.2f} s, lag {lag:.1f} s"
+            )
+        except Exception as e:
+            with self._lock:
+                self._failed += 1
+            self._report(f"Error processing {os.path.basename(path)}: {e}")
+        finally:
+            self._queue.done(path)
+            with self._lock:
+                self._in_flight -= 1
+
+    def _dispatch(self, executor: ThreadPoolExecutor) -> None:
+        """Hand queued images to idle workers."""
+        while True:
+            with self._lock:
+                if self._in_flight >= self._workers:
+                    return
+            item = self._queue.take()
+            if item is None:
+                return
+            with self._lock:
+                self._in_flight += 1
+            executor.submit(self._process, *item)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get throughput counters.
+
+        Returns:
+            Dict with processed, failed, per_minute, mean_lag and queued.
+        """
+        with self._lock:
+            processed, failed, lag_total = self._processed, self._failed, self._lag_total
+        minutes = max(time.monotonic() - self._started, 1e-6) / 60
+        return {
+            'processed': processed,
+            'failed': failed,
+            'per_minute': processed / minutes,
+            'mean_lag': lag_total / processed if processed else 0.0,
+            'queued': self._queue.pending,
+        }
+
+    def _report_stats(self) -> None:
+        stats = self.stats()
+        self._report(
+            f"Processed {stats['processed']} images ({stats['per_minute']:.1f}/min), "
+            f"{stats['failed']} failed, {stats['queued']} queued, mean lag {stats['mean_lag']:.1f} s"
+        )
+
+    def run(self) -> None:
+        """Watch and process until ``stop()`` is called."""
+        self._stop.clear()
+        watch = open_directory_watch(self._directory)
+        resumed = self._queue.pending
+        if resumed:
+            self._report(f"Resuming {resumed} queued image(s)")
+        if self._include_existing:
+            self._queue_existing()
+
+        last_report = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='snapocr-watch-dir') as executor:
+                try:
+                    while not self._stop.is_set():
+                        self._dispatch(executor)
+                        busy = self._settling or self._in_flight
+                        for path in watch.read(timeout=0.1 if busy else 1.0):
+                            self._track(path)
+                        if watch.overflowed:
+                            # Events were dropped: pick up whatever has no result yet
+                            watch.overflowed = False
+                            self._queue_existing()
+                        self._settle_files()
+                        if time.monotonic() - last_report >= REPORT_INTERVAL:
+                            last_report = time.monotonic()
+                            self._report_stats()
+                finally:
+                    # Let running images finish; the rest stays queued on disk
+                    executor.shutdown(wait=True, cancel_futures=True)
+        finally:
+            watch.close()
+            self._report_stats()
+            self._queue.close()
+
+    def stop(self) -> None:
+        """Stop after the images currently being recognized."""
+        self._stop.set()
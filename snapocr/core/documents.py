@@ -0,0 +1,413 @@
+"""
+Page-by-page OCR of multi-page images with Tesseract's structured outputs.
+
+Scanned documents arrive as multi-frame TIFFs (or GIF/WebP animations).
+Pages are decoded one at a time by seeking through the frames, so a file
+is never fully decoded in memory. Besides plain text, Tesseract can render
+hOCR, ALTO XML, TSV and a searchable PDF (image with an invisible text
+layer). Each page gets one Tesseract run that produces every requested
+format at once; pages run in parallel and their outputs are appended to
+the document files in page order as soon as they are ready.
+
+Merging PDFs would need a PDF library, so when a PDF is requested the
+pages are instead streamed to temporary files and rendered by a single
+Tesseract run over a list file, whose renderers write every format page
+by page.
+"""
+
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import Executor, Future
+from dataclasses import replace
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from .ocr import (
+    TESSERACT_CONFIG, Word, convert_to_latex, has_math_patterns, parse_tsv, prepare_tesseract,
+)
+from .trace import span
+
+
+# Output formats: Tesseract config file name and output file extension
+FORMATS = {
+    'txt': ('txt', '.txt'),
+    'hocr': ('hocr', '.hocr'),
+    'alto': ('alto', '.xml'),
+    'tsv': ('tsv', '.tsv'),
+    'pdf': ('pdf', '.pdf'),
+}
+
+# Separator between page texts (as in Tesseract's text output)
+PAGE_SEPARATOR = '\f'
+
+
+def parse_formats(text: str) -> List[str]:
+    """
+    Parse a comma-separated list of output formats.
+
+    Args:
+        text: e.g. "txt,hocr,pdf".
+
+    Returns:
+        Format names in a stable order, always including 'txt'.
+
+    Raises:
+        ValueError: If a format is unknown.
+    """
+    requested = {part.strip().lower() for part in text.split(',') if part.strip()}
+    unknown = requested - set(FORMATS)
+    if unknown:
+        raise ValueError(f"unknown format(s) {', '.join(sorted(unknown))} (available: {', '.join(FORMATS)})")
+    return [name for name in FORMATS if name in requested | {'txt'}]
+
+
+def page_count(path: str) -> int:
+    """Number of frames in an image file (1 for ordinary images)."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return getattr(image, 'n_frames', 1)
+
+
+def iter_pages(path: str) -> Iterator:
+    """
+    Decode the pages of an image file one at a time.
+
+    Args:
+        path: Image file (multi-frame TIFF, GIF, WebP... or a single image).
+
+    Yields:
+        Each page as a standalone PIL image.
+    """
+    from PIL import Image
+
+    with Image.open(path) as image:
+        for index in range(getattr(image, 'n_frames', 1)):
+            image.seek(index)
+            with span('decode_page', page=index + 1):
+                page = image.copy()
+            yield page
+
+
+def _tesseract_language(language: str, tesseract_path: Optional[str]) -> Tuple[str, str]:
+    """Get the Tesseract command and resolved language string."""
+    pytesseract, language = prepare_tesseract(language, tesseract_path)
+    return pytesseract.pytesseract.tesseract_cmd, language
+
+
+def _run_tesseract(command: str, source: str, language: str, formats: List[str], tmp_dir: str) -> Dict[str, str]:
+    """
+    Run Tesseract once with several renderers.
+
+    Returns:
+        Dict of format to output file path inside ``tmp_dir``.
+    """
+    output_base = os.path.join(tmp_dir, 'out')
+    args = [
+        command, source, output_base, '-l', language, *shlex.split(TESSERACT_CONFIG),
+        *(FORMATS[name][0] for name in formats),
+    ]
+    process = subprocess.run(args, capture_output=True)
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.decode('utf-8', 'replace').strip() or "Tesseract failed")
+    return {name: output_base + FORMATS[name][1] for name in formats}
+
+
+def _read(path: str) -> str:
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def recognize_page(
+    page: Any,
+    formats: List[str],
+    command: str,
+    language: str,
+    latex_mode: bool = False,
+    auto_detect_math: bool = True
+) -> Dict[str, Optional[str]]:
+    """
+    Recognize one page into every requested (non-PDF) format.
+
+    Args:
+        page: PIL image, or the path of a single-page image file.
+
+    Returns:
+        Dict of format to output text, plus 'latex'.
+    """
+    with tempfile.TemporaryDirectory(prefix='snapocr-page-') as tmp_dir:
+        if isinstance(page, str):
+            source = page
+        else:
+            source = os.path.join(tmp_dir, 'page.png')
+            page.save(source)
+        with span('tesseract_page', formats=','.join(formats)):
+            outputs = {name: _read(path) for name, path in _run_tesseract(command, source, language, formats, tmp_dir).items()}
+
+    text = outputs['txt'] = outputs['txt'].strip()
+    outputs['latex'] = None
+    if latex_mode or (auto_detect_math and has_math_patterns(text)):
+        if isinstance(page, str):
+            from PIL import Image
+
+            with Image.open(page) as image:
+                outputs['latex'] = convert_to_latex(image)
+        else:
+            outputs['latex'] = convert_to_latex(page)
+    return outputs
+
+
+def recognize_words(
+    image: Any,
+    language: str = 'chi_sim+eng',
+    tesseract_path: Optional[str] = None,
+    latex_mode: bool = False,
+    auto_detect_math: bool = True
+) -> Tuple[str, Optional[str], List[Word]]:
+    """
+    Recognize the text and the word boxes of an image in one Tesseract run.
+
+    Args:
+        image: PIL image, or the path of a single-page image file.
+        language: Tesseract language code(s).
+        tesseract_path: Optional path to Tesseract executable.
+        latex_mode: Force LaTeX conversion.
+        auto_detect_math: Convert images whose text looks like math.
+
+    Returns:
+        Tuple of (text, LaTeX or None, words).
+    """
+    command, language = _tesseract_language(language, tesseract_path)
+    outputs = recognize_page(image, ['txt', 'tsv'], command, language, latex_mode, auto_detect_math)
+    return outputs['txt'], outputs['latex'], parse_tsv(outputs['tsv'])
+
+
+class DocumentWriter:
+    """
+    Append per-page hOCR, ALTO and TSV outputs to one document file each.
+
+    Tesseract renders every page as a complete document; the writer keeps
+    the header of the first page, renumbers the element ids of each page
+    and closes the documents at the end.
+    """
+
+    def __init__(self, output_base: str, formats: List[str], source_name: str):
+        """
+        Open the output files.
+
+        Args:
+            output_base: Output path without extension.
+            formats: Formats to write (txt and pdf are ignored).
+            source_name: Input file name recorded in the documents.
+        """
+        self._source_name = source_name
+        self._files: Dict[str, IO[str]] = {}
+        self._tails: Dict[str, str] = {}
+        self._paths = {}
+        for name in formats:
+            if name in ('hocr', 'alto', 'tsv'):
+                path = output_base + FORMATS[name][1]
+                self._paths[name] = path
+                self._files[name] = open(path + '.tmp', 'w', encoding='utf-8')
+
+    def add_page(self, number: int, outputs: Dict[str, Optional[str]]) -> None:
+        """
+        Append one page.
+
+        Args:
+            number: 1-based page number; pages must be added in order.
+            outputs: Per-format page outputs from ``recognize_page``.
+        """
+        for name, f in self._files.items():
+            content = outputs.get(name) or ''
+            if name == 'tsv':
+                self._add_tsv(f, number, content)
+            elif name == 'hocr':
+                self._add_markup(f, name, number, content, '<body>', '</body>', self._renumber_hocr)
+            else:
+                self._add_markup(f, name, number, content, '<Layout>', '</Layout>', self._renumber_alto)
+            f.flush()
+
+    def _add_markup(self, f, name: str, number: int, content: str, open_tag: str, close_tag: str, renumber) -> None:
+        """Append the body of a page document, writing the header once."""
+        start = content.find(open_tag)
+        end = content.rfind(close_tag)
+        if start < 0 or end < 0:
+            return
+        # Whole lines, so the pages keep their indentation
+        start = content.find('\n', start) + 1 or start + len(open_tag)
+        end = content.rfind('\n', 0, end) + 1
+        if number == 1:
+            f.write(re.sub(r'(<fileName>)[^<]*', rf'\g<1>{self._source_name}', content[:start]))
+            self._tails[name] = content[end:]
+        f.write(renumber(content[start:end], number))
+
+    def _renumber_hocr(self, body: str, number: int) -> str:
+        body = re.sub(r"(id='[a-z_]+?_)1(?=[_'])", rf"\g<1>{number}", body)
+        body = re.sub(r'ppageno \d+', f'ppageno {number - 1}', body)
+        return re.sub(r'image "[^"]*"', f'image "{self._source_name}"', body)
+
+    @staticmethod
+    def _renumber_alto(body: str, number: int) -> str:
+        body = re.sub(r'PHYSICAL_IMG_NR="\d+"', f'PHYSICAL_IMG_NR="{number - 1}"', body)
+        body = re.sub(r'ID="page_\d+"', f'ID="page_{number - 1}"', body)
+        return re.sub(r'ID="(?!page_)([A-Za-z]+)_(\d+)"', rf'ID="\1_{number - 1}_\2"', body)
+
+    @staticmethod
+    def _add_tsv(f, number: int, content: str) -> None:
+        lines = content.splitlines()
+        if not lines:
+            return
+        if number == 1:
+            f.write(lines[0] + '\n')
+        for line in lines[1:]:
+            fields = line.split('\t')
+            if len(fields) > 1:
+                fields[1] = str(number)
+            f.write('\t'.join(fields) + '\n')
+
+    def close(self) -> None:
+        """Finish the documents and move them into place."""
+        for name, f in self._files.items():
+            f.write(self._tails.get(name, ''))
+            f.close()
+            os.replace(self._paths[name] + '.tmp', self._paths[name])
+        self._files = {}
+
+    def abort(self) -> None:
+        """Discard the partial documents."""
+        for name, f in self._files.items():
+            f.close()
+            try:
+                os.remove(self._paths[name] + '.tmp')
+            except OSError:
+                pass
+        self._files = {}
+
+
+def recognize_document(
+    path: str,
+    output_base: str,
+    formats: List[str],
+    language: str = 'chi_sim+eng',
+    tesseract_path: Optional[str] = None,
+    latex_mode: bool = False,
+    auto_detect_math: bool = True,
+    executor: Optional[Executor] = None,
+    window: int = 4,
+    with_words: bool = False
+) -> Tuple:
+    """
+    Recognize every page of an image file and write the structured outputs.
+
+    Args:
+        path: Image file, single- or multi-page.
+        output_base: Output path without extension (``<base>.hocr``, ``.xml``, ``.tsv``, ``.pdf``).
+        formats: Formats from ``parse_formats``; text is returned, not written.
+        language: Tesseract language code(s).
+        tesseract_path: Optional path to Tesseract executable.
+        latex_mode: Force LaTeX conversion for every page.
+        auto_detect_math: Convert pages whose text looks like math.
+        executor: Pool to recognize pages in parallel; pages run inline if None.
+        window: Most pages decoded or in progress at once.
+        with_words: Also return the words with their boxes and page numbers.
+
+    Returns:
+        Tuple of (page texts joined by form feeds, LaTeX of the pages or None),
+        plus the words if ``with_words`` is set.
+    """
+    command, language = _tesseract_language(language, tesseract_path)
+    source_name = os.path.basename(path)
+    # Words come from the TSV renderer, whether or not a .tsv file is written
+    run_formats = formats + ['tsv'] if with_words and 'tsv' not in formats else formats
+
+    if 'pdf' in formats:
+        text, latex, words = _recognize_with_list(
+            path, output_base, formats, run_formats, command, language, latex_mode, auto_detect_math
+        )
+        return (text, latex, words) if with_words else (text, latex)
+
+    writer = DocumentWriter(output_base, formats, source_name)
+    texts: List[str] = []
+    latex: List[str] = []
+    words: List[Word] = []
+
+    def collect(number: int, outputs: Dict[str, Optional[str]]) -> None:
+        writer.add_page(number, outputs)
+        texts.append(outputs['txt'])
+        if outputs['latex']:
+            latex.append(outputs['latex'])
+        if with_words:
+            words.extend(replace(word, page=number) for word in parse_tsv(outputs['tsv']))
+
+    try:
+        running: List[Future] = []
+        for number, page in enumerate(iter_pages(path), start=1):
+            if executor is None:
+                collect(number, recognize_page(page, run_formats, command, language, latex_mode, auto_detect_math))
+                continue
+            running.append(executor.submit(
+                recognize_page, page, run_formats, command, language, latex_mode, auto_detect_math
+            ))
+            # Write finished pages in order; wait when the window is full
+            while running and (running[0].done() or len(running) >= window):
+                collect(len(texts) + 1, running.pop(0).result())
+        for future in running:
+            collect(len(texts) + 1, future.result())
+    except BaseException:
+        for future in running if executor is not None else []:
+            future.cancel()
+        writer.abort()
+        raise
+    writer.close()
+    text = PAGE_SEPARATOR.join(texts)
+    return (text, '\n\n'.join(latex) or None, words) if with_words else (text, '\n\n'.join(latex) or None)
+
+
+def _recognize_with_list(
+    path: str,
+    output_base: str,
+    formats: List[str],
+    run_formats: List[str],
+    command: str,
+    language: str,
+    latex_mode: bool = False,
+    auto_detect_math: bool = True
+) -> Tuple[str, Optional[str], List[Word]]:
+    """Render all formats, including PDF, with one Tesseract run over the pages."""
+    with tempfile.TemporaryDirectory(prefix='snapocr-doc-') as tmp_dir:
+        page_paths = []
+        for number, page in enumerate(iter_pages(path), start=1):
+            page_path = os.path.join(tmp_dir, f'page_{number:05d}.png')
+            page.save(page_path)
+            page_paths.append(page_path)
+        list_path = os.path.join(tmp_dir, 'pages.txt')
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(page_paths) + '\n')
+
+        with span('tesseract_document', pages=len(page_paths), formats=','.join(run_formats)):
+            outputs = _run_tesseract(command, list_path, language, run_formats, tmp_dir)
+
+        words = parse_tsv(_read(outputs['tsv'])) if 'tsv' in outputs else []
+        for name, output in outputs.items():
+            if name in formats and name != 'txt':
+                shutil.move(output, output_base + FORMATS[name][1])
+
+        pages = [page.strip() for page in _read(outputs['txt']).split(PAGE_SEPARATOR)]
+        if len(pages) > len(page_paths) and not pages[-1]:
+            pages.pop()
+
+        # Math is converted page by page, as in recognize_page
+        latex = []
+        for page_path, text in zip(page_paths, pages):
+            if latex_mode or (auto_detect_math and has_math_patterns(text)):
+                from PIL import Image
+
+                with Image.open(page_path) as image:
+                    page_latex = convert_to_latex(image)
+                if page_latex:
+                    latex.append(page_latex)
+    return PAGE_SEPARATOR.join(pages), '\n\n'.join(latex) or None, words
@@ -0,0 +1,141 @@
+"""
+Input loading for batch jobs.
+
+Camera photos and large scans are far bigger than Tesseract needs for
+ordinary text. The loader reads only the image header first: files that
+are upright and no larger than the size limit go to Tesseract untouched
+(it decodes them itself). Others are decoded here, JPEGs directly at a
+reduced scale (draft mode decodes 1/2, 1/4 or 1/8 of the DCT data), then
+downscaled to the limit and turned upright from their EXIF orientation.
+
+``Prefetcher`` runs the loading on its own thread a few images ahead, so
+decoding overlaps with the OCR of the previous images.
+"""
+
+import queue
+import threading
+from typing import Any, Iterable, Iterator, Optional
+
+from .trace import span
+
+
+# Longest image side passed to the OCR engine by default (0 disables the limit)
+DEFAULT_MAX_SIDE = 4000
+
+# EXIF tag of the image orientation
+_ORIENTATION = 0x0112
+
+
+def load_image(path: str, max_side: int = DEFAULT_MAX_SIDE):
+    """
+    Prepare an image file for OCR.
+
+    Args:
+        path: Image file.
+        max_side: Longest side in pixels after loading (0 for no limit).
+
+    Returns:
+        The decoded, upright and downscaled PIL image, or None if the file
+        can be passed to the OCR engine as it is.
+    """
+    from PIL import Image
+
+    image = Image.open(path)
+    try:
+        if getattr(image, 'n_frames', 1) > 1:
+            return None  # Multi-page files are read page by page
+        width, height = image.size
+        scale = max_side / max(width, height) if 0 < max_side < max(width, height) else 1.0
+        orientation = image.getexif().get(_ORIENTATION, 1)
+        if scale == 1.0 and orientation == 1:
+            return None
+
+        target = (max(1, round(width * scale)), max(1, round(height * scale)))
+        with span('load_image', width=width, height=height):
+            if scale < 1.0:
+                # JPEG: decode at the smallest DCT scale still at least the target size
+                image.draft(image.mode, target)
+            image.load()
+            # Downscale before turning upright, so only the small image is rotated;
+            # area averaging is several times faster than Lanczos and as good for text
+            loaded = image.resize(target, Image.BOX) if image.size != target else image.copy()
+            method = _upright_transpose(orientation)
+            return loaded.transpose(method) if method is not None else loaded
+    finally:
+        image.close()
+
+
+def _upright_transpose(orientation: int):
+    """Get the transposition that turns an EXIF orientation upright, or None."""
+    from PIL import Image
+
+    return {
+        2: Image.Transpose.FLIP_LEFT_RIGHT,
+        3: Image.Transpose.ROTATE_180,
+        4: Image.Transpose.FLIP_TOP_BOTTOM,
+        5: Image.Transpose.TRANSPOSE,
+        6: Image.Transpose.ROTATE_270,
+        7: Image.Transpose.TRANSVERSE,
+        8: Image.Transpose.ROTATE_90,
+    }.get(orientation)
+
+
+class Prefetcher:
+    """
+    Run an iterator on a background thread, keeping a few items ready.
+
+    Usage:
+        for item in Prefetcher(expensive_items(), depth=4):
+            ...
+
+    An exception raised by the iterator is re-raised in the consumer.
+    """
+
+    def __init__(self, items: Iterable[Any], depth: int = 4):
+        """
+        Start producing.
+
+        Args:
+            items: Items to produce; iterated on the background thread.
+            depth: Most items produced ahead of the consumer.
+        """
+        self._items = items
+        self._queue: 'queue.Queue[Any]' = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._done = object()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._produce, name='snapocr-prefetch', daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        """Queue an item unless the consumer went away."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self) -> None:
+        try:
+            for item in self._items:
+                if not self._put(item):
+                    return
+        except BaseException as e:
+            self._error = e
+        self._put(self._done)
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            item = self._queue.get()
+            if item is self._done:
+                if self._error is not None:
+                    raise self._error
+                return
+            yield item
+
+    def close(self) -> None:
+        """Stop producing and release the background thread."""
+        self._stop.set()
+        self._thread.join()
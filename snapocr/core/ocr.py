@@ -5,13 +5,35 @@ OCR text extraction with LaTeX conversion support.
 import os
 import re
 import sys
-from typing import Optional, Tuple
-from PIL import Image
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
-try:
-    import pytesseract
-except ImportError:
-    pytesseract = None
+from .trace import span
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+# Lazy-loaded pytesseract module (False until the first import attempt)
+_pytesseract = False
+
+
+def _get_pytesseract():
+    """
+    Lazy import pytesseract, which also pulls in PIL.
+
+    Returns:
+        The pytesseract module or None if not installed.
+    """
+    global _pytesseract
+    if _pytesseract is False:
+        with span('import_pytesseract'):
+            try:
+                import pytesseract
+                _pytesseract = pytesseract
+            except ImportError:
+                _pytesseract = None
+    return _pytesseract
 
 
 def get_bundled_tesseract_path() -> Optional[str]:
@@ -54,6 +76,7 @@ def setup_tesseract() -> Optional[str]:
     Returns:
         Path to Tesseract executable or None.
     """
+    pytesseract = _get_pytesseract()
     if pytesseract is None:
         return None
 
@@ -82,20 +105,51 @@ def _get_latex_model():
     if _latex_model is None:
         try:
             from rapid_latex_ocr import LatexOCR
-            print("Loading LaTeX OCR model...")
-            _latex_model = LatexOCR()
-            print("LaTeX OCR model loaded successfully")
+            print("Loading LaTeX OCR model...", file=sys.stderr)
+            with span('latex_model_load'):
+                _latex_model = LatexOCR()
+            print("LaTeX OCR model loaded successfully", file=sys.stderr)
         except ImportError as e:
-            print(f"Warning: rapid-latex-ocr not installed: {e}")
-            print("Install with: pip install rapid-latex-ocr")
+            print(f"Warning: rapid-latex-ocr not installed: {e}", file=sys.stderr)
+            print("Install with: pip install rapid-latex-ocr", file=sys.stderr)
             return None
         except Exception as e:
-            print(f"Warning: Could not load LaTeX OCR model: {e}")
+            print(f"Warning: Could not load LaTeX OCR model: {e}", file=sys.stderr)
             return None
     return _latex_model
 
 
-def detect_math_content(image: Image.Image) -> bool:
+# Patterns suggesting mathematical content in OCR text
+MATH_PATTERNS = [
+    r'[=+\-*/^]',
+    r'[∑∫∏∂∇]',
+    r'[α-ωΑ-Ω]',
+    r'[<>≤≥≠±×÷]',
+    r'\d+\s*[xy]\s*=',
+    r'[xy]\s*\^',
+    r'\d+\^',  # Powers like 2^3
+    r'\\frac',
+    r'\\sqrt',
+    r'\\sum',
+    r'\\int',
+    r'\d+\s*[+\-*/]\s*\d+',  # Simple equations
+]
+
+
+def has_math_patterns(text: str) -> bool:
+    """
+    Check OCR text for mathematical patterns.
+
+    Args:
+        text: Text recognized by Tesseract.
+
+    Returns:
+        True if any math pattern matches.
+    """
+    return any(re.search(pattern, text) for pattern in MATH_PATTERNS)
+
+
+def detect_math_content(image: 'Image.Image') -> bool:
     """
     Detect if image contains mathematical content by analyzing the image.
 
@@ -105,135 +159,379 @@ def detect_math_content(image: Image.Image) -> bool:
     Returns:
         True if mathematical content is detected.
     """
+    pytesseract = _get_pytesseract()
     if pytesseract is None:
         return False
 
     try:
         # Try to get text with basic config to detect math
-        text = pytesseract.image_to_string(image, config='--psm 6')
-
-        # Check for math patterns
-        math_patterns = [
-            r'[=+\-*/^]',
-            r'[∑∫∏∂∇]',
-            r'[α-ωΑ-Ω]',
-            r'[<>≤≥≠±×÷]',
-            r'\d+\s*[xy]\s*=',
-            r'[xy]\s*\^',
-            r'\d+\^',  # Powers like 2^3
-            r'\\frac',
-            r'\\sqrt',
-            r'\\sum',
-            r'\\int',
-            r'\d+\s*[+\-*/]\s*\d+',  # Simple equations
-        ]
-
-        for pattern in math_patterns:
-            if re.search(pattern, text):
-                return True
-        return False
+        with span('detect_math_content'):
+            text = pytesseract.image_to_string(image, config='--psm 6')
+        return has_math_patterns(text)
     except Exception:
         return False
 
 
+# Installed Tesseract languages, keyed by tesseract command
+_available_languages: Dict[str, List[str]] = {}
+
+
+def get_available_languages() -> List[str]:
+    """
+    Get the languages installed for the current Tesseract executable.
+
+    The result is cached per executable so each capture does not pay
+    for an extra ``tesseract --list-langs`` process.
+
+    Returns:
+        List of language codes.
+    """
+    pytesseract = _get_pytesseract()
+    cmd = pytesseract.pytesseract.tesseract_cmd
+    if cmd not in _available_languages:
+        _available_languages[cmd] = list(pytesseract.get_languages())
+        print(f"Available languages: {_available_languages[cmd]}", file=sys.stderr)
+    return _available_languages[cmd]
+
+
+def resolve_language(available_langs: List[str]) -> str:
+    """
+    Pick the Tesseract language string to use.
+
+    Prefers Chinese + English for better results, then whatever is installed.
+
+    Args:
+        available_langs: Installed language codes.
+
+    Returns:
+        Language string for Tesseract.
+    """
+    if 'chi_sim' in available_langs and 'eng' in available_langs:
+        return 'chi_sim+eng'
+    elif 'chi_sim' in available_langs:
+        return 'chi_sim'
+    elif 'eng' in available_langs:
+        return 'eng'
+    return available_langs[0] if available_langs else 'eng'
+
+
+def prepare_tesseract(language: str, tesseract_path: Optional[str] = None) -> Tuple[Any, str]:
+    """
+    Point pytesseract at the Tesseract to run and pick the language.
+
+    Args:
+        language: Requested language code(s), kept if the installed ones cannot be listed.
+        tesseract_path: Optional path to Tesseract executable.
+
+    Returns:
+        Tuple of (pytesseract module, language string); the executable is
+        ``pytesseract.pytesseract.tesseract_cmd``.
+
+    Raises:
+        ImportError: If pytesseract is not installed.
+    """
+    pytesseract = _get_pytesseract()
+    if pytesseract is None:
+        raise ImportError("pytesseract is not installed. Install with: pip install pytesseract")
+
+    setup_tesseract()
+    if tesseract_path:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+
+    # Check available languages and select the best combination
+    try:
+        with span('get_languages'):
+            available_langs = get_available_languages()
+        language = resolve_language(available_langs)
+    except Exception as e:
+        print(f"Could not get available languages: {e}", file=sys.stderr)
+    return pytesseract, language
+
+
+# Improved OCR configuration for better Chinese recognition
+# --oem 3: Use LSTM neural net engine (best for Chinese)
+# --psm 6: Assume single uniform block of text
+# -c preserve_interword_spaces=1: Keep spaces
+TESSERACT_CONFIG = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
+
+
 def extract_text(
-    image_path: str,
+    image_path: Union[str, 'Image.Image'],
     language: str = 'chi_sim+eng',
     tesseract_path: Optional[str] = None,
     latex_mode: bool = False,
-    auto_detect_math: bool = True
+    auto_detect_math: bool = True,
+    raise_errors: bool = False
 ) -> Tuple[str, Optional[str]]:
     """
     Extract text from an image using OCR with optional LaTeX conversion.
 
     Args:
-        image_path: Path to the image file.
+        image_path: Path to the image file, or an already loaded PIL Image.
         language: Tesseract language code(s), e.g., 'eng', 'chi_sim', 'chi_sim+eng'.
         tesseract_path: Optional path to Tesseract executable.
         latex_mode: Force LaTeX conversion for the entire image.
         auto_detect_math: Automatically detect and convert math regions.
+        raise_errors: Raise when Tesseract fails instead of returning empty text.
 
     Returns:
         Tuple of (extracted_text, latex_result) where latex_result may be None.
-    """
-    if pytesseract is None:
-        raise ImportError("pytesseract is not installed. Install with: pip install pytesseract")
-
-    setup_tesseract()
 
-    if tesseract_path:
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+    Raises:
+        Exception: The Tesseract error, if ``raise_errors`` is set and the fallback fails too.
+    """
+    pytesseract, language = prepare_tesseract(language, tesseract_path)
+    print(f"Using language: {language}", file=sys.stderr)
 
-    image = Image.open(image_path)
+    from PIL import Image
 
-    # Check available languages and select the best combination
-    try:
-        available_langs = pytesseract.get_languages()
-        print(f"Available languages: {available_langs}")
-
-        # Try to use Chinese + English for better results
-        if 'chi_sim' in available_langs and 'eng' in available_langs:
-            language = 'chi_sim+eng'
-        elif 'chi_sim' in available_langs:
-            language = 'chi_sim'
-        elif 'eng' in available_langs:
-            language = 'eng'
-        else:
-            language = available_langs[0] if available_langs else 'eng'
-
-        print(f"Using language: {language}")
-    except Exception as e:
-        print(f"Could not get available languages: {e}")
-
-    # Improved OCR configuration for better Chinese recognition
-    # --oem 3: Use LSTM neural net engine (best for Chinese)
-    # --psm 6: Assume single uniform block of text
-    # -c preserve_interword_spaces=1: Keep spaces
-    custom_config = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
+    if isinstance(image_path, Image.Image):
+        image = image_path
+    else:
+        with span('image_open'):
+            image = Image.open(image_path)
+            image.load()
 
     try:
-        text = pytesseract.image_to_string(
-            image,
-            lang=language,
-            config=custom_config
-        )
+        with span('tesseract', lang=language):
+            text = pytesseract.image_to_string(
+                image,
+                lang=language,
+                config=TESSERACT_CONFIG
+            )
         text = text.strip()
     except Exception as e:
-        print(f"Error during OCR: {e}")
+        print(f"Error during OCR: {e}", file=sys.stderr)
         # Fallback to basic config
         try:
-            text = pytesseract.image_to_string(image, lang=language)
+            with span('tesseract_fallback', lang=language):
+                text = pytesseract.image_to_string(image, lang=language)
             text = text.strip()
         except Exception as e2:
-            print(f"Fallback OCR also failed: {e2}")
+            if raise_errors:
+                raise
+            print(f"Fallback OCR also failed: {e2}", file=sys.stderr)
             text = ""
 
     latex_result = None
 
     # LaTeX conversion
     if latex_mode or (auto_detect_math and detect_math_content(image)):
-        model = _get_latex_model()
-        if model is not None:
-            try:
-                print("Converting to LaTeX...")
-                # RapidLatexOCR expects PIL Image
-                result = model(image)
-                if result:
-                    # result might be a tuple or string depending on version
-                    if isinstance(result, tuple):
-                        latex_result = result[0] if result[0] else None
-                    else:
-                        latex_result = str(result).strip()
-                    if latex_result:
-                        print(f"LaTeX result: {latex_result[:100]}...")
-            except Exception as e:
-                print(f"Warning: LaTeX conversion failed: {e}")
-                import traceback
-                traceback.print_exc()
+        latex_result = convert_to_latex(image)
 
     return text, latex_result
 
 
+def extract_text_batch(
+    image_paths: List[str],
+    language: str = 'chi_sim+eng',
+    tesseract_path: Optional[str] = None,
+    latex_mode: bool = False,
+    auto_detect_math: bool = True,
+    with_words: bool = False
+) -> List[Tuple]:
+    """
+    Extract text from several image files with a single Tesseract process.
+
+    Each Tesseract run loads the traineddata again, which dominates the
+    time for small images. Tesseract reads a list file of images instead
+    and writes all pages into one text file separated by form feeds, so
+    the model is loaded once per call. Math is detected from the
+    recognized text, without a second Tesseract pass per image.
+
+    Args:
+        image_paths: Image files, one page each.
+        language: Tesseract language code(s).
+        tesseract_path: Optional path to Tesseract executable.
+        latex_mode: Force LaTeX conversion for every image.
+        auto_detect_math: Convert images whose text looks like math.
+        with_words: Also return each image's words with their boxes, from the
+            same Tesseract run.
+
+    Returns:
+        (text, latex_result) per image, in input order; (text, latex_result,
+        words) if ``with_words`` is set.
+
+    Raises:
+        RuntimeError: If Tesseract fails or its pages do not match the images
+            (e.g. a multi-page file); callers should fall back to ``extract_text``.
+    """
+    import shlex
+    import subprocess
+    import tempfile
+
+    pytesseract, language = prepare_tesseract(language, tesseract_path)
+
+    with tempfile.TemporaryDirectory(prefix='snapocr-list-') as tmp_dir:
+        list_path = os.path.join(tmp_dir, 'images.txt')
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(os.path.abspath(path) for path in image_paths) + '\n')
+        output_base = os.path.join(tmp_dir, 'out')
+        command = [
+            pytesseract.pytesseract.tesseract_cmd, list_path, output_base,
+            '-l', language, *shlex.split(TESSERACT_CONFIG), 'txt',
+            *(['tsv'] if with_words else []),
+        ]
+        with span('tesseract_list', images=len(image_paths), lang=language):
+            process = subprocess.run(command, capture_output=True)
+        if process.returncode != 0:
+            raise RuntimeError(process.stderr.decode('utf-8', 'replace').strip() or "Tesseract failed")
+        with open(output_base + '.txt', encoding='utf-8') as f:
+            pages = f.read().split('\f')
+        words = []
+        if with_words:
+            with open(output_base + '.tsv', encoding='utf-8') as f:
+                words = parse_tsv(f.read())
+
+    # Older Tesseract versions end every page with the separator, newer ones only separate them
+    if len(pages) == len(image_paths) + 1 and not pages[-1].strip():
+        pages.pop()
+    if len(pages) != len(image_paths):
+        raise RuntimeError(f"Tesseract returned {len(pages)} pages for {len(image_paths)} images")
+
+    from PIL import Image
+
+    # The TSV numbers pages across the whole list; each image is its own page 1
+    page_words: Dict[int, List[Word]] = {}
+    for word in words:
+        page_words.setdefault(word.page, []).append(replace(word, page=1))
+
+    results = []
+    for number, (path, text) in enumerate(zip(image_paths, pages), start=1):
+        text = text.strip()
+        latex_result = None
+        if latex_mode or (auto_detect_math and has_math_patterns(text)):
+            with Image.open(path) as image:
+                latex_result = convert_to_latex(image)
+        results.append((text, latex_result, page_words.get(number, [])) if with_words else (text, latex_result))
+    return results
+
+
+def convert_to_latex(image: 'Image.Image') -> Optional[str]:
+    """
+    Convert an image of a formula to LaTeX.
+
+    Args:
+        image: PIL Image of the formula.
+
+    Returns:
+        LaTeX string, or None if the model is unavailable or produced nothing.
+    """
+    model = _get_latex_model()
+    if model is None:
+        return None
+
+    latex_result = None
+    try:
+        print("Converting to LaTeX...", file=sys.stderr)
+        # RapidLatexOCR expects PIL Image
+        with span('latex_inference'):
+            result = model(image)
+        if result:
+            # result might be a tuple or string depending on version
+            if isinstance(result, tuple):
+                latex_result = result[0] if result[0] else None
+            else:
+                latex_result = str(result).strip()
+            if latex_result:
+                print(f"LaTeX result: {latex_result[:100]}...", file=sys.stderr)
+    except Exception as e:
+        print(f"Warning: LaTeX conversion failed: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+    return latex_result
+
+
+@dataclass
+class Word:
+    """A recognized word and its bounding box."""
+
+    text: str
+    left: int
+    top: int
+    width: int
+    height: int
+    conf: float
+    line: Tuple[int, int, int]       # (block, paragraph, line) numbers from Tesseract
+    page: int = 1
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        """Center of the bounding box."""
+        return self.left + self.width / 2, self.top + self.height / 2
+
+
+def extract_words(
+    image: 'Image.Image',
+    language: str = 'chi_sim+eng',
+    tesseract_path: Optional[str] = None,
+    config: str = '--oem 3 --psm 3'
+) -> List[Word]:
+    """
+    Recognize words with their bounding boxes.
+
+    Args:
+        image: PIL Image to recognize.
+        language: Tesseract language code(s).
+        tesseract_path: Optional path to Tesseract executable.
+        config: Tesseract options.
+
+    Returns:
+        Words in Tesseract's reading order, in image coordinates.
+    """
+    pytesseract, language = prepare_tesseract(language, tesseract_path)
+
+    with span('tesseract_words', lang=language):
+        data = pytesseract.image_to_data(
+            image, lang=language, config=config, output_type=pytesseract.Output.DICT
+        )
+
+    words = []
+    for i, text in enumerate(data['text']):
+        text = (text or '').strip()
+        if not text:
+            continue
+        words.append(Word(
+            text=text,
+            left=int(data['left'][i]),
+            top=int(data['top'][i]),
+            width=int(data['width'][i]),
+            height=int(data['height'][i]),
+            conf=float(data['conf'][i]),
+            line=(int(data['block_num'][i]), int(data['par_num'][i]), int(data['line_num'][i])),
+        ))
+    return words
+
+
+def parse_tsv(content: str) -> List[Word]:
+    """
+    Parse Tesseract's TSV output into words.
+
+    Args:
+        content: TSV text with a header line, as written by the ``tsv`` renderer.
+
+    Returns:
+        Words in Tesseract's reading order, with the page numbers of the TSV.
+    """
+    words = []
+    for row in content.splitlines()[1:]:
+        fields = row.split('\t')
+        # Level 5 rows are words; the others are pages, blocks, paragraphs and lines
+        if len(fields) < 12 or fields[0] != '5' or not fields[11].strip():
+            continue
+        words.append(Word(
+            text=fields[11].strip(),
+            left=int(fields[6]),
+            top=int(fields[7]),
+            width=int(fields[8]),
+            height=int(fields[9]),
+            conf=float(fields[10]),
+            line=(int(fields[2]), int(fields[3]), int(fields[4])),
+            page=int(fields[1]),
+        ))
+    return words
+
+
 def format_result(text: str, latex: Optional[str] = None) -> str:
     """
     Format the OCR result with optional LaTeX.
@@ -0,0 +1,238 @@
+"""
+Background OCR of the frozen screenshot while the user is selecting.
+
+The overlay shows a screenshot that no longer changes, and the CPU is
+idle while the user drags. OCRIndex splits the screenshot into
+overlapping horizontal bands and recognizes them in parallel, starting
+with the band under the pointer. When the user releases, the text for
+the selection is assembled from the words that fall inside it. Bands
+that have not started yet are cancelled and the caller falls back to
+OCR of the cropped selection.
+"""
+
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from .ocr import Word, extract_words
+from .trace import span
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+# Height of each band in pixels
+TILE_HEIGHT = 320
+
+# Overlap between neighbouring bands; must exceed the tallest text line
+TILE_OVERLAP = 64
+
+# Tesseract options for screen content: automatic page segmentation
+INDEX_CONFIG = '--oem 3 --psm 3'
+
+# Characters that are joined without a space (CJK scripts)
+_CJK = re.compile(r'[぀-ヿ㐀-䶿一-鿿가-힯＀-￯]')
+
+
+def _default_workers() -> int:
+    """Leave a core for the UI thread."""
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+class _Tile:
+    """One band of the screenshot and the words recognized in it."""
+
+    def __init__(self, top: int, bottom: int, core_top: int, core_bottom: int):
+        self.top = top                  # Band rows in image coordinates
+        self.bottom = bottom
+        self.core_top = core_top        # Rows whose words this band owns
+        self.core_bottom = core_bottom
+        self.future: Optional[Future] = None
+
+
+class OCRIndex:
+    """
+    Word index of a screenshot, built in the background.
+
+    Usage:
+        index = OCRIndex(screen_img, origin=(monitor['left'], monitor['top']),
+                         scale=image_scale(screen_img, monitor))
+        index.start(pointer)
+        ...                                   # user selects a region
+        text = index.text_in(rect)            # None -> OCR the crop instead
+        index.close()
+    """
+
+    def __init__(
+        self,
+        image: 'Image.Image',
+        origin: Tuple[int, int] = (0, 0),
+        scale: Tuple[float, float] = (1.0, 1.0),
+        language: str = 'chi_sim+eng',
+        tesseract_path: Optional[str] = None,
+        workers: Optional[int] = None
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            image: Screenshot to recognize (must not change afterwards).
+            origin: Screen position of the image's top-left corner.
+            scale: Image pixels per screen point (x, y); above 1 on HiDPI screens.
+            language: Tesseract language code(s).
+            tesseract_path: Optional path to Tesseract executable.
+            workers: Parallel Tesseract processes (default: CPU count - 1, at most 4).
+        """
+        self._image = image
+        self._origin = origin
+        self._scale = scale
+        self._language = language
+        self._tesseract_path = tesseract_path
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or _default_workers(), thread_name_prefix='snapocr-index'
+        )
+        self._tiles = self._make_tiles(image.size[1])
+
+    @staticmethod
+    def _make_tiles(height: int) -> List[_Tile]:
+        """Split the image height into overlapping bands."""
+        tiles = []
+        top = 0
+        while top < height:
+            core_bottom = min(height, top + TILE_HEIGHT)
+            tiles.append(_Tile(
+                top=max(0, top - TILE_OVERLAP // 2),
+                bottom=min(height, core_bottom + TILE_OVERLAP // 2),
+                core_top=top,
+                core_bottom=core_bottom,
+            ))
+            top = core_bottom
+        return tiles
+
+    def start(self, pointer: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Start recognizing, nearest band to the pointer first.
+
+        Args:
+            pointer: Pointer position in screen coordinates, if known.
+        """
+        y = (pointer[1] - self._origin[1]) * self._scale[1] if pointer else 0
+        order = sorted(self._tiles, key=lambda t: abs((t.core_top + t.core_bottom) / 2 - y))
+        for tile in order:
+            tile.future = self._executor.submit(self._recognize, tile)
+
+    def _recognize(self, tile: _Tile) -> List[Word]:
+        """Recognize one band; words are returned in screen coordinates."""
+        width = self._image.size[0]
+        band = self._image.crop((0, tile.top, width, tile.bottom))
+        with span('index_tile', top=tile.top):
+            words = extract_words(band, self._language, self._tesseract_path, INDEX_CONFIG)
+
+        ox, oy = self._origin
+        sx, sy = self._scale
+        owned = []
+        for word in words:
+            center_y = tile.top + word.top + word.height / 2
+            if tile.core_top <= center_y < tile.core_bottom:
+                # Image pixels to screen points
+                word.left = ox + round(word.left / sx)
+                word.top = oy + round((tile.top + word.top) / sy)
+                word.width = round(word.width / sx)
+                word.height = round(word.height / sy)
+                owned.append(word)
+        return owned
+
+    def words_in(self, rect: Tuple[int, int, int, int]) -> Optional[List[Word]]:
+        """
+        Get the words whose center lies inside a rectangle.
+
+        Bands still running are waited for; if a band covering the
+        rectangle has not started yet, it is cancelled and None is returned.
+
+        Args:
+            rect: (x, y, width, height) in screen coordinates.
+
+        Returns:
+            Words inside the rectangle, or None if the index cannot answer.
+        """
+        x, y, w, h = rect
+        top = (y - self._origin[1]) * self._scale[1]
+        bottom = top + h * self._scale[1]
+        needed = [t for t in self._tiles if t.core_top < bottom and t.core_bottom > top]
+        if not needed or any(t.future is None for t in needed):
+            return None
+
+        # Bands that have not started would be slower than OCR of the crop
+        if any(t.future.cancel() for t in needed):
+            return None
+
+        with span('index_wait'):
+            wait([t.future for t in needed])
+
+        words = []
+        for tile in needed:
+            try:
+                tile_words = tile.future.result()
+            except Exception as e:
+                print(f"Warning: Background OCR failed: {e}")
+                return None
+            for word in tile_words:
+                cx, cy = word.center
+                if x <= cx < x + w and y <= cy < y + h:
+                    words.append(word)
+        return words
+
+    def text_in(self, rect: Tuple[int, int, int, int]) -> Optional[str]:
+        """
+        Assemble the text inside a rectangle from indexed words.
+
+        Args:
+            rect: (x, y, width, height) in screen coordinates.
+
+        Returns:
+            Text with one line per text line, or None if the index cannot answer.
+        """
+        words = self.words_in(rect)
+        if words is None:
+            return None
+        return assemble_text(words)
+
+    def close(self) -> None:
+        """Cancel pending bands. Bands already running finish in the background."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def assemble_text(words: List[Word]) -> str:
+    """
+    Join words into lines by their vertical position.
+
+    Args:
+        words: Words in screen coordinates.
+
+    Returns:
+        Text with lines top to bottom and words left to right.
+    """
+    if not words:
+        return ''
+
+    lines: List[List[Word]] = []
+    for word in sorted(words, key=lambda w: w.center[1]):
+        if lines:
+            last = lines[-1]
+            line_center = sum(w.center[1] for w in last) / len(last)
+            line_height = max(w.height for w in last)
+            if abs(word.center[1] - line_center) <= max(line_height, word.height) / 2:
+                last.append(word)
+                continue
+        lines.append([word])
+
+    text_lines = []
+    for line in lines:
+        parts = []
+        for word in sorted(line, key=lambda w: w.left):
+            if parts and not (_CJK.match(parts[-1][-1]) and _CJK.match(word.text[0])):
+                parts.append(' ')
+            parts.append(word.text)
+        text_lines.append(''.join(parts))
+    return '\n'.join(text_lines)
@@ -0,0 +1,393 @@
+"""
+Continuous text extraction from a fixed screen region.
+
+Re-running OCR on a timer burns a core even when nothing changes. The
+watcher instead grabs the region, compares it with the previous frame row
+by row, and re-recognizes only the horizontal bands whose pixels changed
+(widened to the text lines they touch). A static screen costs one small
+grab and one array comparison per poll. Changes are reported as
+line-level events:
+
+    {"time": 1718000000.0, "type": "changed", "line": 3, "text": "...", "previous": "..."}
+
+``type`` is ``added``, ``removed`` or ``changed``; ``line`` is the line
+index in the region after the change (before it, for ``removed``).
+"""
+
+import difflib
+import errno
+import json
+import os
+import socket
+import stat
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .ocr import Word, extract_words
+from .ocr_index import assemble_text
+from .trace import span
+
+
+# Rows added above and below each changed band before recognizing it
+STRIP_PADDING = 6
+
+# Tesseract options for bands: a uniform block of text
+WATCH_CONFIG = '--oem 3 --psm 6'
+
+# Unsent bytes a socket client may fall behind by before it is dropped
+MAX_CLIENT_BACKLOG = 1 << 20
+
+
+@dataclass
+class TextLine:
+    """A recognized line and its vertical extent in the region."""
+
+    text: str
+    top: int
+    bottom: int
+
+    @property
+    def center(self) -> float:
+        """Vertical center of the line."""
+        return (self.top + self.bottom) / 2
+
+
+def changed_bands(previous, current) -> List[Tuple[int, int]]:
+    """
+    Find the row ranges that differ between two frames.
+
+    Args:
+        previous: PIL image of the previous frame.
+        current: PIL image of the current frame (same size).
+
+    Returns:
+        List of (top, bottom) row ranges, bottom exclusive; empty if identical.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        # Without NumPy, one band covering every changed row
+        from PIL import ImageChops
+        bbox = ImageChops.difference(previous, current).getbbox()
+        return [(bbox[1], bbox[3])] if bbox else []
+
+    a = np.asarray(previous)
+    b = np.asarray(current)
+    rows = np.flatnonzero((a != b).reshape(a.shape[0], -1).any(axis=1))
+    if rows.size == 0:
+        return []
+
+    # Split the changed rows into contiguous runs
+    breaks = np.flatnonzero(np.diff(rows) > 1)
+    starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+    ends = np.concatenate((rows[breaks], [rows[-1]])) + 1
+    return [(int(s), int(e)) for s, e in zip(starts, ends)]
+
+
+def expand_bands(
+    bands: List[Tuple[int, int]],
+    lines: List[TextLine],
+    height: int,
+    padding: int = STRIP_PADDING
+) -> List[Tuple[int, int]]:
+    """
+    Widen bands to whole text lines plus padding and merge overlaps.
+
+    Args:
+        bands: Changed (top, bottom) row ranges.
+        lines: Lines recognized so far.
+        height: Region height.
+        padding: Rows added on both sides.
+
+    Returns:
+        Sorted, non-overlapping (top, bottom) ranges.
+    """
+    widened = []
+    for top, bottom in bands:
+        for line in lines:
+            if line.top < bottom and line.bottom > top:
+                top = min(top, line.top)
+                bottom = max(bottom, line.bottom)
+        widened.append((max(0, top - padding), min(height, bottom + padding)))
+
+    merged: List[Tuple[int, int]] = []
+    for top, bottom in sorted(widened):
+        if merged and top <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], bottom))
+        else:
+            merged.append((top, bottom))
+    return merged
+
+
+def group_lines(words: List[Word], offset: int = 0) -> List[TextLine]:
+    """
+    Group recognized words into lines.
+
+    Args:
+        words: Words from ``extract_words``.
+        offset: Added to the vertical positions (band top in the region).
+
+    Returns:
+        Lines sorted top to bottom.
+    """
+    by_line: Dict[Tuple[int, int, int], List[Word]] = {}
+    for word in words:
+        by_line.setdefault(word.line, []).append(word)
+
+    lines = []
+    for line_words in by_line.values():
+        top = min(w.top for w in line_words) + offset
+        bottom = max(w.top + w.height for w in line_words) + offset
+        lines.append(TextLine(assemble_text(line_words), top, bottom))
+    return sorted(lines, key=lambda line: line.top)
+
+
+def diff_lines(old: List[str], new: List[str]) -> List[Dict[str, Any]]:
+    """
+    Compare two versions of the region's lines.
+
+    Args:
+        old: Line texts before the change.
+        new: Line texts after the change.
+
+    Returns:
+        Events without timestamps, in line order.
+    """
+    events = []
+    matcher = difflib.SequenceMatcher(a=old, b=new, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        paired = min(i2 - i1, j2 - j1) if tag == 'replace' else 0
+        for k in range(paired):
+            events.append({'type': 'changed', 'line': j1 + k, 'text': new[j1 + k], 'previous': old[i1 + k]})
+        for k in range(j1 + paired, j2):
+            events.append({'type': 'added', 'line': k, 'text': new[k]})
+        for k in range(i1 + paired, i2):
+            events.append({'type': 'removed', 'line': k, 'previous': old[k]})
+    return events
+
+
+class RegionWatcher:
+    """
+    Poll a screen region and report line-level text changes.
+
+    Usage:
+        watcher = RegionWatcher(grab=lambda: backend.grab_image(rect), emit=print)
+        watcher.run()                     # until stop() or Ctrl+C
+    """
+
+    def __init__(
+        self,
+        grab: Callable[[], Any],
+        emit: Callable[[Dict[str, Any]], None],
+        language: str = 'chi_sim+eng',
+        tesseract_path: Optional[str] = None,
+        interval: float = 0.5
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            grab: Returns the region as a PIL RGB image.
+            emit: Receives each change event.
+            language: Tesseract language code(s).
+            tesseract_path: Optional path to Tesseract executable.
+            interval: Seconds between grabs.
+        """
+        self._grab = grab
+        self._emit = emit
+        self._language = language
+        self._tesseract_path = tesseract_path
+        self._interval = interval
+        self._previous = None
+        self._lines: List[TextLine] = []
+        self._stop = threading.Event()
+
+    @property
+    def lines(self) -> List[str]:
+        """Current line texts, top to bottom."""
+        return [line.text for line in self._lines]
+
+    def _recognize(self, image, top: int, bottom: int) -> List[TextLine]:
+        """Recognize one band of the region."""
+        band = image.crop((0, top, image.size[0], bottom))
+        with span('watch_band', top=top, bottom=bottom):
+            words = extract_words(band, self._language, self._tesseract_path, WATCH_CONFIG)
+        return group_lines(words, offset=top)
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """
+        Grab once and re-recognize the bands that changed.
+
+        Returns:
+            Events emitted by this poll.
+        """
+        image = self._grab()
+        previous, self._previous = self._previous, image
+        height = image.size[1]
+
+        if previous is None or previous.size != image.size:
+            bands = [(0, height)]
+        else:
+            bands = expand_bands(changed_bands(previous, image), self._lines, height)
+        if not bands:
+            return []
+
+        lines = list(self._lines)
+        for top, bottom in bands:
+            # Lines centered in the band are replaced by what the band reads now
+            lines = [line for line in lines if not top <= line.center < bottom]
+            lines.extend(self._recognize(image, top, bottom))
+        lines.sort(key=lambda line: line.top)
+
+        old = self.lines
+        self._lines = lines
+        now = round(time.time(), 3)
+        events = [dict(event, time=now) for event in diff_lines(old, self.lines)]
+        for event in events:
+            self._emit(event)
+        return events
+
+    def run(self) -> None:
+        """Poll until ``stop()`` is called."""
+        self._stop.clear()
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Warning: Watch poll failed: {e}", file=sys.stderr)  # stdout carries events
+            self._stop.wait(max(0.0, self._interval - (time.perf_counter() - started)))
+
+    def stop(self) -> None:
+        """Stop ``run()`` after the current poll."""
+        self._stop.set()
+
+
+class StreamSink:
+    """Write events as JSON lines to a text stream."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        self._stream.write(json.dumps(event, ensure_ascii=False) + '\n')
+        self._stream.flush()
+
+    def close(self) -> None:
+        pass
+
+
+def _remove_stale_socket(path: str) -> None:
+    """
+    Remove a Unix socket left behind by a watcher that is no longer running.
+
+    Args:
+        path: Socket path about to be bound.
+
+    Raises:
+        OSError: If the path is not a socket, or another process still listens on it.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(errno.EEXIST, "Path exists and is not a socket", path)
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.remove(path)  # Nobody listening: left over from an earlier run
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "Another process is listening on the socket", path)
+
+
+class SocketSink:
+    """
+    Broadcast events as JSON lines to every client connected to a local socket.
+
+    The address is a filesystem path (Unix socket) or a TCP port on 127.0.0.1.
+    Clients are written to without blocking, so a client that stops reading
+    never stalls the watch; it is dropped once ``MAX_CLIENT_BACKLOG`` bytes
+    are waiting for it.
+    """
+
+    def __init__(self, address: str):
+        """
+        Start listening.
+
+        Args:
+            address: Unix socket path, or a port number for TCP on localhost.
+
+        Raises:
+            OSError: If the address cannot be bound; an existing path is only
+                replaced when it is a socket nobody listens on.
+        """
+        self._clients: Dict[socket.socket, bytearray] = {}  # Client -> bytes not sent yet
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+
+        if address.isdigit():
+            self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._server.bind(('127.0.0.1', int(address)))
+        else:
+            _remove_stale_socket(address)
+            self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._server.bind(address)
+            self._path = address
+        self._server.listen(8)
+        threading.Thread(target=self._accept, name='snapocr-watch-sink', daemon=True).start()
+
+    def _accept(self) -> None:
+        """Accept clients until the server socket is closed."""
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                break
+            conn.setblocking(False)
+            with self._lock:
+                self._clients[conn] = bytearray()
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        data = (json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            for conn, pending in list(self._clients.items()):
+                pending += data
+                try:
+                    del pending[:conn.send(pending)]
+                except BlockingIOError:
+                    pass  # Socket buffer full: keep the bytes for the next event
+                except OSError:
+                    self._drop(conn)  # Client went away
+                    continue
+                if len(pending) > MAX_CLIENT_BACKLOG:
+                    print("Warning: Dropped a socket client that stopped reading", file=sys.stderr)
+                    self._drop(conn)
+
+    def _drop(self, conn: socket.socket) -> None:
+        """Disconnect a client (lock held)."""
+        del self._clients[conn]
+        conn.close()
+
+    def close(self) -> None:
+        """Disconnect the clients and remove the socket."""
+        self._server.close()
+        with self._lock:
+            for conn in self._clients:
+                conn.close()
+            self._clients = {}
+        if self._path:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
@@ -0,0 +1,409 @@
+"""
+Scrolling capture of content taller than the screen.
+
+A fixed region is grabbed repeatedly while the user scrolls. Each frame is
+reduced to one hash per pixel row; the vertical shift against the previous
+frame is the offset at which the row hashes line up, so only the rows the
+scroll revealed are kept. Rows that stay put (sticky headers, footers) are
+excluded from the match and never repeated.
+
+The stitched image is never held in memory. New rows are streamed as
+strips to the OCR worker (and optionally to PNG files on disk); the worker
+recognizes each strip together with the unfinished line carried over from
+the previous one, so every text line is read exactly once.
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from .ocr import extract_words
+from .region_watch import STRIP_PADDING, WATCH_CONFIG, TextLine, group_lines
+from .trace import span
+
+
+# Fewest overlapping rows accepted as a match between two frames
+MIN_OVERLAP = 16
+
+# Fraction of overlapping rows that must match (tolerates a blinking caret)
+MATCH_RATIO = 0.9
+
+# Rows kept at most between strips while no complete line was found
+MAX_CARRY_ROWS = 400
+
+# Strips waiting for OCR before grabbing pauses
+STRIP_QUEUE_SIZE = 16
+
+# Row hash weights per row length in bytes
+_weights = {}
+
+
+def row_signatures(image):
+    """
+    Hash every pixel row of an image.
+
+    Args:
+        image: PIL image.
+
+    Returns:
+        NumPy uint64 array with one hash per row.
+    """
+    import numpy as np
+
+    rows = np.asarray(image.convert('RGB')).reshape(image.size[1], -1)
+    weights = _weights.get(rows.shape[1])
+    if weights is None:
+        weights = np.random.default_rng(rows.shape[1]).integers(1, 2 ** 63, size=rows.shape[1], dtype=np.uint64)
+        _weights[rows.shape[1]] = weights
+    signatures = np.empty(rows.shape[0], dtype=np.uint64)
+    # Chunked so the uint64 copy stays small for wide regions
+    for start in range(0, rows.shape[0], 64):
+        chunk = rows[start:start + 64].astype(np.uint64)
+        signatures[start:start + 64] = (chunk * weights).sum(axis=1)
+    return signatures
+
+
+def _static_rows(previous, current) -> Tuple[int, int]:
+    """Count the identical rows at the top and bottom of two frames."""
+    import numpy as np
+
+    same = previous == current
+    if same.all():
+        return len(same), 0
+    top = int(np.argmin(same))
+    bottom = int(np.argmin(same[::-1]))
+    return top, bottom
+
+
+def find_shift(
+    previous,
+    current,
+    min_overlap: int = MIN_OVERLAP,
+    ratio: float = MATCH_RATIO
+) -> Optional[int]:
+    """
+    Find how many rows the content moved up between two frames.
+
+    Args:
+        previous: Row signatures of the previous frame.
+        current: Row signatures of the current frame (same height).
+        min_overlap: Fewest overlapping rows accepted.
+        ratio: Fraction of overlapping rows that must match.
+
+    Returns:
+        Rows scrolled (negative when scrolled back up), or None without a match.
+    """
+    import numpy as np
+
+    height = len(current)
+    if height < min_overlap:
+        return None
+
+    # Anchor on the rarest rows of the current frame (blank rows are ambiguous),
+    # spread over its height so both scroll directions are found
+    values, first, counts = np.unique(current, return_index=True, return_counts=True)
+    order = np.lexsort((first, counts))
+    rare = order[:max(16, np.count_nonzero(counts == 1))]
+    anchors = values[rare[np.linspace(0, rare.size - 1, min(rare.size, 16)).astype(int)]]
+
+    candidates = set()
+    for value in anchors:
+        here = np.flatnonzero(current == value)
+        there = np.flatnonzero(previous == value)
+        candidates.update(int(shift) for shift in np.subtract.outer(there, here).ravel())
+
+    best, best_score = None, ratio
+    for shift in sorted(candidates, key=abs):
+        overlap = height - abs(shift)
+        if overlap < min_overlap:
+            continue
+        if shift >= 0:
+            score = np.count_nonzero(previous[shift:] == current[:overlap]) / overlap
+        else:
+            score = np.count_nonzero(previous[:overlap] == current[-shift:]) / overlap
+        if score > best_score:
+            best, best_score = shift, score
+    return best
+
+
+class ScrollStitcher:
+    """
+    Turn successive frames of a scrolling region into strips of new rows.
+
+    Only the row signatures of the frame furthest down are kept, plus the
+    first frame until the first scroll shows which rows are a fixed footer.
+    """
+
+    def __init__(self, min_overlap: int = MIN_OVERLAP):
+        """
+        Initialize the stitcher.
+
+        Args:
+            min_overlap: Fewest overlapping rows accepted as a match.
+        """
+        self._min_overlap = min_overlap
+        self._reference = None
+        self._first = None
+        self._end = 0        # Rows of the reference frame already stitched
+        self._tail = None    # The reference frame's rows after them
+        self.height = 0      # Rows stitched so far
+        self.gaps = 0        # Frames appended without a matching overlap
+
+    def add(self, frame):
+        """
+        Add a frame.
+
+        Args:
+            frame: PIL image of the region (same size every time).
+
+        Returns:
+            PIL image of the rows to append, or None if nothing is new.
+        """
+        with span('stitch_frame'):
+            signatures = row_signatures(frame)
+            reference, width, height = self._reference, frame.size[0], frame.size[1]
+
+            if reference is None or len(reference) != height:
+                self._reference = signatures
+                self._first = frame
+                return None
+
+            top, bottom = _static_rows(reference, signatures)
+            if top + bottom >= height:
+                return None
+
+            content = slice(top, height - bottom)
+            shift = find_shift(reference[content], signatures[content], self._min_overlap)
+            if shift is not None and shift <= 0:
+                # Unchanged, or scrolled back up: wait until new rows appear
+                return None
+
+            if self._first is not None:
+                # The first frame goes out without the footer it shares with this one
+                self._end = height - bottom
+
+            if shift is None:
+                print("Warning: Scrolled too far between frames; some text may be missing", file=sys.stderr)
+                self.gaps += 1
+                start = top
+            else:
+                start = max(top, self._end - shift)
+            end = max(start, height - bottom)
+
+            self._reference = signatures
+            self._end = end
+            self._tail = frame.crop((0, end, width, height)) if end < height else None
+            strip = frame.crop((0, start, width, end)) if end > start else None
+            if self._first is not None:
+                first = self._first.crop((0, 0, width, height - bottom))
+                strip = first if strip is None else _stack(first, strip)
+                self._first = None
+            if strip is not None:
+                self.height += strip.size[1]
+            return strip
+
+    def flush(self):
+        """
+        End the capture.
+
+        Returns:
+            PIL image of the rows still held back (the first frame if there was
+            no scroll, otherwise the fixed footer), or None.
+        """
+        strip = self._first if self._first is not None else self._tail
+        self._first = self._tail = None
+        if strip is not None:
+            self.height += strip.size[1]
+        return strip
+
+
+def _stack(upper, lower):
+    """Join two images of the same width vertically."""
+    from PIL import Image
+
+    image = Image.new('RGB', (upper.size[0], upper.size[1] + lower.size[1]), 'white')
+    image.paste(upper, (0, 0))
+    image.paste(lower, (0, upper.size[1]))
+    return image
+
+
+class StripReader:
+    """
+    Recognize a stream of strips line by line.
+
+    The rows after the last complete line are carried into the next strip,
+    so a line cut by a strip boundary is read once, when it is whole.
+    """
+
+    def __init__(self, language: str = 'chi_sim+eng', tesseract_path: Optional[str] = None):
+        """
+        Initialize the reader.
+
+        Args:
+            language: Tesseract language code(s).
+            tesseract_path: Optional path to Tesseract executable.
+        """
+        self._language = language
+        self._tesseract_path = tesseract_path
+        self._carry = None
+
+    def _recognize(self, image) -> List[TextLine]:
+        with span('scroll_strip', rows=image.size[1]):
+            words = extract_words(image, self._language, self._tesseract_path, WATCH_CONFIG)
+        return group_lines(words)
+
+    def feed(self, strip) -> List[str]:
+        """
+        Recognize a strip.
+
+        Args:
+            strip: PIL image of the rows below everything fed so far.
+
+        Returns:
+            Text of the lines completed by this strip.
+        """
+        image = strip if self._carry is None else _stack(self._carry, strip)
+        height = image.size[1]
+        lines = self._recognize(image)
+
+        # A line touching the bottom edge may continue in the next strip
+        open_lines = [line for line in lines if line.bottom > height - STRIP_PADDING]
+        if open_lines:
+            cut = max(0, min(line.top for line in open_lines) - STRIP_PADDING)
+        elif lines:
+            cut = max(line.bottom for line in lines)
+        else:
+            cut = 0
+        cut = max(cut, height - MAX_CARRY_ROWS)
+
+        self._carry = image.crop((0, cut, image.size[0], height)) if cut < height else None
+        return [line.text for line in lines if line.bottom <= cut]
+
+    def finish(self) -> List[str]:
+        """
+        Recognize the carried rows after the last strip.
+
+        Returns:
+            Text of the remaining lines.
+        """
+        if self._carry is None:
+            return []
+        image, self._carry = self._carry, None
+        return [line.text for line in self._recognize(image)]
+
+
+class ScrollCapture:
+    """
+    Grab a region while the user scrolls and recognize it incrementally.
+
+    Usage:
+        capture = ScrollCapture(grab=lambda: backend.grab_image(rect), on_line=print)
+        text = capture.run()              # until idle, stop() or Ctrl+C
+    """
+
+    def __init__(
+        self,
+        grab: Callable[[], Any],
+        on_line: Optional[Callable[[str], None]] = None,
+        language: str = 'chi_sim+eng',
+        tesseract_path: Optional[str] = None,
+        interval: float = 0.15,
+        idle_timeout: float = 3.0,
+        strip_dir: Optional[str] = None
+    ):
+        """
+        Initialize the capture.
+
+        Args:
+            grab: Returns the region as a PIL RGB image.
+            on_line: Called with each recognized line, in order.
+            language: Tesseract language code(s).
+            tesseract_path: Optional path to Tesseract executable.
+            interval: Seconds between grabs.
+            idle_timeout: Stop after this many seconds without new rows (0 to disable).
+            strip_dir: Optional directory for the stitched strips as numbered PNGs.
+        """
+        self._grab = grab
+        self._on_line = on_line
+        self._reader = StripReader(language, tesseract_path)
+        self._interval = interval
+        self._idle_timeout = idle_timeout
+        self._strip_dir = strip_dir
+        self._strips: 'queue.Queue[Optional[Any]]' = queue.Queue(maxsize=STRIP_QUEUE_SIZE)
+        self._lines: List[str] = []
+        self._stop = threading.Event()
+        self.stitcher = ScrollStitcher()
+
+    def _emit(self, lines: List[str]) -> None:
+        for line in lines:
+            self._lines.append(line)
+            if self._on_line:
+                self._on_line(line)
+
+    def _read_strips(self) -> None:
+        """Worker loop: recognize strips in order until the end marker."""
+        while True:
+            strip = self._strips.get()
+            if strip is None:
+                break
+            try:
+                self._emit(self._reader.feed(strip))
+            except Exception as e:
+                print(f"Warning: Strip OCR failed: {e}", file=sys.stderr)
+        try:
+            self._emit(self._reader.finish())
+        except Exception as e:
+            print(f"Warning: Strip OCR failed: {e}", file=sys.stderr)
+
+    def _save_strip(self, strip, number: int) -> None:
+        try:
+            strip.save(os.path.join(self._strip_dir, f"strip_{number:04d}.png"))
+        except OSError as e:
+            print(f"Warning: Could not save strip {number}: {e}", file=sys.stderr)
+
+    def run(self) -> str:
+        """
+        Grab and stitch until idle or ``stop()``, then finish the OCR.
+
+        Returns:
+            The recognized text, lines top to bottom.
+        """
+        worker = threading.Thread(target=self._read_strips, name='snapocr-scroll-ocr', daemon=True)
+        worker.start()
+        self._stop.clear()
+        strips = 0
+        last_new = time.monotonic()
+
+        def push(strip):
+            nonlocal strips
+            strips += 1
+            if self._strip_dir:
+                self._save_strip(strip, strips)
+            self._strips.put(strip)
+
+        try:
+            while not self._stop.is_set():
+                started = time.monotonic()
+                strip = self.stitcher.add(self._grab())
+                if strip is not None:
+                    last_new = started
+                    push(strip)
+                elif self._idle_timeout and started - last_new >= self._idle_timeout:
+                    break
+                self._stop.wait(max(0.0, self._interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            pass  # Ctrl+C ends the scrolling, not the capture
+        finally:
+            strip = self.stitcher.flush()
+            if strip is not None:
+                push(strip)
+            self._strips.put(None)
+            worker.join()
+        return '\n'.join(self._lines)
+
+    def stop(self) -> None:
+        """End ``run()`` after the current frame."""
+        self._stop.set()
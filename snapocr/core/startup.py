@@ -0,0 +1,139 @@
+"""
+Cold-import measurement for the startup-time budget.
+
+Every hotkey press starts a fresh interpreter, so the cost of importing
+the CLI is paid on every capture. Imports are measured in a child
+interpreter with ``-X importtime`` so the numbers are always cold.
+"""
+
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+# Cold-import budget for the CLI entry point, in milliseconds
+IMPORT_BUDGET_MS = 100.0
+
+# Module imported by the CLI entry point
+ENTRY_MODULE = 'snapocr.main'
+
+# Heavy modules that must only load when first used
+HEAVY_MODULES = [
+    'PIL',
+    'tkinter',
+    'mss',
+    'pytesseract',
+    'numpy',
+    'onnxruntime',
+    'rapid_latex_ocr',
+]
+
+
+@dataclass
+class ImportTiming:
+    """Import time of a single module as reported by ``-X importtime``."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure_cold_import(module: str) -> Optional[List[ImportTiming]]:
+    """
+    Import a module in a fresh interpreter and record every import.
+
+    Args:
+        module: Dotted module name.
+
+    Returns:
+        Timings in import order, or None if the module could not be imported.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return None
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        timings.append(ImportTiming(
+            module=stripped,
+            self_us=int(fields[0]),
+            cumulative_us=int(fields[1]),
+            depth=(len(name) - len(stripped) - 1) // 2,
+        ))
+    return timings
+
+
+def total_import_ms(module: str, timings: List[ImportTiming]) -> float:
+    """
+    Sum the top-level import cost of ``module`` and its parent packages.
+
+    Modules already imported during interpreter startup (site, encodings)
+    are excluded because they are not reported again.
+    """
+    parts = module.split('.')
+    names = {'.'.join(parts[:i]) for i in range(1, len(parts) + 1)}
+    return sum(t.cumulative_us for t in timings if t.depth == 0 and t.module in names) / 1000.0
+
+
+def loaded_heavy_modules(timings: List[ImportTiming]) -> List[str]:
+    """Get the heavy modules that were imported."""
+    loaded = {t.module.split('.')[0] for t in timings}
+    return [name for name in HEAVY_MODULES if name in loaded]
+
+
+def startup_report(top: int = 15, budget_ms: float = IMPORT_BUDGET_MS) -> Tuple[str, bool]:
+    """
+    Build the startup import-time report.
+
+    Args:
+        top: Number of slowest modules to list.
+        budget_ms: Cold-import budget for the CLI entry point.
+
+    Returns:
+        Tuple of (report text, within_budget). The entry point is over
+        budget if it is slower than ``budget_ms`` or loads a heavy module.
+    """
+    if getattr(sys, 'frozen', False):
+        return "Error: startup report needs a Python interpreter (not available in packaged app)", False
+
+    lines = []
+    timings = measure_cold_import(ENTRY_MODULE)
+    if timings is None:
+        return f"Error: could not import {ENTRY_MODULE}", False
+
+    total_ms = total_import_ms(ENTRY_MODULE, timings)
+    heavy = loaded_heavy_modules(timings)
+    within_budget = total_ms <= budget_ms and not heavy
+
+    lines.append(f"Cold import of {ENTRY_MODULE}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    lines.append(f"Heavy modules loaded at startup: {', '.join(heavy) if heavy else 'none'}")
+    lines.append("")
+    lines.append("Slowest modules (self time):")
+    for t in sorted(timings, key=lambda t: t.self_us, reverse=True)[:top]:
+        lines.append(f"  {t.self_us / 1000.0:8.2f} ms  {t.cumulative_us / 1000.0:8.2f} ms cumulative  {t.module}")
+
+    lines.append("")
+    lines.append("Deferred imports (cold cost on first use):")
+    for module in ['PIL.Image', 'tkinter', 'mss', 'pytesseract', 'numpy', 'onnxruntime']:
+        module_timings = measure_cold_import(module)
+        if module_timings is None:
+            lines.append(f"  {'-':>8}     {module} (not installed)")
+        else:
+            lines.append(f"  {total_import_ms(module, module_timings):8.2f} ms  {module}")
+
+    lines.append("")
+    lines.append("Within budget" if within_budget else "OVER BUDGET")
+    return '\n'.join(lines), within_budget
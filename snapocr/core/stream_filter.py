@@ -0,0 +1,261 @@
+"""
+OCR filter over a stream of images (stdin to stdout).
+
+Other programs pipe images into one long-running process instead of
+starting SnapOCR per image and passing files around. Two framings are
+understood on input:
+
+- ``png``: PNG files back to back; each ends at its IEND chunk.
+- ``length``: each image (any format Pillow reads) preceded by its size
+  as a 4-byte big-endian unsigned integer.
+
+``auto`` picks ``png`` when the stream starts with the PNG signature.
+Every frame produces one JSON line as soon as it is recognized:
+
+    {"frame": 0, "text": "...", "latex": null, "ms": 183.2}
+    {"frame": 1, "error": "Frame of 5 bytes is not a readable image"}
+
+Frames are numbered from 0 in input order. Results may overtake each
+other unless the filter runs in ordered mode.
+"""
+
+import io
+import struct
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .trace import span
+
+
+# Input framings
+FRAMINGS = ('auto', 'png', 'length')
+
+# PNG file signature
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Largest frame accepted, so a corrupt length cannot exhaust memory
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+# Size prefix of length-framed images
+_LENGTH = struct.Struct('>I')
+
+# PNG chunk header: data length, type
+_CHUNK = struct.Struct('>I4s')
+
+
+def _read_exactly(stream: IO[bytes], size: int) -> bytes:
+    """Read ``size`` bytes, or fewer only at the end of the stream."""
+    parts = []
+    while size:
+        data = stream.read(size)
+        if not data:
+            break
+        parts.append(data)
+        size -= len(data)
+    return b''.join(parts)
+
+
+def _read_png(stream: IO[bytes]) -> Optional[bytes]:
+    """Read one PNG file by walking its chunks; None at end of stream."""
+    signature = _read_exactly(stream, len(PNG_SIGNATURE))
+    if not signature:
+        return None
+    if signature != PNG_SIGNATURE:
+        raise ValueError("Stream is not a sequence of PNG files")
+    parts = [signature]
+    total = len(signature)
+    while True:
+        header = _read_exactly(stream, _CHUNK.size)
+        if len(header) < _CHUNK.size:
+            raise ValueError("Stream ended inside a PNG file")
+        length, kind = _CHUNK.unpack(header)
+        total += _CHUNK.size + length + 4
+        if total > MAX_FRAME_BYTES:
+            raise ValueError(f"PNG frame larger than {MAX_FRAME_BYTES} bytes")
+        body = _read_exactly(stream, length + 4)  # Data and CRC
+        if len(body) < length + 4:
+            raise ValueError("Stream ended inside a PNG file")
+        parts += [header, body]
+        if kind == b'IEND':
+            return b''.join(parts)
+
+
+def _read_length_prefixed(stream: IO[bytes]) -> Optional[bytes]:
+    """Read one size-prefixed frame; None at end of stream."""
+    header = _read_exactly(stream, _LENGTH.size)
+    if not header:
+        return None
+    if len(header) < _LENGTH.size:
+        raise ValueError("Stream ended inside a frame header")
+    (length,) = _LENGTH.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {length} bytes is larger than {MAX_FRAME_BYTES}")
+    data = _read_exactly(stream, length)
+    if len(data) < length:
+        raise ValueError("Stream ended inside a frame")
+    return data
+
+
+def detect_framing(stream: IO[bytes]) -> str:
+    """
+    Guess the framing of a buffered stream without consuming it.
+
+    Args:
+        stream: Binary stream with ``peek()`` (e.g. ``sys.stdin.buffer``).
+
+    Returns:
+        'png' or 'length'.
+    """
+    return 'png' if stream.peek(len(PNG_SIGNATURE)).startswith(PNG_SIGNATURE) else 'length'
+
+
+def read_frames(stream: IO[bytes], framing: str = 'auto') -> Iterator[bytes]:
+    """
+    Split a binary stream into encoded images.
+
+    Args:
+        stream: Binary input stream.
+        framing: One of ``FRAMINGS``.
+
+    Yields:
+        Encoded image bytes per frame.
+
+    Raises:
+        ValueError: If the stream does not follow the framing.
+    """
+    if framing == 'auto':
+        framing = detect_framing(stream)
+    read = _read_png if framing == 'png' else _read_length_prefixed
+    while True:
+        frame = read(stream)
+        if frame is None:
+            return
+        yield frame
+
+
+def decode_frame(data: bytes):
+    """
+    Decode an encoded image in memory.
+
+    Args:
+        data: Encoded image bytes.
+
+    Returns:
+        Loaded PIL image.
+
+    Raises:
+        ValueError: If the bytes are not an image Pillow can read.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        image = Image.open(io.BytesIO(data))
+    except UnidentifiedImageError:
+        raise ValueError(f"Frame of {len(data)} bytes is not a readable image") from None
+    image.load()
+    return image
+
+
+class StreamFilter:
+    """
+    Recognize frames concurrently and emit one result per frame.
+
+    Usage:
+        stream_filter = StreamFilter(recognize=ocr_image, emit=StreamSink(sys.stdout))
+        stream_filter.run(read_frames(sys.stdin.buffer))
+    """
+
+    def __init__(
+        self,
+        recognize: Callable[[Any], Tuple[str, Optional[str]]],
+        emit: Callable[[Dict[str, Any]], None],
+        workers: int = 2,
+        ordered: bool = False
+    ):
+        """
+        Initialize the filter.
+
+        Args:
+            recognize: Returns (result text, LaTeX or None) for a PIL image.
+            emit: Receives one result dict per frame.
+            workers: Frames recognized concurrently.
+            ordered: Emit results in input order instead of as they finish.
+        """
+        self._recognize = recognize
+        self._emit = emit
+        self._workers = max(1, workers)
+        self._ordered = ordered
+        # Bounds the frames read ahead of the OCR
+        self._slots = threading.BoundedSemaphore(self._workers * 2)
+        self._lock = threading.Lock()
+        self._finished: Dict[int, Dict[str, Any]] = {}
+        self._next = 0
+        self._error: Optional[BaseException] = None  # First error raised by emit
+        self.frames = 0
+        self.failed = 0
+
+    def _process(self, number: int, data: bytes) -> Dict[str, Any]:
+        """Decode and recognize one frame (worker thread)."""
+        started = time.perf_counter()
+        try:
+            with span('stream_frame', frame=number, size=len(data)):
+                text, latex = self._recognize(decode_frame(data))
+        except Exception as e:
+            return {'frame': number, 'error': str(e)}
+        return {
+            'frame': number,
+            'text': text,
+            'latex': latex,
+            'ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    def _done(self, number: int, future: Future) -> None:
+        """Emit a finished frame, or every frame it was holding back."""
+        try:
+            result = future.result()
+            with self._lock:
+                if 'error' in result:
+                    self.failed += 1
+                if self._error is not None:
+                    return  # Output is gone (e.g. broken pipe); drop the rest
+                if not self._ordered:
+                    self._emit(result)
+                else:
+                    self._finished[number] = result
+                    while self._next in self._finished:
+                        self._emit(self._finished.pop(self._next))
+                        self._next += 1
+        except BaseException as e:
+            with self._lock:
+                if self._error is None:
+                    self._error = e
+        finally:
+            self._slots.release()
+
+    def run(self, frames: Iterator[bytes]) -> int:
+        """
+        Recognize every frame until the input ends.
+
+        Args:
+            frames: Encoded images (see ``read_frames``).
+
+        Returns:
+            Number of frames read.
+
+        Raises:
+            Exception: The first error raised by ``emit``; no more frames are read after it.
+        """
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='snapocr-stream') as executor:
+            for data in frames:
+                self._slots.acquire()
+                if self._error is not None:
+                    break
+                number = self.frames
+                self.frames += 1
+                future = executor.submit(self._process, number, data)
+                future.add_done_callback(lambda future, number=number: self._done(number, future))
+        if self._error is not None:
+            raise self._error
+        return self.frames
@@ -0,0 +1,261 @@
+"""
+Lightweight stage tracing with Chrome trace export.
+
+Spans are recorded only when tracing is enabled; otherwise ``span()``
+returns a shared no-op context manager so instrumented code pays almost
+nothing.
+
+Usage:
+    from snapocr.core.trace import span
+
+    with span('tesseract', lang='eng'):
+        text = pytesseract.image_to_string(image)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional
+
+
+# Finished spans kept for export; the oldest are dropped beyond this (resident processes)
+MAX_SPANS = 100000
+
+
+class _NullSpan:
+    """No-op span returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args) -> None:
+        """Ignore span arguments."""
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A single timed stage."""
+
+    __slots__ = ('name', 'args', 'start', 'end', 'parent', 'depth', 'thread_id', 'mark', '_tracer')
+
+    def __init__(self, tracer: 'Tracer', name: str, args: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0.0
+        self.end = 0.0
+        self.parent: Optional['Span'] = None
+        self.depth = 0
+        self.thread_id = 0
+        self.mark = 0                   # Spans recorded before this one started
+
+    @property
+    def duration_ms(self) -> float:
+        """Duration of the span in milliseconds."""
+        return (self.end - self.start) * 1000.0
+
+    def set(self, **args) -> None:
+        """Attach extra arguments to the span."""
+        self.args.update(args)
+
+    def __enter__(self):
+        self._tracer._push(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self._tracer._pop(self)
+        return False
+
+
+class Tracer:
+    """Collects nested spans and exports them."""
+
+    def __init__(self):
+        """Initialize a disabled tracer."""
+        self.enabled = False
+        self._spans: Deque[Span] = deque(maxlen=MAX_SPANS)
+        self._recorded = 0              # Spans finished since the tracer was created
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+
+    def enable(self) -> None:
+        """Start recording spans."""
+        self._origin = time.perf_counter()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording spans."""
+        self.enabled = False
+
+    def clear(self) -> None:
+        """Drop all recorded spans."""
+        with self._lock:
+            self._spans.clear()
+
+    def span(self, name: str, **args):
+        """
+        Create a span context manager.
+
+        Args:
+            name: Stage name.
+            **args: Extra arguments stored with the span.
+
+        Returns:
+            A span, or a shared no-op object when tracing is disabled.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, args)
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _push(self, span: Span) -> None:
+        stack = self._stack()
+        if stack:
+            span.parent = stack[-1]
+            span.depth = span.parent.depth + 1
+        span.thread_id = threading.get_ident()
+        with self._lock:
+            span.mark = self._recorded
+        stack.append(span)
+
+    def _pop(self, span: Span) -> None:
+        stack = self._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        with self._lock:
+            self._spans.append(span)
+            self._recorded += 1
+
+    @property
+    def spans(self) -> List[Span]:
+        """Get finished spans sorted by start time."""
+        with self._lock:
+            return sorted(self._spans, key=lambda s: s.start)
+
+    def descendants(self, root: Span) -> List[Span]:
+        """Get finished spans nested under ``root`` (any depth)."""
+        # Only spans finished after the root started can be nested under it
+        with self._lock:
+            recent = min(len(self._spans), self._recorded - root.mark)
+            candidates = list(islice(self._spans, len(self._spans) - recent, None))
+        result = []
+        for s in sorted(candidates, key=lambda s: s.start):
+            parent = s.parent
+            while parent is not None and parent is not root:
+                parent = parent.parent
+            if parent is root:
+                result.append(s)
+        return result
+
+    def stage_totals(self, root: Optional[Span] = None) -> Dict[str, float]:
+        """
+        Sum span durations by name.
+
+        Args:
+            root: Only include spans nested under this span. All spans if None.
+
+        Returns:
+            Mapping of stage name to total milliseconds, in first-seen order.
+        """
+        spans = self.descendants(root) if root is not None else self.spans
+        totals: Dict[str, float] = {}
+        for s in spans:
+            totals[s.name] = totals.get(s.name, 0.0) + s.duration_ms
+        return totals
+
+    def summary(self, root: Span) -> str:
+        """Format a one-line summary of ``root`` and its stages."""
+        line = f"[trace] {root.name} {root.duration_ms:.1f} ms"
+        stages = ' '.join(
+            f"{name}={ms:.1f}" for name, ms in self.stage_totals(root).items()
+        )
+        return f"{line}: {stages}" if stages else line
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Build a Chrome trace (chrome://tracing, Perfetto) document."""
+        pid = os.getpid()
+        events = []
+        for s in self.spans:
+            events.append({
+                'name': s.name,
+                'ph': 'X',
+                'ts': round((s.start - self._origin) * 1e6, 3),
+                'dur': round((s.end - s.start) * 1e6, 3),
+                'pid': pid,
+                'tid': s.thread_id,
+                'args': {k: v if isinstance(v, (int, float, str, bool)) or v is None else str(v)
+                         for k, v in s.args.items()},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path: str) -> bool:
+        """
+        Write the recorded spans as Chrome trace JSON.
+
+        Args:
+            path: Output file path.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_chrome_trace(), f)
+            return True
+        except IOError as e:
+            print(f"Error: Could not write trace file: {e}", file=sys.stderr)
+            return False
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer."""
+    return _tracer
+
+
+def span(name: str, **args):
+    """Create a span on the process-wide tracer."""
+    if not _tracer.enabled:
+        return _NULL_SPAN
+    return Span(_tracer, name, args)
+
+
+@contextmanager
+def trace_capture(name: str = 'capture', **args):
+    """
+    Trace one capture and print its one-line summary to stderr when it completes.
+
+    Args:
+        name: Root span name.
+        **args: Extra arguments stored with the root span.
+    """
+    root = span(name, **args)
+    with root:
+        yield root
+    if root is not _NULL_SPAN:
+        print(_tracer.summary(root), file=sys.stderr)  # stdout may carry the result
@@ -0,0 +1,356 @@
+"""
+SnapOCR resident daemon.
+
+``snapocr daemon`` keeps one warm process (imported modules, cached
+Tesseract languages, loaded config) and serves requests over a local
+socket. A plain ``snapocr`` invocation forwards its capture to a running
+daemon and only falls back to an in-process capture when none is
+listening, so existing hotkey bindings benefit without changes.
+
+With ``frame_buffer_frames`` set, the daemon also keeps a rolling buffer
+of recent screen frames: the overlay opens on the newest frame without
+grabbing, and ``snapocr --ago N`` selects from the screen as it was N
+seconds ago.
+
+The Tk root and the overlay and result windows are built at startup and
+only shown on demand; each capture reports how long the overlay took to
+become interactive after the request was sent (``overlay_ms``).
+
+Plain captures are queued: the request returns once the region is
+selected and OCR runs on a background worker that copies results to the
+clipboard in order, so the next capture can start right away.
+
+Protocol: one JSON object per line in each direction, one request per
+connection. Requests look like ``{"command": "capture", "ui": false}``;
+replies look like ``{"ok": true, "result": "..."}``.
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .core.config import Config
+
+
+# TCP port used where Unix domain sockets are unavailable (Windows)
+DEFAULT_PORT = 47653
+
+# Largest request or reply line accepted, in bytes
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+# Seconds between UI event checks while waiting for requests
+UI_POLL_INTERVAL = 0.05
+
+# Capture requests sent within this many seconds of the previous one are dropped
+CAPTURE_COALESCE_SECONDS = 0.4
+
+
+def get_daemon_address() -> Tuple[int, Any]:
+    """
+    Get the daemon socket family and address for this user.
+
+    Returns:
+        Tuple of (address family, address).
+    """
+    if sys.platform == 'win32' or not hasattr(socket, 'AF_UNIX'):
+        return socket.AF_INET, ('127.0.0.1', DEFAULT_PORT)
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return socket.AF_UNIX, os.path.join(runtime_dir, f'snapocr-{os.getuid()}.sock')
+
+
+def _read_line(conn: socket.socket) -> bytes:
+    """Read one newline-terminated message from a socket."""
+    chunks = []
+    size = 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        newline = chunk.find(b'\n')
+        if newline >= 0:
+            chunks.append(chunk[:newline])
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > MAX_MESSAGE_SIZE:
+            raise ValueError("message too large")
+    return b''.join(chunks)
+
+
+def _send_message(conn: socket.socket, message: Dict[str, Any]) -> None:
+    """Send one JSON message followed by a newline."""
+    conn.sendall(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+
+
+def send_command(command: str, timeout: Optional[float] = None, **params) -> Optional[Dict[str, Any]]:
+    """
+    Send a command to the running daemon.
+
+    Args:
+        command: Command name, e.g. 'ping' or 'capture'.
+        timeout: Optional reply timeout in seconds (None waits indefinitely).
+        **params: JSON-serializable command parameters.
+
+    Returns:
+        The daemon's reply, or None if no daemon is running.
+    """
+    family, address = get_daemon_address()
+    try:
+        conn = socket.socket(family, socket.SOCK_STREAM)
+    except OSError:
+        return None
+
+    try:
+        conn.settimeout(1.0)
+        conn.connect(address)
+        conn.settimeout(timeout)
+        _send_message(conn, {'command': command, **params})
+        reply = _read_line(conn)
+        return json.loads(reply.decode('utf-8')) if reply else None
+    except (OSError, ValueError):
+        return None
+    finally:
+        conn.close()
+
+
+def is_daemon_running() -> bool:
+    """Check whether a daemon answers on the socket."""
+    reply = send_command('ping', timeout=1.0)
+    return bool(reply and reply.get('ok'))
+
+
+class SnapOCRDaemon:
+    """Resident process serving capture requests from a warm SnapOCR instance."""
+
+    def __init__(self, config: Optional[Config] = None):
+        """
+        Initialize the daemon.
+
+        Args:
+            config: Optional config instance. Creates new one if not provided.
+        """
+        from .main import SnapOCR
+
+        self._config = config or Config()
+        self._app = SnapOCR(self._config, resident=True)
+        self._running = False
+        self._frame_buffer = None
+        self._last_capture_request: Optional[float] = None
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            'ping': self._handle_ping,
+            'capture': self._handle_capture,
+            'frames': self._handle_frames,
+            'grab': self._handle_grab,
+            'quit': self._handle_quit,
+        }
+
+    @property
+    def app(self):
+        """Get the warm SnapOCR instance."""
+        return self._app
+
+    def register(self, command: str, handler: Callable[[Dict[str, Any]], Dict[str, Any]]) -> None:
+        """
+        Register a command handler.
+
+        Args:
+            command: Command name.
+            handler: Callable receiving the request dict and returning the reply dict.
+        """
+        self._handlers[command] = handler
+
+    def _handle_ping(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {'ok': True, 'pid': os.getpid()}
+
+    def _handle_capture(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        ago = request.get('ago')
+        if ago:
+            if self._frame_buffer is None:
+                return {'ok': False, 'error': "frame buffer disabled (set frame_buffer_frames > 0)"}
+            if self._frame_buffer.frame_at(float(ago)) is None:
+                return {'ok': False, 'error': f"no frame buffered from {ago} seconds ago"}
+
+        # Hotkey time: when the client sent the request, else when it arrived
+        requested_at = float(request.get('sent_at') or time.time())
+
+        # A second press right after the first (key bounce, double press) is dropped
+        previous = self._last_capture_request
+        self._last_capture_request = requested_at
+        if previous is not None and 0 <= requested_at - previous < CAPTURE_COALESCE_SECONDS:
+            return {'ok': True, 'coalesced': True}
+
+        ui = self._app.screenshot_capture.ui_session  # None without Pillow
+        if ui is not None:
+            ui.last_overlay_ready = None
+
+        # Queued jobs take a snapshot of the settings (overrides included) when they are submitted
+        overrides = {k: v for k, v in (request.get('overrides') or {}).items() if v is not None}
+        queued = not request.get('ui') and int(self._config.get('capture_queue_size', 4) or 0) > 0
+
+        with self._config.temporary_overrides(overrides):
+            with self._frame_buffer.pinned(float(ago)) if ago else nullcontext():
+                if request.get('ui'):
+                    result = self._app.capture_with_ui()
+                elif queued:
+                    job_id = self._app.enqueue_capture()
+                else:
+                    result = self._app.capture_and_extract()
+
+        if queued:
+            reply = {'ok': job_id is not None, 'queued': True, 'job': job_id}
+        else:
+            reply = {'ok': result is not None, 'result': result}
+        if ui is not None and ui.last_overlay_ready is not None:
+            reply['overlay_ms'] = round((ui.last_overlay_ready - requested_at) * 1000.0, 1)
+            print(f"Overlay ready {reply['overlay_ms']:.1f} ms after the request")
+        return reply
+
+    def _handle_grab(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            x, y, w, h = (int(v) for v in request.get('rect') or ())
+        except (TypeError, ValueError):
+            return {'ok': False, 'error': "grab needs rect: [x, y, width, height]"}
+
+        overrides = {k: v for k, v in (request.get('overrides') or {}).items() if v is not None}
+        with self._config.temporary_overrides(overrides):
+            result = self._app.grab_and_extract((x, y, w, h), copy=request.get('copy', True), show_result=False)
+        return {'ok': result is not None, 'result': result}
+
+    def _handle_frames(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if self._frame_buffer is None:
+            return {'ok': True, 'frames': []}
+        now = time.time()
+        return {
+            'ok': True,
+            'frames': [
+                {'age': round(now - f.captured_at, 3), 'unchanged_for': round(now - f.last_seen, 3)}
+                for f in self._frame_buffer.frames()
+            ],
+        }
+
+    def _start_frame_buffer(self) -> None:
+        """Start the rolling frame buffer if enabled in the config."""
+        frames = int(self._config.get('frame_buffer_frames', 0) or 0)
+        if frames <= 0:
+            return
+
+        from .platform.frame_buffer import FrameRingBuffer
+        try:
+            buffer = FrameRingBuffer(
+                frames=frames,
+                interval=float(self._config.get('frame_buffer_interval', 1.0)),
+                scale=float(self._config.get('frame_buffer_scale', 1.0)),
+                capture_backend=self._config.get('capture_backend', 'auto'),
+            )
+        except ValueError as e:
+            print(f"Warning: Frame buffer disabled: {e}")
+            return
+        if not buffer.start():
+            print("Warning: Frame buffer disabled: no capture backend available")
+            return
+
+        self._frame_buffer = buffer
+        self._app.screenshot_capture.frame_source = buffer
+        print(f"Frame buffer: {frames} frames, {buffer.memory_bytes / (1024 * 1024):.1f} MB")
+
+    def _handle_quit(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self._running = False
+        return {'ok': True}
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Dispatch a request to its handler.
+
+        Args:
+            request: Decoded request message.
+
+        Returns:
+            Reply message.
+        """
+        handler = self._handlers.get(request.get('command'))
+        if handler is None:
+            return {'ok': False, 'error': f"unknown command: {request.get('command')}"}
+        try:
+            return handler(request)
+        except Exception as e:
+            print(f"Error handling '{request.get('command')}': {e}")
+            return {'ok': False, 'error': str(e)}
+
+    def _bind(self) -> socket.socket:
+        """Create the listening socket, replacing a stale Unix socket file."""
+        family, address = get_daemon_address()
+        if family == socket.AF_UNIX and os.path.exists(address):
+            if is_daemon_running():
+                raise RuntimeError("SnapOCR daemon is already running")
+            os.remove(address)
+
+        server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_UNIX:
+            old_umask = os.umask(0o177)  # Socket readable by this user only
+            try:
+                server.bind(address)
+            finally:
+                os.umask(old_umask)
+        else:
+            server.bind(address)
+        server.listen(8)
+        return server
+
+    def serve_forever(self) -> None:
+        """
+        Serve requests until a 'quit' command or Ctrl+C.
+
+        Requests are handled one at a time on the calling (main) thread,
+        which Tk requires for the selection overlay and result windows.
+        """
+        server = self._bind()
+        family, address = get_daemon_address()
+        self._config.watch()
+        self._start_frame_buffer()
+        ui_ready = self._app.prepare_ui()
+        if ui_ready:
+            # Wake up regularly so pinned windows stay responsive between captures
+            server.settimeout(UI_POLL_INTERVAL)
+        self._running = True
+        print(f"SnapOCR daemon listening on {address} (pid {os.getpid()})")
+
+        try:
+            while self._running:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    self._app.process_ui_events()
+                    continue
+                with conn:
+                    try:
+                        request = json.loads(_read_line(conn).decode('utf-8') or '{}')
+                    except (OSError, ValueError) as e:
+                        print(f"Error reading request: {e}")
+                        continue
+                    reply = self.handle_request(request)
+                    try:
+                        _send_message(conn, reply)
+                    except OSError:
+                        pass  # Client went away
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._running = False
+            if self._frame_buffer is not None:
+                self._frame_buffer.stop()
+            self._config.stop_watching()
+            self._config.flush()
+            self._app.stop_capture_queue()
+            self._app.close_ui()
+            server.close()
+            if family == socket.AF_UNIX:
+                try:
+                    os.remove(address)
+                except OSError:
+                    pass
+            print("SnapOCR daemon stopped")
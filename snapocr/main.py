@@ -7,7 +7,8 @@ Cross-platform screenshot OCR tool with LaTeX conversion support.
 import argparse
 import os
 import sys
-from typing import Optional
+import tempfile
+from typing import List, Optional
 
 
 def _setup_windows_dpi():
@@ -33,24 +34,81 @@ def _setup_windows_dpi():
 _setup_windows_dpi()
 
 from .core.config import Config
-from .core.ocr import extract_text, format_result
+from .core.ocr import convert_to_latex, extract_text, format_result, has_math_patterns
 from .core.clipboard import ClipboardManager
-from .platform.base import PlatformManager
+from .core.trace import get_tracer, span, trace_capture
+from .platform.base import PlatformManager, remove_selection_files
 
 
 class SnapOCR:
     """Main SnapOCR application class."""
 
-    def __init__(self, config: Optional[Config] = None):
+    def __init__(self, config: Optional[Config] = None, resident: bool = False):
         """
         Initialize SnapOCR.
 
         Args:
             config: Optional config instance. Creates new one if not provided.
+            resident: Whether this instance lives in a long-running process
+                (daemon mode) and may keep per-process resources alive.
         """
         self._config = config or Config()
-        self._screenshot_capture = PlatformManager.get_screenshot_capture()
-        self._clipboard_manager = ClipboardManager()
+        self._resident = resident
+        self._screenshot_capture = None  # Created on first capture
+        self._ui = None  # Created on first capture
+        self._capture_queue = None  # Created on first queued capture
+        self._queued_results: List[str] = []  # Results of the current burst of queued captures
+        self._clipboard_manager = ClipboardManager(resident=resident)
+
+    @property
+    def ui(self):
+        """Get the Tk session shared by the overlay and result windows."""
+        if self._ui is None:
+            from .ui.session import UISession
+            self._ui = UISession()
+        return self._ui
+
+    @property
+    def screenshot_capture(self):
+        """Get the platform screenshot capture, created on first use."""
+        if self._screenshot_capture is None:
+            self._screenshot_capture = PlatformManager.get_screenshot_capture(
+                capture_scope=self._config.get('capture_scope', 'monitor'),
+                capture_backend=self._config.get('capture_backend', 'auto')
+            )
+            try:
+                self._screenshot_capture.ui_session = self.ui
+            except ImportError:
+                pass  # No Pillow: the capture falls back to its own tools
+        return self._screenshot_capture
+
+    def prepare_ui(self) -> bool:
+        """
+        Start Tk and build the overlay and result windows ahead of time.
+
+        Returns:
+            True if the windows are ready, False if Tk is unavailable.
+        """
+        try:
+            with span('prepare_ui'):
+                self.ui.prebuild()
+            return True
+        except Exception as e:
+            print(f"Warning: Could not prepare UI windows: {e}")
+            return False
+
+    def close_ui(self) -> None:
+        """Destroy the Tk session and its windows."""
+        if self._ui is not None:
+            self._ui.close()
+
+    def process_ui_events(self) -> None:
+        """Handle pending UI events between captures (resident mode)."""
+        if self._ui is not None:
+            try:
+                self._ui.process_events()
+            except Exception as e:
+                print(f"Warning: UI event processing failed: {e}")
 
     def capture_and_extract(self, show_result: bool = True) -> Optional[str]:
         """
@@ -62,25 +120,144 @@ class SnapOCR:
         Returns:
             Extracted text or None if cancelled/failed.
         """
+        with trace_capture('capture', mode='cli'):
+            return self._capture_and_extract(show_result)
+
+    def _select_region(self):
+        """
+        Let the user select a region, indexing the screenshot meanwhile.
+
+        Returns:
+            Tuple of (SelectionResult or None, OCRIndex or None).
+        """
+        capture = self.screenshot_capture
+        index = [None]
+
+        # Forced LaTeX conversion needs the image anyway, so skip the index
+        if self._config.get('background_ocr', True) and not self._config.latex_conversion:
+            def start_index(screen_img, monitor, pointer):
+                from .core.ocr_index import OCRIndex
+                from .platform.monitors import image_scale
+                index[0] = OCRIndex(
+                    screen_img,
+                    origin=(monitor['left'], monitor['top']),
+                    scale=image_scale(screen_img, monitor),
+                    language=self._config.language,
+                    tesseract_path=self._config.tesseract_path
+                )
+                index[0].start(pointer)
+
+            capture.screen_listener = start_index
+
+        try:
+            with span('select_region'):
+                selection_result = capture.select_region()
+        finally:
+            capture.screen_listener = None
+
+        if not selection_result and index[0] is not None:
+            index[0].close()
+            index[0] = None
+        return selection_result, index[0]
+
+    def _ocr_settings(self) -> dict:
+        """Snapshot the settings used to recognize a selection, overrides included."""
+        return {
+            'language': self._config.language,
+            'tesseract_path': self._config.tesseract_path,
+            'latex_conversion': self._config.latex_conversion,
+            'region_order': self._config.get('region_order', 'selection'),
+        }
+
+    def _extract_selection(self, selection_result, index, settings: Optional[dict] = None) -> tuple:
+        """
+        Extract text from a selection and all its regions.
+
+        Several regions (shift-drag) are recognized concurrently and their
+        results joined in selection or reading order (``region_order``).
+
+        Args:
+            selection_result: The selection to recognize.
+            index: Background OCR index of the screenshot, or None.
+            settings: Settings from ``_ocr_settings()``; taken from the config if not provided.
+
+        Returns:
+            Tuple of (text, latex).
+        """
+        settings = settings or self._ocr_settings()
+        regions = selection_result.all_regions
+        try:
+            if len(regions) == 1:
+                return self._extract_region(selection_result, index, settings)
+
+            if settings['region_order'] == 'reading':
+                regions = sorted(regions, key=lambda r: (r.rect[1], r.rect[0]))
+
+            from concurrent.futures import ThreadPoolExecutor
+            with span('extract_regions', regions=len(regions)):
+                with ThreadPoolExecutor(max_workers=min(len(regions), os.cpu_count() or 2)) as executor:
+                    extracted = list(executor.map(lambda r: self._extract_region(r, index, settings), regions))
+        finally:
+            if index is not None:
+                index.close()
+
+        # Each region keeps its own LaTeX next to its text
+        parts = [format_result(text, latex) for text, latex in extracted]
+        return '\n\n'.join(part for part in parts if part), None
+
+    def _extract_region(self, region, index, settings: dict) -> tuple:
+        """
+        Extract text from one region, from the background index if it covers it.
+
+        Returns:
+            Tuple of (text, latex).
+        """
+        if index is not None:
+            with span('index_lookup'):
+                text = index.text_in(region.rect)
+            if text is not None:
+                latex = None
+                if has_math_patterns(text):
+                    latex = convert_to_latex(self._load_selection_image(region))
+                return text, latex
+
+        with span('extract_text'):
+            return extract_text(
+                region.image if region.image is not None else region.image_path,
+                language=settings['language'],
+                tesseract_path=settings['tesseract_path'],
+                latex_mode=settings['latex_conversion'],
+                auto_detect_math=True
+            )
+
+    @staticmethod
+    def _load_selection_image(selection_result):
+        """Load the selected region into memory."""
+        from PIL import Image
+
+        if selection_result.image is not None:
+            return selection_result.image
+        with span('image_open'):
+            image = Image.open(selection_result.image_path)
+            image.load()
+        return image
+
+    def _capture_and_extract(self, show_result: bool) -> Optional[str]:
+        """Run the non-interactive capture pipeline."""
         # Capture screenshot region
-        selection_result = self._screenshot_capture.select_region()
+        selection_result, index = self._select_region()
         if not selection_result:
             return None
+        return self._extract_and_copy(selection_result, index, show_result)
 
-        image_path = selection_result.image_path
-
+    def _extract_and_copy(self, selection_result, index, show_result: bool) -> Optional[str]:
+        """Extract text from a selection and copy it to the clipboard."""
         try:
             # Extract text
             if show_result:
                 print("Extracting text...")
 
-            text, latex = extract_text(
-                image_path,
-                language=self._config.language,
-                tesseract_path=self._config.tesseract_path,
-                latex_mode=self._config.latex_conversion,
-                auto_detect_math=True
-            )
+            text, latex = self._extract_selection(selection_result, index)
 
             # Format result
             result = format_result(text, latex)
@@ -91,7 +268,8 @@ class SnapOCR:
                 return None
 
             # Copy to clipboard
-            self._clipboard_manager.copy(result)
+            with span('clipboard_copy'):
+                self._clipboard_manager.copy(result, latex=latex)
 
             if show_result:
                 print(f"Text copied to clipboard ({len(result)} characters)")
@@ -103,101 +281,334 @@ class SnapOCR:
             return result
 
         finally:
-            # Cleanup temp file
-            try:
-                if image_path and os.path.exists(image_path):
-                    os.remove(image_path)
-            except Exception:
-                pass
+            # Cleanup temp files
+            remove_selection_files(selection_result)
 
-    def capture_with_ui(self, show_result: bool = True) -> Optional[str]:
+    def grab_and_extract(
+        self,
+        rect: tuple,
+        copy: bool = True,
+        show_result: bool = True
+    ) -> Optional[str]:
         """
-        Capture a screenshot region with interactive UI.
+        OCR a fixed screen rectangle without showing the overlay.
 
-        Shows selection overlay, result panel, and action buttons.
+        Args:
+            rect: (x, y, width, height) in screen coordinates.
+            copy: Whether to copy the text to the clipboard.
+            show_result: Whether to print progress messages.
+
+        Returns:
+            Extracted text or None if nothing was recognized or the grab failed.
+        """
+        with trace_capture('grab', rect=','.join(str(v) for v in rect)):
+            try:
+                with span('grab_rect'):
+                    image = self.screenshot_capture.grab_rect(rect)
+            except Exception as e:
+                print(f"Error capturing screen: {e}")
+                return None
+
+            return self._recognize_image(image, copy, show_result, "No text detected in the region.")
+
+    def extract_from_clipboard(self, copy: bool = True, show_result: bool = True) -> Optional[str]:
+        """
+        OCR the image currently on the clipboard, without saving it to a file.
 
         Args:
-            show_result: Whether to print the result.
+            copy: Whether to replace the clipboard image with the text.
+            show_result: Whether to print progress messages.
 
         Returns:
-            Extracted text or None if cancelled/failed.
+            Extracted text or None if there is no image or no text.
         """
-        try:
-            import tkinter as tk
-            from tkinter import simpledialog
-            from PIL import Image
-        except ImportError as e:
-            print(f"Error: UI requires tkinter and PIL: {e}")
-            return self.capture_and_extract(show_result)
+        with trace_capture('clipboard'):
+            with span('clipboard_paste_image'):
+                image = self._clipboard_manager.paste_image()
+            if image is None:
+                print("Error: The clipboard does not contain an image")
+                return None
+            return self._recognize_image(image, copy, show_result, "No text detected in the clipboard image.")
 
-        # Capture screenshot region
-        selection_result = self._screenshot_capture.select_region()
-        if not selection_result:
-            return None
+    def watch_clipboard(self, on_text=None) -> None:
+        """
+        Replace each image copied to the clipboard with its text until Ctrl+C.
 
-        image_path = selection_result.image_path
-        rect = selection_result.rect
-        screen_width = selection_result.screen_width
-        screen_height = selection_result.screen_height
+        Args:
+            on_text: Called with the text of each new image.
+        """
+        from .core.clipboard_watch import ClipboardWatcher
 
+        def recognize(image) -> Optional[str]:
+            with trace_capture('clipboard_watch'):
+                return self._recognize_image(image, copy=False, show_result=False)
+
+        watcher = ClipboardWatcher(self._clipboard_manager, recognize, on_text=on_text)
         try:
-            # Extract text
-            if show_result:
-                print("Extracting text...")
+            watcher.run()
+        except KeyboardInterrupt:
+            pass
 
+    def _recognize_image(
+        self,
+        image,
+        copy: bool,
+        show_result: bool,
+        empty_message: str = "No text detected."
+    ) -> Optional[str]:
+        """OCR an in-memory image and optionally copy the result."""
+        with span('extract_text'):
             text, latex = extract_text(
-                image_path,
+                image,
                 language=self._config.language,
                 tesseract_path=self._config.tesseract_path,
                 latex_mode=self._config.latex_conversion,
                 auto_detect_math=True
             )
+        result = format_result(text, latex)
+        if not result:
+            if show_result:
+                print(empty_message)
+            return None
 
-            # Format result
-            result = format_result(text, latex)
+        if copy:
+            with span('clipboard_copy'):
+                self._clipboard_manager.copy(result, latex=latex)
+            if show_result:
+                print(f"Text copied to clipboard ({len(result)} characters)")
+        return result
+
+    def scroll_and_extract(
+        self,
+        rect: Optional[tuple] = None,
+        interval: float = 0.15,
+        idle_timeout: float = 3.0,
+        strip_dir: Optional[str] = None,
+        copy: bool = True,
+        on_line=None
+    ) -> Optional[str]:
+        """
+        OCR content taller than the screen while the user scrolls it.
+
+        Args:
+            rect: (x, y, width, height) to follow; selected with the overlay if not given.
+            interval: Seconds between grabs.
+            idle_timeout: Stop after this many seconds without new rows (0 to disable).
+            strip_dir: Optional directory for the stitched strips as PNG files.
+            copy: Whether to copy the text to the clipboard.
+            on_line: Called with each recognized line as soon as it is read.
+
+        Returns:
+            Extracted text or None if nothing was recognized or the capture failed.
+        """
+        from .core.scroll_capture import ScrollCapture
+        from .platform.capture_backends import create_backend
+
+        if rect is None:
+            capture = self.screenshot_capture
+            capture.save_files = False
+            try:
+                selection_result = capture.select_region()
+            finally:
+                capture.save_files = True
+            if not selection_result:
+                return None
+            remove_selection_files(selection_result)
+            rect = selection_result.rect
+
+        backend = create_backend(self._config.get('capture_backend', 'auto'))
+        if backend is None:
+            print("Error: No screen capture backend available")
+            return None
+
+        x, y, w, h = rect
+        monitor = {'left': x, 'top': y, 'width': w, 'height': h}
+        scroll = ScrollCapture(
+            grab=lambda: backend.grab_image(monitor),
+            on_line=on_line,
+            language=self._config.language,
+            tesseract_path=self._config.tesseract_path,
+            interval=interval,
+            idle_timeout=idle_timeout,
+            strip_dir=strip_dir
+        )
+        with trace_capture('scroll', rect=','.join(str(v) for v in rect)):
+            try:
+                result = scroll.run()
+            finally:
+                backend.close()
 
             if not result:
-                if show_result:
-                    print("No text detected in the selected region.")
-                # Show a notification anyway
-                self._show_no_text_dialog()
                 return None
+            if copy:
+                with span('clipboard_copy'):
+                    self._clipboard_manager.copy(result)
+        return result
 
-            # Load the captured image for potential pinning
-            captured_image = Image.open(image_path)
+    def enqueue_capture(self) -> Optional[int]:
+        """
+        Let the user select a region and queue it for OCR in the background.
 
-            # Show the interactive result UI
-            final_result = self._show_result_ui(
-                text=text,
-                latex=latex,
-                result=result,
-                captured_image=captured_image,
-                rect=rect,
-                screen_bounds=(screen_width, screen_height),
-                show_result=show_result
-            )
+        Returns as soon as the selection is done, so the next capture can
+        start while this one is recognized. Results are copied to the
+        clipboard in the order they were selected; while earlier captures
+        are still pending, each result is appended to theirs.
 
-            return final_result
+        Returns:
+            The queued job id, or None if cancelled or the queue is full.
+        """
+        captures = self._get_capture_queue()
+        if captures.full:
+            print("Capture queue full; wait for pending captures to finish")
+            return None
 
+        capture = self.screenshot_capture
+        capture.save_files = False  # Each job keeps its own images in memory
+        try:
+            with trace_capture('capture', mode='queued'):
+                selection_result, index = self._select_region()
         finally:
-            # Cleanup temp file
+            capture.save_files = True
+        if not selection_result:
+            return None
+
+        # Settings as of now: the config may be overridden again before the job runs
+        job_id = captures.submit(selection_result, index=index, settings=self._ocr_settings())
+        if job_id is None and index is not None:
+            index.close()
+        return job_id
+
+    def _get_capture_queue(self):
+        """Get the background OCR queue, created on first use."""
+        if self._capture_queue is None:
+            from .core.capture_queue import CaptureQueue
+            self._capture_queue = CaptureQueue(
+                process=self._process_queued,
+                deliver=self._deliver_queued,
+                maxsize=max(1, int(self._config.get('capture_queue_size', 4)))
+            )
+        return self._capture_queue
+
+    def _process_queued(self, job) -> tuple:
+        """Recognize a queued capture (worker thread); returns (result, latex)."""
+        try:
+            text, latex = self._extract_selection(job.payload, job.context['index'], job.context['settings'])
+            return format_result(text, latex), latex
+        finally:
+            remove_selection_files(job.payload)
+
+    def _deliver_queued(self, job, extracted: tuple) -> None:
+        """
+        Copy a finished queued capture to the clipboard and report it.
+
+        Captures queued back to back form a burst: each result is appended
+        to the earlier results of the burst on the clipboard instead of
+        replacing them. The burst ends when the queue runs empty.
+        """
+        result, latex = extracted
+        if result:
+            self._queued_results.append(result)
+            with span('clipboard_copy'):
+                if len(self._queued_results) == 1:
+                    self._clipboard_manager.copy(result, latex=latex)
+                else:
+                    self._clipboard_manager.copy('\n\n'.join(self._queued_results))
+            count = len(self._queued_results)
+            message = f"Capture {job.id}: text copied to clipboard ({len(result)} characters"
+            message += f", {count} captures joined)" if count > 1 else ")"
+        else:
+            message = f"Capture {job.id}: no text detected"
+        print(message)
+
+        if self._config.get('show_notification', True):
+            from .platform.notify import show_notification
+            show_notification('SnapOCR', result or "No text detected")
+
+        # This job still counts as pending until it is delivered
+        if self._capture_queue.pending <= 1:
+            self._queued_results = []
+
+    def stop_capture_queue(self) -> None:
+        """Finish the queued captures and stop the background worker."""
+        if self._capture_queue is not None:
+            self._capture_queue.stop()
+
+    def capture_with_ui(self, show_result: bool = True) -> Optional[str]:
+        """
+        Capture a screenshot region with interactive UI.
+
+        Shows selection overlay, result panel, and action buttons.
+
+        Args:
+            show_result: Whether to print the result.
+
+        Returns:
+            Extracted text or None if cancelled/failed.
+        """
+        try:
+            import tkinter  # noqa: F401
+            from PIL import Image
+        except ImportError as e:
+            print(f"Error: UI requires tkinter and PIL: {e}")
+            return self.capture_and_extract(show_result)
+
+        with trace_capture('capture', mode='ui'):
+            # Capture screenshot region
+            selection_result, index = self._select_region()
+            if not selection_result:
+                return None
+
+            image_path = selection_result.image_path
+
             try:
-                if image_path and os.path.exists(image_path):
-                    os.remove(image_path)
-            except Exception:
-                pass
+                # Extract text
+                if show_result:
+                    print("Extracting text...")
+
+                text, latex = self._extract_selection(selection_result, index)
+
+                # Load the captured image for potential pinning
+                with span('image_open', purpose='pin'):
+                    captured_image = Image.open(image_path)
+                    captured_image.load()
+            finally:
+                # Cleanup temp files
+                remove_selection_files(selection_result)
+
+        rect = selection_result.rect
+        screen_width = selection_result.screen_width
+        screen_height = selection_result.screen_height
+
+        # Format result
+        result = format_result(text, latex)
+
+        if not result:
+            if show_result:
+                print("No text detected in the selected region.")
+            # Show a notification anyway
+            self._show_no_text_dialog()
+            return None
+
+        # Show the interactive result UI
+        return self._show_result_ui(
+            text=text,
+            latex=latex,
+            result=result,
+            captured_image=captured_image,
+            rect=rect,
+            screen_bounds=(screen_width, screen_height),
+            screen_origin=selection_result.screen_origin,
+            show_result=show_result
+        )
 
     def _show_no_text_dialog(self):
         """Show a dialog when no text is detected."""
         try:
-            import tkinter as tk
             from tkinter import messagebox
 
-            root = tk.Tk()
-            root.withdraw()  # Hide the main window
+            root = self.ui.root  # Hidden; only parents the dialog
             root.attributes('-topmost', True)
-            messagebox.showinfo("SnapOCR", "No text detected in the selected region.")
-            root.destroy()
+            messagebox.showinfo("SnapOCR", "No text detected in the selected region.", parent=root)
         except Exception:
             pass
 
@@ -209,6 +620,7 @@ class SnapOCR:
         captured_image,
         rect: tuple,
         screen_bounds: tuple,
+        screen_origin: tuple = (0, 0),
         show_result: bool = True
     ) -> Optional[str]:
         """
@@ -217,28 +629,19 @@ class SnapOCR:
         Returns:
             The final result if accepted, None if cancelled.
         """
-        import tkinter as tk
-        from tkinter import scrolledtext
-        from PIL import ImageTk
-
         from .ui.pinned_window import PinnedWindow
 
-        final_result = [None]  # Use list to allow modification in nested function
-
-        # Create main window
-        root = tk.Tk()
-        root.title("SnapOCR Result")
-        root.attributes('-topmost', True)
-        root.configure(bg='#2D2D2D')
+        dialog = self.ui.result_dialog()
 
-        # Calculate window position
+        # Calculate window position relative to the captured screen area
+        ox, oy = screen_origin
         sx, sy, sw, sh = rect
+        sx, sy = sx - ox, sy - oy
         screen_w, screen_h = screen_bounds
         GAP = 10
 
         # Panel size
-        panel_width = 350
-        panel_height = 200
+        panel_width = dialog.WIDTH
 
         # Calculate position (try right first, then left, then below)
         if sx + sw + GAP + panel_width <= screen_w:
@@ -251,118 +654,30 @@ class SnapOCR:
             panel_x = sx
             panel_y = sy + sh + GAP
 
-        root.geometry(f"{panel_width}x{panel_height}+{panel_x}+{panel_y}")
-
-        # Create border frame
-        border_frame = tk.Frame(root, bg='#00BFFF', padx=2, pady=2)
-        border_frame.pack(fill=tk.BOTH, expand=True)
-
-        # Main content frame
-        content_frame = tk.Frame(border_frame, bg='#2D2D2D')
-        content_frame.pack(fill=tk.BOTH, expand=True, padx=2, pady=2)
-
-        # Text display area
-        text_widget = scrolledtext.ScrolledText(
-            content_frame,
-            wrap=tk.WORD,
-            font=('Arial', 11),
-            bg='#1E1E1E',
-            fg='#FFFFFF',
-            insertbackground='#FFFFFF',
-            selectbackground='#00BFFF',
-            relief=tk.FLAT,
-            padx=10,
-            pady=10
-        )
-        text_widget.pack(fill=tk.BOTH, expand=True)
-        text_widget.insert(tk.END, result)
-        text_widget.config(state=tk.DISABLED)
-
-        # Button frame
-        button_frame = tk.Frame(content_frame, bg='#2D2D2D')
-        button_frame.pack(fill=tk.X, padx=10, pady=10)
-
         def on_pin():
             """Handle Pin button - create a floating window."""
+            x, y = dialog.position
             pinned = PinnedWindow()
             pinned.show(
                 image=captured_image,
                 text=text,
                 latex=latex,
-                x=root.winfo_x() + 50,
-                y=root.winfo_y() + 50,
-                on_copy=lambda: self._clipboard_manager.copy(result)
+                x=x + 50,
+                y=y + 50,
+                on_copy=lambda: self._clipboard_manager.copy(result, latex=latex)
             )
             if show_result:
                 print("Screenshot pinned to floating window.")
 
         def on_accept():
-            """Handle Accept button - copy and close."""
-            self._clipboard_manager.copy(result)
-            final_result[0] = result
+            """Handle Accept button - copy to clipboard."""
+            with span('clipboard_copy'):
+                self._clipboard_manager.copy(result, latex=latex)
             if show_result:
                 print(f"Text copied to clipboard ({len(result)} characters)")
-            root.destroy()
-
-        def on_cancel():
-            """Handle Cancel button - just close."""
-            root.destroy()
-
-        # Pin button
-        pin_btn = tk.Button(
-            button_frame,
-            text="Pin",
-            command=on_pin,
-            bg='#1565C0',
-            fg='#FFFFFF',
-            activebackground='#1976D2',
-            activeforeground='#FFFFFF',
-            relief=tk.FLAT,
-            padx=15,
-            font=('Arial', 10, 'bold')
-        )
-        pin_btn.pack(side=tk.LEFT, padx=5)
-
-        # Accept button
-        accept_btn = tk.Button(
-            button_frame,
-            text="Accept",
-            command=on_accept,
-            bg='#2E7D32',
-            fg='#FFFFFF',
-            activebackground='#388E3C',
-            activeforeground='#FFFFFF',
-            relief=tk.FLAT,
-            padx=15,
-            font=('Arial', 10, 'bold')
-        )
-        accept_btn.pack(side=tk.LEFT, padx=5)
-
-        # Cancel button
-        cancel_btn = tk.Button(
-            button_frame,
-            text="Cancel",
-            command=on_cancel,
-            bg='#C62828',
-            fg='#FFFFFF',
-            activebackground='#D32F2F',
-            activeforeground='#FFFFFF',
-            relief=tk.FLAT,
-            padx=15,
-            font=('Arial', 10, 'bold')
-        )
-        cancel_btn.pack(side=tk.LEFT, padx=5)
 
-        # Bind escape for cancel
-        root.bind('<Escape>', lambda e: on_cancel())
-
-        # Focus on window
-        root.focus_set()
-
-        # Run the UI
-        root.mainloop()
-
-        return final_result[0]
+        accepted = dialog.show(result, panel_x + ox, panel_y + oy, on_pin=on_pin, on_accept=on_accept)
+        return result if accepted else None
 
     def run_once(self) -> Optional[str]:
         """Run a single capture and extraction."""
@@ -389,6 +704,23 @@ Examples:
   snapocr --ui               Capture with interactive UI (Pin/Accept/Cancel)
   snapocr --latex            Enable LaTeX conversion for math
   snapocr --lang eng         Use English only OCR
+  snapocr --trace            Print per-stage timings and write a Chrome trace
+  snapocr bench              Run the OCR benchmark on a synthetic corpus
+  snapocr capture-bench      Time capture backends and remember the fastest
+  snapocr daemon             Stay resident; later invocations are served warm
+  snapocr grab --rect 10,20,300,40 --save-preset status
+                             OCR a fixed rectangle (no overlay) and save it as a preset
+  snapocr grab -p status     OCR a saved preset
+  snapocr watch -p status    Print line changes in a region as JSON lines
+  snapocr scroll             Select a region, then scroll it; OCR everything that passes by
+  snapocr watch-dir          OCR every screenshot saved to the watched folder (.txt/.json next to it)
+  snapocr batch ~/scans      OCR a folder of images; re-runs only do new or changed files
+  snapocr batch scan.tiff -f txt,hocr,pdf
+                             OCR a multi-page TIFF page by page into text, hOCR and a searchable PDF
+  cat *.png | snapocr stream  OCR images piped to stdin; one JSON line per image
+  snapocr --ago 5            Select from the screen as it was 5 seconds ago (daemon)
+  snapocr --from-clipboard   OCR the image on the clipboard and copy back its text
+  snapocr --watch-clipboard  Replace every image copied to the clipboard with its text
 
 Config file location:
   macOS:   ~/Library/Application Support/SnapOCR/config.json
@@ -427,24 +759,336 @@ Config file location:
         help='Path to config file'
     )
 
+    parser.add_argument(
+        '--trace',
+        action='store_true',
+        help='Record per-stage timings and print a summary per capture'
+    )
+
+    parser.add_argument(
+        '--trace-file',
+        type=str,
+        metavar='PATH',
+        help='Chrome trace JSON output path (default: snapocr_trace.json in temp dir)'
+    )
+
+    parser.add_argument(
+        '--ago',
+        type=float,
+        metavar='SECONDS',
+        help='Select from the screen as it was SECONDS ago (daemon with frame buffer only)'
+    )
+
+    parser.add_argument(
+        '--from-clipboard',
+        action='store_true',
+        help='OCR the image on the clipboard instead of selecting a region'
+    )
+
+    parser.add_argument(
+        '--watch-clipboard',
+        action='store_true',
+        help='Keep running and replace each image copied to the clipboard with its text'
+    )
+
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Capture in this process even if a SnapOCR daemon is running'
+    )
+
+    parser.add_argument(
+        '--startup-report',
+        action='store_true',
+        help='Print a cold-import time breakdown and exit (1 if over budget)'
+    )
+
     parser.add_argument(
         '--version', '-v',
         action='version',
         version='%(prog)s 2.0.0'
     )
 
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+
+    bench_parser = subparsers.add_parser(
+        'bench',
+        help='Benchmark OCR latency and accuracy on a synthetic corpus'
+    )
+    bench_parser.add_argument(
+        '--profile', '-p',
+        action='append',
+        dest='profiles',
+        help='Profile to run (repeatable; default: all)'
+    )
+    bench_parser.add_argument('--seed', type=int, default=0, help='Corpus seed (default: 0)')
+    bench_parser.add_argument('--samples', type=int, default=6, help='Samples per kind (default: 6)')
+    bench_parser.add_argument('--repeat', type=int, default=1, help='Timed runs per sample (default: 1)')
+    bench_parser.add_argument(
+        '--output', '-o',
+        type=str,
+        default='snapocr_bench.json',
+        help='Result JSON path (default: snapocr_bench.json)'
+    )
+    bench_parser.add_argument('--save-corpus', type=str, metavar='DIR', help='Also write the corpus to DIR')
+    bench_parser.add_argument('--baseline', type=str, metavar='PATH', help='Fail on regression against this result')
+    bench_parser.add_argument(
+        '--max-latency-regression',
+        type=float,
+        help='Allowed relative p95 latency increase (default: 0.25)'
+    )
+    bench_parser.add_argument('--max-cer-increase', type=float, help='Allowed CER increase (default: 0.02)')
+    bench_parser.add_argument(
+        '--max-latex-drop',
+        type=float,
+        help='Allowed LaTeX exact-match decrease (default: 0.05)'
+    )
+
+    capture_bench_parser = subparsers.add_parser(
+        'capture-bench',
+        help='Time each screen capture backend and remember the fastest'
+    )
+    capture_bench_parser.add_argument(
+        '--backend', '-b',
+        action='append',
+        dest='backends',
+        help='Backend to run (repeatable; default: all available)'
+    )
+    capture_bench_parser.add_argument(
+        '--iterations', '-n',
+        type=int,
+        default=10,
+        help='Timed grabs per measurement (default: 10)'
+    )
+    capture_bench_parser.add_argument(
+        '--no-save',
+        action='store_true',
+        help='Do not store the fastest backend in the config file'
+    )
+
+    subparsers.add_parser(
+        'daemon',
+        help='Run resident and serve captures from a warm process'
+    )
+
+    grab_parser = subparsers.add_parser(
+        'grab',
+        help='OCR a fixed screen rectangle or saved preset without the overlay'
+    )
+    grab_target = grab_parser.add_mutually_exclusive_group()
+    grab_target.add_argument('--rect', '-r', type=str, metavar='X,Y,W,H', help='Rectangle in screen coordinates')
+    grab_target.add_argument('--preset', '-p', type=str, metavar='NAME', help='Saved preset to grab')
+    grab_target.add_argument('--list-presets', action='store_true', help='List saved presets and exit')
+    grab_target.add_argument('--delete-preset', type=str, metavar='NAME', help='Delete a saved preset and exit')
+    grab_parser.add_argument('--save-preset', type=str, metavar='NAME', help='Also save the rectangle (--rect or --preset) under NAME')
+    grab_parser.add_argument('--no-copy', action='store_true', help='Print the text without copying it')
+
+    watch_parser = subparsers.add_parser(
+        'watch',
+        help='Watch a screen rectangle and print line changes as JSON lines'
+    )
+    watch_target = watch_parser.add_mutually_exclusive_group(required=True)
+    watch_target.add_argument('--rect', '-r', type=str, metavar='X,Y,W,H', help='Rectangle in screen coordinates')
+    watch_target.add_argument('--preset', '-p', type=str, metavar='NAME', help='Saved preset to watch')
+    watch_parser.add_argument(
+        '--interval', '-i',
+        type=float,
+        default=0.5,
+        help='Seconds between grabs (default: 0.5)'
+    )
+    watch_parser.add_argument(
+        '--socket',
+        type=str,
+        metavar='ADDRESS',
+        help='Send events to clients of this Unix socket path (or localhost TCP port) instead of stdout'
+    )
+
+    scroll_parser = subparsers.add_parser(
+        'scroll',
+        help='OCR a region while you scroll it (content taller than the screen)'
+    )
+    scroll_target = scroll_parser.add_mutually_exclusive_group()
+    scroll_target.add_argument('--rect', '-r', type=str, metavar='X,Y,W,H', help='Rectangle in screen coordinates')
+    scroll_target.add_argument('--preset', '-p', type=str, metavar='NAME', help='Saved preset to follow')
+    scroll_parser.add_argument(
+        '--interval', '-i',
+        type=float,
+        default=0.15,
+        help='Seconds between grabs (default: 0.15)'
+    )
+    scroll_parser.add_argument(
+        '--idle',
+        type=float,
+        default=3.0,
+        help='Stop after this many seconds without scrolling; 0 waits for Ctrl+C (default: 3)'
+    )
+    scroll_parser.add_argument('--save-strips', type=str, metavar='DIR', help='Write the stitched strips as PNGs to DIR')
+    scroll_parser.add_argument('--no-copy', action='store_true', help='Print the text without copying it')
+
+    watch_dir_parser = subparsers.add_parser(
+        'watch-dir',
+        help='OCR images as they are saved to a folder, writing .txt/.json results next to them'
+    )
+    watch_dir_parser.add_argument(
+        'directory',
+        nargs='?',
+        help='Folder to watch (default: watch_dir from the config, ~/Pictures/Screenshots)'
+    )
+    watch_dir_parser.add_argument('--workers', '-w', type=int, default=2, help='Images recognized in parallel (default: 2)')
+    watch_dir_parser.add_argument(
+        '--settle',
+        type=float,
+        default=1.0,
+        help='Seconds a new file must stay unchanged before it is read (default: 1)'
+    )
+    watch_dir_parser.add_argument('--existing', action='store_true', help='Also OCR images already in the folder without results')
+    watch_dir_parser.add_argument('--output-dir', '-o', type=str, metavar='DIR', help='Write results to DIR instead')
+
+    batch_parser = subparsers.add_parser(
+        'batch',
+        help='OCR image files and folders, resuming and skipping work recorded in a manifest'
+    )
+    batch_parser.add_argument('inputs', nargs='+', metavar='INPUT', help='Image files or folders')
+    batch_parser.add_argument('--output-dir', '-o', type=str, metavar='DIR', help='Write results to DIR instead of next to the images')
+    batch_parser.add_argument(
+        '--manifest', '-m',
+        type=str,
+        metavar='PATH',
+        help='Manifest file (default: snapocr_manifest.db in the output folder or the first input folder)'
+    )
+    batch_parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 2, help='Images recognized in parallel (default: CPU count)')
+    batch_parser.add_argument('--no-recursive', action='store_true', help='Do not descend into subfolders')
+    batch_parser.add_argument(
+        '--format', '-f',
+        type=str,
+        default='txt',
+        metavar='LIST',
+        help='Comma-separated outputs: txt, hocr, alto, tsv, pdf (default: txt)'
+    )
+    batch_parser.add_argument(
+        '--max-side',
+        type=int,
+        metavar='PIXELS',
+        help='Downscale larger images to this longest side before OCR, 0 to disable (default: batch_max_side from the config, 4000)'
+    )
+    batch_parser.add_argument('--prefetch', type=int, default=4, metavar='N', help='Images decoded ahead of the OCR (default: 4)')
+    batch_parser.add_argument(
+        '--columnar',
+        type=str,
+        metavar='PATH',
+        help='Also write the results of this run with word boxes to a Parquet file (.arrow/.feather: Arrow IPC); needs pyarrow'
+    )
+    batch_parser.add_argument(
+        '--row-group-size',
+        type=int,
+        default=10000,
+        metavar='ROWS',
+        help='Rows per Parquet row group / Arrow record batch (default: 10000)'
+    )
+
+    stream_parser = subparsers.add_parser(
+        'stream',
+        help='OCR a stream of images from stdin and print one JSON line per image'
+    )
+    stream_parser.add_argument(
+        '--framing',
+        choices=['auto', 'png', 'length'],
+        default='auto',
+        help='Concatenated PNGs, or images prefixed with a 4-byte big-endian size (default: auto)'
+    )
+    stream_parser.add_argument('--workers', '-w', type=int, default=2, help='Images recognized in parallel (default: 2)')
+    stream_parser.add_argument('--ordered', action='store_true', help='Print results in input order')
+
     args = parser.parse_args()
 
+    if args.startup_report:
+        from .core.startup import startup_report
+        report, within_budget = startup_report()
+        print(report)
+        return 0 if within_budget else 1
+
+    traced = bool(args.trace or args.trace_file)
+    if traced:
+        get_tracer().enable()
+    try:
+        return _run_command(args)
+    finally:
+        # Every command's spans end up in the trace, however it exits
+        if traced:
+            trace_path = args.trace_file or os.path.join(
+                tempfile.gettempdir(), 'snapocr_trace.json'
+            )
+            if get_tracer().export_chrome_trace(trace_path):
+                print(f"Trace written to {trace_path}", file=sys.stderr)
+
+
+def _run_command(args) -> int:
+    """Run the command selected on the command line."""
+    tracer = get_tracer()
+
     # Load config
     config = Config(args.config) if args.config else Config()
 
-    # Apply command line overrides
-    if args.lang:
-        config.language = args.lang
-    if args.latex:
-        config.latex_conversion = True
-    if args.no_latex:
-        config.latex_conversion = False
+    if args.command == 'bench':
+        return _run_bench(args, config)
+
+    if args.command == 'capture-bench':
+        return _run_capture_bench(args, config)
+
+    # Apply command line overrides (in memory only, never saved)
+    overrides = {
+        'language': args.lang,
+        'latex_conversion': True if args.latex else False if args.no_latex else None,
+    }
+    config.override(overrides)
+
+    if args.command == 'daemon':
+        from .daemon import SnapOCRDaemon
+        try:
+            SnapOCRDaemon(config).serve_forever()
+        except (RuntimeError, OSError) as e:
+            print(f"Error: {e}")
+            return 1
+        return 0
+
+    if args.command == 'grab':
+        return _run_grab(args, config, overrides, tracer.enabled)
+
+    if args.command == 'watch':
+        return _run_watch(args, config)
+
+    if args.command == 'scroll':
+        return _run_scroll(args, config)
+
+    if args.command == 'batch':
+        return _run_batch(args, config)
+
+    if args.command == 'stream':
+        return _run_stream(args, config)
+
+    if args.command == 'watch-dir':
+        return _run_watch_dir(args, config)
+
+    if args.from_clipboard or args.watch_clipboard:
+        return _run_clipboard(args, config)
+
+    # Forward to a running daemon unless this invocation needs its own process
+    if not (args.no_daemon or args.config or tracer.enabled):
+        from .daemon import send_command
+        import time
+        reply = send_command('capture', ui=args.ui, overrides=overrides, ago=args.ago, sent_at=time.time())
+        if reply is not None:
+            if reply.get('error'):
+                print(f"Error: {reply['error']}")
+            elif reply.get('queued') and reply.get('job'):
+                print(f"Capture {reply['job']} queued; its text will be copied to the clipboard")
+            elif reply.get('result'):
+                print(f"Text copied to clipboard ({len(reply['result'])} characters)")
+            return 0 if reply.get('ok') else 1
+
+    if args.ago:
+        print("Error: --ago needs a running daemon with frame_buffer_frames > 0")
+        return 1
 
     # Create app instance and run
     app = SnapOCR(config)
@@ -460,5 +1104,483 @@ Config file location:
     return 0
 
 
+def _run_bench(args, config: Config) -> int:
+    """Run the benchmark subcommand."""
+    from .bench import PROFILES, compare_results, format_report, load_result, run_benchmark, save_result
+
+    unknown = [name for name in args.profiles or [] if name not in PROFILES]
+    if unknown:
+        print(f"Error: unknown profile(s): {', '.join(unknown)} (available: {', '.join(PROFILES)})")
+        return 2
+
+    result = run_benchmark(
+        profiles=args.profiles,
+        seed=args.seed,
+        per_kind=args.samples,
+        repeat=args.repeat,
+        tesseract_path=config.tesseract_path,
+        corpus_dir=args.save_corpus,
+    )
+    print(format_report(result))
+    save_result(result, args.output)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        thresholds = {}
+        if args.max_latency_regression is not None:
+            thresholds['latency_p95'] = args.max_latency_regression
+        if args.max_cer_increase is not None:
+            thresholds['cer'] = args.max_cer_increase
+        if args.max_latex_drop is not None:
+            thresholds['latex_exact'] = args.max_latex_drop
+
+        regressions = compare_results(result, load_result(args.baseline), thresholds)
+        if regressions:
+            print("Regressions detected:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against baseline.")
+
+    return 0
+
+
+def _run_grab(args, config: Config, overrides: dict, local_only: bool) -> int:
+    """Run the grab subcommand."""
+    from .platform.monitors import parse_rect
+
+    if args.save_preset and (args.list_presets or args.delete_preset):
+        print("Error: --save-preset needs --rect or --preset")
+        return 1
+
+    if args.list_presets:
+        for name, (x, y, w, h) in sorted(config.get_presets().items()):
+            print(f"{name}: {x},{y},{w},{h}")
+        return 0
+
+    if args.delete_preset:
+        if not config.remove_preset(args.delete_preset, save=False):
+            print(f"Error: No preset named '{args.delete_preset}'")
+            return 1
+        return 0 if config.save(immediate=True) else 1
+
+    if args.rect:
+        try:
+            rect = parse_rect(args.rect)
+        except ValueError as e:
+            print(f"Error: Invalid --rect: {e}")
+            return 1
+    elif args.preset:
+        rect = config.get_preset(args.preset)
+        if rect is None:
+            print(f"Error: No preset named '{args.preset}' (see snapocr grab --list-presets)")
+            return 1
+    else:
+        print("Error: grab needs --rect or --preset")
+        return 1
+
+    # With --preset this copies the preset under the new name
+    if args.save_preset:
+        config.set_preset(args.save_preset, rect, save=False)
+        if not config.save(immediate=True):
+            return 1
+        print(f"Preset '{args.save_preset}' saved")
+
+    # Forward to a running daemon (warm OCR) unless this invocation needs its own process
+    if not (args.no_daemon or args.config or local_only):
+        from .daemon import send_command
+        reply = send_command('grab', rect=list(rect), copy=not args.no_copy, overrides=overrides)
+        if reply is not None:
+            if reply.get('error'):
+                print(f"Error: {reply['error']}")
+            elif reply.get('result'):
+                print(reply['result'])
+            return 0 if reply.get('ok') else 1
+
+    result = SnapOCR(config).grab_and_extract(rect, copy=not args.no_copy, show_result=False)
+    if result is None:
+        return 1
+    print(result)
+    return 0
+
+
+def _run_watch(args, config: Config) -> int:
+    """Run the watch subcommand."""
+    from .core.region_watch import RegionWatcher, SocketSink, StreamSink
+    from .platform.capture_backends import create_backend
+    from .platform.monitors import parse_rect
+
+    if args.rect:
+        try:
+            rect = parse_rect(args.rect)
+        except ValueError as e:
+            print(f"Error: Invalid --rect: {e}")
+            return 1
+    else:
+        rect = config.get_preset(args.preset)
+        if rect is None:
+            print(f"Error: No preset named '{args.preset}' (see snapocr grab --list-presets)")
+            return 1
+
+    backend = create_backend(config.get('capture_backend', 'auto'))
+    if backend is None:
+        print("Error: No screen capture backend available")
+        return 1
+
+    try:
+        sink = SocketSink(args.socket) if args.socket else StreamSink(sys.stdout)
+    except OSError as e:
+        print(f"Error: Could not listen on {args.socket}: {e}")
+        backend.close()
+        return 1
+
+    x, y, w, h = rect
+    monitor = {'left': x, 'top': y, 'width': w, 'height': h}
+    watcher = RegionWatcher(
+        grab=lambda: backend.grab_image(monitor),
+        emit=sink,
+        language=config.language,
+        tesseract_path=config.tesseract_path,
+        interval=args.interval
+    )
+    print(f"Watching {x},{y},{w},{h} every {args.interval:g} s (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.close()
+        backend.close()
+    return 0
+
+
+def _run_scroll(args, config: Config) -> int:
+    """Run the scroll subcommand."""
+    from .platform.monitors import parse_rect
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("Error: Scrolling capture needs NumPy. Install with: pip install numpy")
+        return 1
+
+    rect = None
+    if args.rect:
+        try:
+            rect = parse_rect(args.rect)
+        except ValueError as e:
+            print(f"Error: Invalid --rect: {e}")
+            return 1
+    elif args.preset:
+        rect = config.get_preset(args.preset)
+        if rect is None:
+            print(f"Error: No preset named '{args.preset}' (see snapocr grab --list-presets)")
+            return 1
+
+    if args.save_strips:
+        os.makedirs(args.save_strips, exist_ok=True)
+
+    def print_line(line: str) -> None:
+        print(line, flush=True)
+
+    if args.idle:
+        print(f"Scroll through the content; stops after {args.idle:g} s without scrolling", file=sys.stderr)
+    else:
+        print("Scroll through the content; press Ctrl+C when done", file=sys.stderr)
+    result = SnapOCR(config).scroll_and_extract(
+        rect,
+        interval=args.interval,
+        idle_timeout=args.idle,
+        strip_dir=args.save_strips,
+        copy=not args.no_copy,
+        on_line=print_line
+    )
+    if result is None:
+        return 1
+    if not args.no_copy:
+        print(f"Text copied to clipboard ({len(result)} characters)", file=sys.stderr)
+    return 0
+
+
+def _run_watch_dir(args, config: Config) -> int:
+    """Run the watch-dir subcommand."""
+    from .core.dir_watch import DirectoryService
+
+    directory = os.path.expanduser(args.directory or config.get('watch_dir') or '~/Pictures/Screenshots')
+    if not os.path.isdir(directory):
+        print(f"Error: Not a directory: {directory}")
+        return 1
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    def recognize(path: str) -> tuple:
+        text, latex = extract_text(
+            path,
+            language=config.language,
+            tesseract_path=config.tesseract_path,
+            latex_mode=config.latex_conversion,
+            auto_detect_math=True
+        )
+        return format_result(text, latex), latex
+
+    service = DirectoryService(
+        directory,
+        recognize,
+        queue_path=os.path.join(os.path.dirname(config.config_path), 'watch_queue.db'),
+        workers=args.workers,
+        settle=args.settle,
+        output_dir=args.output_dir,
+        include_existing=args.existing,
+        details={'language': config.language}
+    )
+    print(f"Watching {directory} (Ctrl+C to stop)")
+    try:
+        service.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _tesseract_version(config: Config) -> Optional[str]:
+    """Check that Tesseract runs and get its version, printing an error if it does not."""
+    from .core.ocr import _get_pytesseract, setup_tesseract
+
+    pytesseract = _get_pytesseract()
+    if pytesseract is None:
+        print("Error: pytesseract is not installed. Install with: pip install pytesseract", file=sys.stderr)
+        return None
+    setup_tesseract()
+    if config.tesseract_path:
+        pytesseract.pytesseract.tesseract_cmd = config.tesseract_path
+    try:
+        return str(pytesseract.get_tesseract_version())
+    except Exception as e:
+        print(f"Error: Tesseract is not available: {e}", file=sys.stderr)
+        return None
+
+
+def _run_batch(args, config: Config) -> int:
+    """Run the batch subcommand."""
+    from concurrent.futures import ThreadPoolExecutor
+    from .core.batch import MANIFEST_NAME, BatchRunner, Manifest, input_root, iter_images
+    from .core.dir_watch import sidecar_paths
+    from .core.documents import FORMATS, page_count, parse_formats, recognize_document, recognize_words
+    from .core.image_loader import load_image
+    from .core.ocr import extract_text_batch
+
+    try:
+        formats = parse_formats(args.format)
+    except ValueError as e:
+        print(f"Error: Invalid --format: {e}")
+        return 2
+
+    # A missing Tesseract would otherwise be recorded as empty results
+    version = _tesseract_version(config)
+    if version is None:
+        return 1
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    manifest_path = args.manifest
+    if not manifest_path:
+        first = os.path.abspath(os.path.expanduser(args.inputs[0]))
+        folder = args.output_dir or (first if os.path.isdir(first) else os.path.dirname(first))
+        manifest_path = os.path.join(folder, MANIFEST_NAME)
+
+    columnar = None
+    if args.columnar:
+        from .core.columnar import ColumnarWriter
+        try:
+            columnar = ColumnarWriter(args.columnar, args.row_group_size)
+        except (ImportError, OSError) as e:
+            print(f"Error: {e}")
+            return 1
+    # Word boxes for the columnar output come from the same Tesseract run as the text
+    with_words = columnar is not None
+
+    workers = max(1, args.workers)
+    # Pages of multi-page files are recognized on their own pool, shared by all files
+    page_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='snapocr-page')
+    structured = formats != ['txt']
+    # Structured outputs and word boxes keep the coordinates of the original images
+    max_side = 0 if structured or with_words else args.max_side if args.max_side is not None else config.get('batch_max_side', 4000)
+
+    # Results mirror the input folders, so equal names in different folders stay apart
+    root = input_root(args.inputs) if args.output_dir else None
+
+    def recognize(source) -> tuple:
+        if isinstance(source, str) and (structured or page_count(source) > 1):
+            output_base = os.path.splitext(sidecar_paths(source, args.output_dir, root)[0])[0]
+            os.makedirs(os.path.dirname(output_base), exist_ok=True)
+            result = recognize_document(
+                source,
+                output_base,
+                formats,
+                language=config.language,
+                tesseract_path=config.tesseract_path,
+                latex_mode=config.latex_conversion,
+                executor=page_pool,
+                window=workers * 2,
+                with_words=with_words
+            )
+        elif with_words:
+            result = recognize_words(
+                source,
+                language=config.language,
+                tesseract_path=config.tesseract_path,
+                latex_mode=config.latex_conversion
+            )
+        else:
+            # A failure must not be recorded as an empty result
+            result = extract_text(
+                source,
+                language=config.language,
+                tesseract_path=config.tesseract_path,
+                latex_mode=config.latex_conversion,
+                auto_detect_math=True,
+                raise_errors=True
+            )
+        # The words, if any, follow the text and LaTeX
+        return (format_result(*result[:2]), *result[1:])
+
+    def recognize_many(paths: list) -> list:
+        # Multi-page files are read page by page, the rest in one list-file run
+        single = [path for path in paths if page_count(path) == 1]
+        results = dict(zip(single, extract_text_batch(
+            single,
+            language=config.language,
+            tesseract_path=config.tesseract_path,
+            latex_mode=config.latex_conversion,
+            auto_detect_math=True,
+            with_words=with_words
+        ))) if single else {}
+        return [
+            (format_result(*results[path][:2]), *results[path][1:]) if path in results else recognize(path)
+            for path in paths
+        ]
+
+    def record(path: str, digest: str, result: tuple, ocr_seconds: float) -> None:
+        text, latex, words = result
+        columnar.add(path, digest, text, latex, words, ocr_seconds)
+
+    params = {
+        'language': config.language,
+        'latex_conversion': config.latex_conversion,
+        'tesseract': version,
+        'max_side': max_side,
+    }
+    manifest = Manifest(manifest_path)
+    runner = BatchRunner(
+        recognize,
+        manifest,
+        params,
+        workers=workers,
+        output_dir=args.output_dir,
+        recognize_many=None if structured else recognize_many,
+        extra_outputs=[FORMATS[name][1] for name in formats if name != 'txt'],
+        load=None if structured else lambda path: load_image(path, max_side),
+        prefetch=args.prefetch,
+        on_result=record if columnar is not None else None,
+        words=with_words,
+        root=root
+    )
+    try:
+        stats = runner.run(iter_images(args.inputs, recursive=not args.no_recursive))
+    except KeyboardInterrupt:
+        stats = runner.stats
+        print("Interrupted; finished results are kept in the manifest and a re-run resumes from there")
+    finally:
+        page_pool.shutdown(wait=False, cancel_futures=True)
+        manifest.close()
+        if columnar is not None:
+            columnar.close()
+            print(f"{columnar.rows} rows written to {args.columnar}")
+    print(stats.summary())
+    return 1 if stats.failed else 0
+
+
+def _run_stream(args, config: Config) -> int:
+    """Run the stream subcommand."""
+    from .core.ocr import get_available_languages, resolve_language
+    from .core.region_watch import StreamSink
+    from .core.stream_filter import StreamFilter, read_frames
+
+    def recognize(image) -> tuple:
+        text, latex = extract_text(
+            image,
+            language=config.language,
+            tesseract_path=config.tesseract_path,
+            latex_mode=config.latex_conversion,
+            auto_detect_math=True
+        )
+        return format_result(text, latex), latex
+
+    # Find Tesseract and its languages once, before the first frame
+    if _tesseract_version(config) is None:
+        return 1
+    try:
+        resolve_language(get_available_languages())
+    except Exception as e:
+        print(f"Could not get available languages: {e}", file=sys.stderr)
+    # stdout carries only the results; diagnostics go to stderr
+    stream_filter = StreamFilter(recognize, StreamSink(sys.stdout), workers=args.workers, ordered=args.ordered)
+    try:
+        stream_filter.run(read_frames(sys.stdin.buffer, args.framing))
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); keep the exit-time flush from failing too
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    print(f"{stream_filter.frames} images, {stream_filter.failed} failed", file=sys.stderr)
+    return 1 if stream_filter.failed else 0
+
+
+def _run_clipboard(args, config: Config) -> int:
+    """Run --from-clipboard or --watch-clipboard."""
+    app = SnapOCR(config)
+
+    if args.watch_clipboard:
+        def report(text: str) -> None:
+            print(f"Replaced clipboard image with text ({len(text)} characters)")
+
+        print("Watching the clipboard for images (Ctrl+C to stop)")
+        app.watch_clipboard(on_text=report)
+        return 0
+
+    result = app.extract_from_clipboard(show_result=False)
+    if result is None:
+        return 1
+    print(result)
+    return 0
+
+
+def _run_capture_bench(args, config: Config) -> int:
+    """Run the capture-bench subcommand."""
+    from .bench import format_capture_report, run_capture_bench
+    from .platform.capture_backends import get_backend_names
+
+    unknown = [name for name in args.backends or [] if name not in get_backend_names()]
+    if unknown:
+        print(f"Error: unknown backend(s): {', '.join(unknown)} (available: {', '.join(get_backend_names())})")
+        return 2
+
+    result = run_capture_bench(backends=args.backends, iterations=args.iterations)
+    print(format_capture_report(result))
+
+    fastest = result['fastest']
+    if fastest is None:
+        return 1
+    if not args.no_save:
+        config.set('capture_backend', fastest, save=False)
+        config.save(immediate=True)
+        print(f"Saved capture_backend={fastest} to {config.config_path}")
+    return 0
+
+
 if __name__ == '__main__':
     sys.exit(main())
+
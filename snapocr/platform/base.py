@@ -2,9 +2,10 @@
 Abstract base classes for platform-specific implementations.
 """
 
+import os
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Optional, Tuple, Any
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
 
 
 @dataclass
@@ -13,14 +14,110 @@ class SelectionResult:
 
     image_path: str                              # Path to the captured image file
     rect: Tuple[int, int, int, int]              # (x, y, width, height) of selection
-    screen_image: Optional[Any] = None           # PIL Image of full screen (for overlay)
-    screen_width: int = 0                        # Full screen width
-    screen_height: int = 0                       # Full screen height
+    screen_image: Optional[Any] = None           # PIL Image of captured screen area (for overlay)
+    screen_width: int = 0                        # Captured screen area width
+    screen_height: int = 0                       # Captured screen area height
+    screen_origin: Tuple[int, int] = (0, 0)      # Top-left of the captured screen area
+    regions: List['SelectionResult'] = field(default_factory=list)  # Further regions (shift-drag)
+    image: Optional[Any] = None                  # PIL Image of the selection, if kept in memory
+
+    @property
+    def all_regions(self) -> List['SelectionResult']:
+        """This region followed by the further regions, in selection order."""
+        return [self] + self.regions
+
+
+def region_path(path: str, index: int) -> str:
+    """
+    Get the image path of the ``index``-th region of a multi-region selection.
+
+    Args:
+        path: Image path of the first region.
+        index: Region index (0 is the first region).
+
+    Returns:
+        ``path`` for the first region, ``<name>_<index><ext>`` for the others.
+    """
+    if index == 0:
+        return path
+    base, ext = os.path.splitext(path)
+    return f"{base}_{index}{ext}"
+
+
+def remove_selection_files(selection_result: SelectionResult) -> None:
+    """Delete the image files of a selection and all its regions."""
+    for region in selection_result.all_regions:
+        try:
+            if region.image_path and os.path.exists(region.image_path):
+                os.remove(region.image_path)
+        except OSError:
+            pass
 
 
 class BaseScreenshotCapture(ABC):
     """Abstract base class for screenshot capture functionality."""
 
+    # Optional source of buffered frames (FrameRingBuffer in daemon mode).
+    # When it has a current frame, region selection opens on it instead of grabbing.
+    frame_source = None
+
+    # Optional callable(screen_img, monitor, pointer) invoked with the frozen
+    # screenshot before the overlay opens, e.g. to start background OCR.
+    screen_listener = None
+
+    # Optional UISession whose hidden Tk root and pre-built overlay window
+    # are reused for every selection.
+    ui_session = None
+
+    # Whether region selection writes the regions to the temp path. Captures
+    # queued for background OCR only use the in-memory images.
+    save_files = True
+
+    def _buffered_frame(self):
+        """Get a snapshot of the frame source, or None to grab the live screen."""
+        return self.frame_source.snapshot() if self.frame_source is not None else None
+
+    def _notify_screen(self, screen_img, monitor, pointer) -> None:
+        """Pass the frozen screenshot to the screen listener, if any."""
+        if self.screen_listener is not None:
+            self.screen_listener(screen_img, monitor, pointer)
+
+    def _select_with_overlay(self, open_grabber=None) -> Optional[SelectionResult]:
+        """
+        Run the shared selection overlay on the frozen screenshot.
+
+        Args:
+            open_grabber: Optional callable returning the grabber for the
+                screenshot (capture backend or mss instance). Uses mss if not provided.
+
+        Returns:
+            SelectionResult, or None if cancelled or unavailable.
+        """
+        from ..ui.selection_overlay import SelectionOverlay
+
+        overlay = SelectionOverlay(self._capture_scope, frame_source=self.frame_source, ui=self.ui_session)
+        overlay.screen_listener = self.screen_listener
+        return overlay.select(
+            open_grabber=open_grabber, temp_path=self._get_temp_path(), save=self.save_files
+        )
+
+    def grab_rect(self, rect: Tuple[int, int, int, int]):
+        """
+        Grab a screen rectangle without any UI.
+
+        Args:
+            rect: (x, y, width, height) in virtual screen coordinates.
+
+        Returns:
+            PIL RGB image of the rectangle.
+        """
+        import mss
+        from .monitors import grab_image
+
+        x, y, w, h = rect
+        with mss.mss() as sct:
+            return grab_image(sct, {'left': x, 'top': y, 'width': w, 'height': h})
+
     @abstractmethod
     def select_region(self) -> Optional[SelectionResult]:
         """
@@ -56,12 +153,14 @@ class BaseClipboardManager(ABC):
     """Abstract base class for clipboard management."""
 
     @abstractmethod
-    def copy(self, text: str) -> bool:
+    def copy(self, text: str, latex: Optional[str] = None) -> bool:
         """
         Copy text to the system clipboard.
 
         Args:
             text: The text to copy.
+            latex: Optional LaTeX flavour, offered alongside the text where
+                the platform supports multiple clipboard formats.
 
         Returns:
             True if successful, False otherwise.
@@ -78,6 +177,37 @@ class BaseClipboardManager(ABC):
         """
         pass
 
+    def paste_image(self):
+        """
+        Get an image from the system clipboard, in memory.
+
+        Returns:
+            PIL Image, or None if the clipboard holds no image.
+        """
+        from PIL import Image, ImageGrab
+
+        content = ImageGrab.grabclipboard()
+        if isinstance(content, list):
+            # Copied files: use the first one that is an image
+            for path in content:
+                try:
+                    image = Image.open(path)
+                    image.load()
+                    return image
+                except OSError:
+                    continue
+            return None
+        return content
+
+    def change_count(self) -> Optional[int]:
+        """
+        Get a counter that changes whenever the clipboard contents change.
+
+        Returns:
+            The counter, or None if the platform has no cheap way to tell.
+        """
+        return None
+
 
 class PlatformManager:
     """
@@ -104,18 +234,30 @@ class PlatformManager:
         return cls._platform_name
 
     @classmethod
-    def get_screenshot_capture(cls) -> BaseScreenshotCapture:
-        """Get the platform-specific screenshot capture implementation."""
+    def get_screenshot_capture(
+        cls,
+        capture_scope: str = 'monitor',
+        capture_backend: str = 'auto'
+    ) -> BaseScreenshotCapture:
+        """
+        Get the platform-specific screenshot capture implementation.
+
+        Args:
+            capture_scope: 'monitor' to grab only the monitor under the
+                pointer, or 'all' for the whole virtual screen.
+            capture_backend: Capture backend name on Linux, or 'auto'.
+                macOS and Windows always capture with mss.
+        """
         platform = cls.get_platform()
         if platform == 'macos':
             from .macos import MacOSScreenshotCapture
-            return MacOSScreenshotCapture()
+            return MacOSScreenshotCapture(capture_scope)
         elif platform == 'windows':
             from .windows import WindowsScreenshotCapture
-            return WindowsScreenshotCapture()
+            return WindowsScreenshotCapture(capture_scope)
         elif platform == 'linux':
             from .linux import LinuxScreenshotCapture
-            return LinuxScreenshotCapture()
+            return LinuxScreenshotCapture(capture_scope, capture_backend)
 
     @classmethod
     def get_clipboard_manager(cls) -> BaseClipboardManager:
@@ -0,0 +1,257 @@
+"""
+Pluggable screen capture backends.
+
+Each backend grabs a screen rectangle into a PIL image. Backends are
+registered by name; ``snapocr capture-bench`` times every available one
+and stores the fastest in the ``capture_backend`` config key, so later
+runs create that backend directly without probing anything.
+
+Backends follow the part of the mss API used by ``monitors.py``
+(``monitors`` and ``with`` support) and add ``grab_image()``. Instances
+are long-lived: ``with`` blocks do not close them.
+"""
+
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional, Type
+
+from ..core.trace import span
+
+
+# Config value selecting the first available backend in registry order
+AUTO = 'auto'
+
+
+class CaptureBackend:
+    """Base class for capture backends."""
+
+    # Registry name
+    name = ''
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Check cheaply (no display connection, no subprocess) whether the backend can run."""
+        return True
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        """Monitor list in mss layout (index 0 is the combined virtual screen)."""
+        raise NotImplementedError
+
+    def grab_image(self, monitor: Dict[str, int]):
+        """
+        Grab a screen rectangle.
+
+        Args:
+            monitor: Dict with left/top/width/height in virtual screen coordinates.
+
+        Returns:
+            PIL RGB image.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
+
+    def __enter__(self) -> 'CaptureBackend':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass  # Kept open for the next grab
+
+
+class MssBackend(CaptureBackend):
+    """Capture with mss (XGetImage / GDI / CoreGraphics)."""
+
+    name = 'mss'
+
+    def __init__(self):
+        import mss
+        self._sct = mss.mss()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return importlib.util.find_spec('mss') is not None
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        return self._sct.monitors
+
+    def grab_image(self, monitor: Dict[str, int]):
+        from .monitors import shot_to_image
+        return shot_to_image(self._sct.grab(monitor))
+
+    def close(self) -> None:
+        self._sct.close()
+
+
+class ShmBackend(CaptureBackend):
+    """Capture with the X11 MIT-SHM extension into reused shared memory."""
+
+    name = 'xshm'
+
+    def __init__(self):
+        from .x11_shm import X11ShmGrabber
+        self._grabber = X11ShmGrabber()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return (sys.platform.startswith('linux') and bool(os.environ.get('DISPLAY'))
+                and importlib.util.find_spec('mss') is not None)
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        return self._grabber.monitors
+
+    def grab_image(self, monitor: Dict[str, int]):
+        return self._grabber.grab(monitor).to_image()
+
+    def close(self) -> None:
+        self._grabber.close()
+
+
+class CommandBackend(CaptureBackend):
+    """Capture by running a screenshot tool that writes a PNG file."""
+
+    # Executable looked up on PATH
+    tool = ''
+
+    def __init__(self):
+        self._monitors: Optional[List[Dict[str, int]]] = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return sys.platform.startswith('linux') and shutil.which(cls.tool) is not None
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        if self._monitors is None:
+            if importlib.util.find_spec('mss') is not None:
+                import mss
+                with mss.mss() as sct:
+                    self._monitors = [dict(m) for m in sct.monitors]
+            else:
+                # No monitor layout available: treat the root window as one monitor
+                import tkinter as tk
+                root = tk.Tk()
+                root.withdraw()
+                screen = {'left': 0, 'top': 0,
+                          'width': root.winfo_screenwidth(), 'height': root.winfo_screenheight()}
+                root.destroy()
+                self._monitors = [screen, dict(screen)]
+        return self._monitors
+
+    def command(self, monitor: Dict[str, int], path: str) -> List[str]:
+        """Build the command line grabbing ``monitor`` into ``path``."""
+        raise NotImplementedError
+
+    def grab_image(self, monitor: Dict[str, int]):
+        from PIL import Image
+
+        # A fresh file per grab: threads and other processes grab concurrently
+        fd, path = tempfile.mkstemp(prefix=f'snapocr_{self.name}_', suffix='.png')
+        os.close(fd)
+        try:
+            result = subprocess.run(self.command(monitor, path), capture_output=True)
+            if result.returncode != 0 or not os.path.getsize(path):
+                raise OSError(f"{self.tool} failed: {result.stderr.decode(errors='replace').strip()}")
+            img = Image.open(path)
+            img.load()
+            return img.convert('RGB')
+        finally:
+            os.remove(path)
+
+
+class ScrotBackend(CommandBackend):
+    """Capture with scrot."""
+
+    name = 'scrot'
+    tool = 'scrot'
+
+    def command(self, monitor: Dict[str, int], path: str) -> List[str]:
+        geometry = f"{monitor['left']},{monitor['top']},{monitor['width']},{monitor['height']}"
+        return ['scrot', '-o', '-z', '-a', geometry, path]
+
+
+class ImportBackend(CommandBackend):
+    """Capture with ImageMagick ``import``."""
+
+    name = 'import'
+    tool = 'import'
+
+    def command(self, monitor: Dict[str, int], path: str) -> List[str]:
+        geometry = f"{monitor['width']}x{monitor['height']}+{monitor['left']}+{monitor['top']}"
+        return ['import', '-silent', '-window', 'root', '-crop', geometry, '+repage', path]
+
+
+# Registered backends, in order of preference for AUTO
+_BACKENDS: Dict[str, Type[CaptureBackend]] = {}
+
+
+def register_backend(backend: Type[CaptureBackend]) -> None:
+    """
+    Register a capture backend class.
+
+    Args:
+        backend: CaptureBackend subclass with a unique ``name``.
+    """
+    _BACKENDS[backend.name] = backend
+
+
+for _backend in (ShmBackend, MssBackend, ScrotBackend, ImportBackend):
+    register_backend(_backend)
+
+
+def get_backend_names() -> List[str]:
+    """Get the names of all registered backends, in order of preference."""
+    return list(_BACKENDS)
+
+
+def available_backends() -> List[str]:
+    """Get the names of the registered backends that can run here."""
+    return [name for name, backend in _BACKENDS.items() if backend.is_available()]
+
+
+def create_backend(name: str = AUTO, fallback: bool = True) -> Optional[CaptureBackend]:
+    """
+    Create a capture backend.
+
+    A named backend is created directly, without an availability check.
+    If it fails (or for AUTO) the available backends are tried in order
+    of preference.
+
+    Args:
+        name: Backend name or AUTO.
+        fallback: Whether to try other backends if the named one fails.
+            Without fallback, the named backend's error is raised.
+
+    Returns:
+        Backend instance, or None if no backend works.
+
+    Raises:
+        KeyError: If ``fallback`` is False and the name is unknown.
+        Exception: If ``fallback`` is False and the backend fails to start.
+    """
+    if not fallback and name != AUTO:
+        with span('create_capture_backend', backend=name):
+            return _BACKENDS[name]()
+
+    candidates: List[Type[CaptureBackend]] = []
+    if name != AUTO:
+        if name in _BACKENDS:
+            candidates.append(_BACKENDS[name])
+        else:
+            print(f"Warning: Unknown capture backend '{name}', choosing automatically")
+    candidates.extend(_BACKENDS[n] for n in available_backends() if n != name)
+
+    for backend in candidates:
+        try:
+            with span('create_capture_backend', backend=backend.name):
+                return backend()
+        except Exception as e:
+            print(f"Warning: Capture backend '{backend.name}' unavailable: {e}")
+    return None
@@ -0,0 +1,304 @@
+"""
+Rolling buffer of recent screen frames for resident mode.
+
+A background thread grabs the whole virtual screen at a low rate into a
+ring of preallocated slots. A grab identical to the newest frame only
+refreshes its timestamp, so an idle screen costs no copies and keeps
+older frames in the ring. The selection overlay can then open on the
+newest frame without grabbing, or on the screen as it was N seconds ago.
+
+Memory use is fixed up front: ``frames`` slots of the virtual screen
+size times ``scale`` squared, three bytes per pixel.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from ..core.trace import span
+from .capture_backends import AUTO, create_backend
+
+
+@dataclass
+class BufferedFrame:
+    """Metadata of one slot in the ring."""
+
+    slot: int                    # Index of the slot holding the pixels
+    sequence: int                # Increases with every stored frame
+    captured_at: float           # time.time() when the content first appeared
+    last_seen: float             # time.time() of the latest identical grab
+
+
+class FrameSnapshot:
+    """
+    One buffered frame, usable in place of a capture backend.
+
+    Grabs are cropped from the buffered frame instead of the live screen.
+    """
+
+    def __init__(self, buffer: 'FrameRingBuffer', frame: BufferedFrame):
+        self._buffer = buffer
+        self.frame = frame
+        self.name = 'frame_buffer'
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        """Monitor layout when the buffer was allocated."""
+        return self._buffer.monitors
+
+    def grab_image(self, monitor: Dict[str, int]):
+        """Crop a rectangle (virtual screen coordinates) from the buffered frame."""
+        return self._buffer.crop(self.frame, monitor)
+
+    def __enter__(self) -> 'FrameSnapshot':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+class FrameRingBuffer:
+    """
+    Low-rate ring buffer of screen frames in preallocated memory.
+
+    Usage:
+        buffer = FrameRingBuffer(frames=10, interval=1.0)
+        buffer.start()
+        snapshot = buffer.snapshot()            # newest frame, or None
+        with buffer.pinned(5):                  # screen as it was 5 s ago
+            capture.select_region()
+        buffer.stop()
+    """
+
+    def __init__(
+        self,
+        frames: int,
+        interval: float = 1.0,
+        scale: float = 1.0,
+        capture_backend: str = AUTO
+    ):
+        """
+        Initialize the buffer. Memory is allocated when the thread starts.
+
+        Args:
+            frames: Number of slots in the ring.
+            interval: Seconds between grabs.
+            scale: Stored resolution relative to the screen (0 < scale <= 1).
+            capture_backend: Capture backend name, or 'auto'.
+        """
+        if frames < 1:
+            raise ValueError("frames must be at least 1")
+        if not 0 < scale <= 1:
+            raise ValueError("scale must be in (0, 1]")
+        self._frames = frames
+        self._interval = interval
+        self._scale = scale
+        self._backend_name = capture_backend
+
+        self._slots: List[bytearray] = []
+        self._size = (0, 0)          # Stored frame size
+        self._screen: Dict[str, int] = {}
+        self._monitors: List[Dict[str, int]] = []
+        self._ring: List[BufferedFrame] = []  # Oldest first
+        self._sequence = 0
+        self._pinned_ago: Optional[float] = None
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        """Monitor layout in mss format."""
+        return self._monitors
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes allocated for the slots."""
+        return sum(len(slot) for slot in self._slots)
+
+    def start(self) -> bool:
+        """
+        Start the grab thread.
+
+        Returns:
+            True once the slots are allocated, False if no capture backend works.
+        """
+        if self._thread is not None:
+            return True
+        self._stop.clear()
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name='snapocr-frame-buffer', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if not self._slots:
+            self._thread.join()
+            self._thread = None
+            return False
+        return True
+
+    def stop(self) -> None:
+        """Stop the grab thread. Buffered frames stay readable."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _allocate(self, screen: Dict[str, int]) -> None:
+        """Allocate the slots for the virtual screen size."""
+        width = max(1, int(screen['width'] * self._scale))
+        height = max(1, int(screen['height'] * self._scale))
+        with self._lock:
+            self._screen = dict(screen)
+            self._size = (width, height)
+            self._slots = [bytearray(width * height * 3) for _ in range(self._frames)]
+            self._ring = []
+
+    def _run(self) -> None:
+        """Grab loop (runs on its own thread, which owns the backend)."""
+        backend = create_backend(self._backend_name)
+        if backend is None:
+            self._ready.set()
+            return
+
+        try:
+            self._monitors = [dict(m) for m in backend.monitors]
+            self._allocate(self._monitors[0])
+            self._ready.set()
+
+            while True:
+                try:
+                    self._grab(backend)
+                except Exception as e:
+                    print(f"Warning: Frame buffer grab failed: {e}")
+                if self._stop.wait(self._interval):
+                    break
+        finally:
+            self._ready.set()
+            backend.close()
+
+    def _grab(self, backend) -> None:
+        """Grab one frame and store it if the screen changed."""
+        from PIL import Image
+
+        with span('frame_buffer_grab'):
+            img = backend.grab_image(self._screen)
+            if self._size != img.size:
+                img = img.resize(self._size, Image.BILINEAR)
+            data = img.tobytes()
+
+        now = time.time()
+        with self._lock:
+            newest = self._ring[-1] if self._ring else None
+            if newest is not None and self._slots[newest.slot] == data:
+                newest.last_seen = now
+                return
+
+            if len(self._ring) < self._frames:
+                slot = len(self._ring)
+            else:
+                slot = self._ring.pop(0).slot
+            self._slots[slot][:] = data
+            self._sequence += 1
+            self._ring.append(BufferedFrame(slot, self._sequence, now, now))
+
+    def frames(self) -> List[BufferedFrame]:
+        """Get the buffered frames, oldest first."""
+        with self._lock:
+            return [BufferedFrame(f.slot, f.sequence, f.captured_at, f.last_seen) for f in self._ring]
+
+    def frame_at(self, seconds_ago: float = 0.0) -> Optional[BufferedFrame]:
+        """
+        Get the frame that was on screen ``seconds_ago`` seconds ago.
+
+        With ``seconds_ago`` 0 the newest frame is returned only if a grab
+        within the last two intervals matched it, so a stalled thread never
+        shows an outdated screen as current.
+
+        Args:
+            seconds_ago: Age in seconds.
+
+        Returns:
+            The frame, or None if the buffer does not reach that far back.
+        """
+        now = time.time()
+        with self._lock:
+            if not self._ring:
+                return None
+            if seconds_ago <= 0:
+                newest = self._ring[-1]
+                if now - newest.last_seen > 2 * self._interval:
+                    return None
+                return BufferedFrame(newest.slot, newest.sequence, newest.captured_at, newest.last_seen)
+            target = now - seconds_ago
+            for frame in reversed(self._ring):
+                if frame.captured_at <= target:
+                    return BufferedFrame(frame.slot, frame.sequence, frame.captured_at, frame.last_seen)
+        return None
+
+    def snapshot(self) -> Optional[FrameSnapshot]:
+        """
+        Get the newest frame (or the pinned past frame) as a grab source.
+
+        Returns:
+            FrameSnapshot, or None if no suitable frame is buffered.
+        """
+        frame = self.frame_at(self._pinned_ago or 0.0)
+        return FrameSnapshot(self, frame) if frame is not None else None
+
+    @contextmanager
+    def pinned(self, seconds_ago: float):
+        """
+        Make ``snapshot()`` return the screen as it was ``seconds_ago`` seconds ago.
+
+        Args:
+            seconds_ago: Age in seconds.
+        """
+        previous = self._pinned_ago
+        self._pinned_ago = seconds_ago
+        try:
+            yield self
+        finally:
+            self._pinned_ago = previous
+
+    def crop(self, frame: BufferedFrame, rect: Dict[str, int]):
+        """
+        Crop a rectangle from a buffered frame.
+
+        Args:
+            frame: Frame from ``frames()``, ``frame_at()`` or a snapshot.
+            rect: Dict with left/top/width/height in virtual screen coordinates.
+
+        Returns:
+            PIL RGB image at screen resolution.
+
+        Raises:
+            LookupError: If the frame's slot was overwritten in the meantime.
+        """
+        from PIL import Image
+
+        scale = self._scale
+        width, height = self._size
+        left = min(max(0, int((rect['left'] - self._screen['left']) * scale)), width - 1)
+        top = min(max(0, int((rect['top'] - self._screen['top']) * scale)), height - 1)
+        right = min(width, left + max(1, int(rect['width'] * scale)))
+        bottom = min(height, top + max(1, int(rect['height'] * scale)))
+
+        with self._lock:
+            if not any(f.sequence == frame.sequence for f in self._ring):
+                raise LookupError("buffered frame was overwritten")
+            # Copy only the requested rows out of the slot
+            slot = memoryview(self._slots[frame.slot])
+            stride = width * 3
+            data = b''.join(
+                slot[y * stride + left * 3:y * stride + right * 3] for y in range(top, bottom)
+            )
+        region = Image.frombytes('RGB', (right - left, bottom - top), data)
+
+        if region.size != (rect['width'], rect['height']):
+            region = region.resize((rect['width'], rect['height']), Image.BILINEAR)
+        return region
@@ -0,0 +1,130 @@
+"""
+Minimal inotify binding for watching a directory (Linux).
+
+Only what the folder watcher needs: one non-blocking inotify descriptor,
+one watch, and reading the names of files that were closed after writing
+or moved into the directory. Uses libc through ctypes, so no extra
+dependency is needed.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+from typing import List, Optional
+
+# inotify event masks (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+
+# Header of each event: wd, mask, cookie, len
+_EVENT = struct.Struct('iIII')
+
+# Loaded libc, or None until first use
+_libc = None
+
+
+def _load_libc():
+    """Load libc and declare the inotify functions."""
+    global _libc
+    if _libc is None:
+        try:
+            # Load by soname first: find_library spawns ldconfig
+            libc = ctypes.CDLL('libc.so.6', use_errno=True)
+        except OSError:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _libc = libc
+    return _libc
+
+
+def is_available() -> bool:
+    """Check whether inotify can be used on this system."""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        return hasattr(_load_libc(), 'inotify_init1')
+    except OSError:
+        return False
+
+
+class DirectoryWatch:
+    """
+    Report files written or moved into one directory.
+
+    Usage:
+        with DirectoryWatch('/path/to/dir') as watch:
+            for path in watch.read(timeout=1.0):
+                ...
+    """
+
+    def __init__(self, directory: str, mask: int = IN_CLOSE_WRITE | IN_MOVED_TO):
+        """
+        Start watching.
+
+        Args:
+            directory: Directory to watch (not recursive).
+            mask: inotify event mask.
+
+        Raises:
+            OSError: If inotify is unavailable or the directory cannot be watched.
+        """
+        libc = _load_libc()
+        self._directory = directory
+        self.overflowed = False  # Events were lost; rescan the directory
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"Cannot watch {directory}: {os.strerror(errno)}")
+
+    def read(self, timeout: Optional[float] = None) -> List[str]:
+        """
+        Wait for events.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely.
+
+        Returns:
+            Paths of the files that were written or moved in (may be empty).
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        paths = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            _wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                self.overflowed = True
+            elif name and not mask & IN_IGNORED:
+                paths.append(os.path.join(self._directory, os.fsdecode(name)))
+        return paths
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> 'DirectoryWatch':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -3,45 +3,57 @@ Linux platform-specific implementations.
 """
 
 import os
+import shutil
 import subprocess
 import tempfile
-from typing import Optional
+import zlib
+from typing import List, Optional
 
+from ..core.trace import span
 from .base import (
     BaseScreenshotCapture,
     BaseClipboardManager,
     SelectionResult,
 )
+from .capture_backends import AUTO, create_backend
+from .monitors import SCOPE_MONITOR
 
 
 class LinuxScreenshotCapture(BaseScreenshotCapture):
-    """Linux screenshot capture using mss with tkinter selection overlay."""
+    """Linux screenshot capture using a pluggable capture backend with tkinter selection overlay."""
 
-    def __init__(self):
-        """Initialize and detect available screenshot tool."""
-        self._capture_tool = self._detect_capture_tool()
-        self._temp_dir = tempfile.gettempdir()
+    def __init__(self, capture_scope: str = SCOPE_MONITOR, capture_backend: str = AUTO):
+        """
+        Initialize Linux screenshot capture.
 
-    def _detect_capture_tool(self) -> Optional[str]:
-        """Detect available screenshot tool."""
-        # Prefer mss for consistent behavior across platforms
-        try:
-            import mss
-            return 'mss'
-        except ImportError:
-            pass
+        Args:
+            capture_scope: SCOPE_MONITOR to grab only the monitor under the
+                pointer, or SCOPE_ALL for the whole virtual screen.
+            capture_backend: Capture backend name (see ``snapocr capture-bench``),
+                or 'auto' for the first available one.
+        """
+        self._capture_scope = capture_scope
+        self._backend_name = capture_backend
+        self._backend = None
+        self._temp_dir = tempfile.gettempdir()
 
-        # Fall back to scrot for its selection mode
-        result = subprocess.run(['which', 'scrot'], capture_output=True)
-        if result.returncode == 0:
-            return 'scrot'
+    def _get_backend(self):
+        """
+        Get the capture backend, created on first use.
 
-        # Fall back to ImageMagick import
-        result = subprocess.run(['which', 'import'], capture_output=True)
-        if result.returncode == 0:
-            return 'import'
+        The backend is kept for the lifetime of this object, so a resident
+        process reuses its connection and buffers for every capture.
+        """
+        if self._backend is None:
+            self._backend = create_backend(self._backend_name)
+            if self._backend is None:
+                raise RuntimeError("no screen capture backend available")
+        return self._backend
 
-        return None
+    def grab_rect(self, rect):
+        """Grab a screen rectangle with the capture backend, without any UI."""
+        x, y, w, h = rect
+        return self._get_backend().grab_image({'left': x, 'top': y, 'width': w, 'height': h})
 
     def _get_temp_path(self) -> str:
         """Get a temporary file path for screenshot."""
@@ -49,119 +61,29 @@ class LinuxScreenshotCapture(BaseScreenshotCapture):
 
     def select_region(self) -> Optional[SelectionResult]:
         """
-        Capture a selected screen region using mss with tkinter overlay.
+        Capture a selected screen region using the capture backend with tkinter overlay.
 
         Returns:
             SelectionResult with image path and region info, or None if cancelled.
         """
-        # Prefer mss with tkinter overlay for consistent behavior
-        return self._capture_with_mss_selection()
+        # Prefer the tkinter overlay for consistent behavior
+        return self._capture_with_overlay_selection()
 
-    def _capture_with_mss_selection(self) -> Optional[SelectionResult]:
-        """Capture region using mss with tkinter selection overlay."""
+    def _capture_with_overlay_selection(self) -> Optional[SelectionResult]:
+        """Capture region using the capture backend with tkinter selection overlay."""
         try:
-            import mss
-            import tkinter as tk
-            from PIL import Image
+            import tkinter  # noqa: F401
+            import PIL  # noqa: F401
         except ImportError:
-            print("Error: mss, tkinter, and Pillow required for region selection")
-            # Fall back to scrot or import if available
-            if self._capture_tool == 'scrot':
+            print("Error: tkinter and Pillow required for region selection")
+            # Fall back to interactive scrot or import if available
+            if shutil.which('scrot'):
                 return self._capture_with_scrot()
-            elif self._capture_tool == 'import':
+            elif shutil.which('import'):
                 return self._capture_with_import()
             return None
 
-        # Capture full screen first for overlay
-        try:
-            with mss.mss() as sct:
-                monitor = sct.monitors[0]  # All monitors combined
-                screenshot = sct.grab(monitor)
-                screen_img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
-                screen_width, screen_height = screenshot.size
-        except Exception as e:
-            print(f"Error capturing screen: {e}")
-            return None
-
-        # Selection state
-        selection = {'start': None, 'end': None, 'done': False, 'cancelled': False}
-
-        def on_press(event):
-            selection['start'] = (event.x_root, event.y_root)
-
-        def on_release(event):
-            selection['end'] = (event.x_root, event.y_root)
-            selection['done'] = True
-            root.destroy()
-
-        def on_motion(event):
-            if selection['start']:
-                # Update selection rectangle
-                canvas.delete("selection")
-                x1, y1 = selection['start']
-                x2, y2 = event.x_root, event.y_root
-                canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    outline='#00BFFF', width=2, tag="selection"
-                )
-
-        def on_escape(event):
-            selection['cancelled'] = True
-            root.destroy()
-
-        # Create fullscreen transparent window
-        root = tk.Tk()
-        root.attributes('-fullscreen', True)
-        root.attributes('-alpha', 0.3)
-        root.attributes('-topmost', True)
-        root.configure(bg='black', cursor='cross')
-
-        canvas = tk.Canvas(root, bg='black', highlightthickness=0)
-        canvas.pack(fill=tk.BOTH, expand=True)
-
-        canvas.bind('<ButtonPress-1>', on_press)
-        canvas.bind('<ButtonRelease-1>', on_release)
-        canvas.bind('<B1-Motion>', on_motion)
-        canvas.bind('<Escape>', on_escape)
-        root.bind('<Escape>', on_escape)
-
-        print("Select a region with your mouse (drag to select, Esc to cancel)...")
-
-        root.mainloop()
-
-        if selection['cancelled'] or not selection['done'] or not selection['start'] or not selection['end']:
-            return None
-
-        # Calculate region bounds
-        x1, y1 = selection['start']
-        x2, y2 = selection['end']
-        left = int(min(x1, x2))
-        top = int(min(y1, y2))
-        right = int(max(x1, x2))
-        bottom = int(max(y1, y2))
-
-        if right - left < 5 or bottom - top < 5:
-            return None
-
-        width = right - left
-        height = bottom - top
-
-        # Crop the selected region from the full screen capture
-        temp_path = self._get_temp_path()
-        try:
-            region_img = screen_img.crop((left, top, right, bottom))
-            region_img.save(temp_path)
-        except Exception as e:
-            print(f"Error saving selection: {e}")
-            return None
-
-        return SelectionResult(
-            image_path=temp_path,
-            rect=(left, top, width, height),
-            screen_image=screen_img,
-            screen_width=screen_width,
-            screen_height=screen_height
-        )
+        return self._select_with_overlay(self._get_backend)
 
     def _capture_with_scrot(self) -> Optional[SelectionResult]:
         """Capture region using scrot (fallback)."""
@@ -247,36 +169,15 @@ class LinuxScreenshotCapture(BaseScreenshotCapture):
         if os.path.exists(temp_path):
             os.remove(temp_path)
 
-        if self._capture_tool == 'mss':
-            try:
-                import mss
-                from PIL import Image
-                with mss.mss() as sct:
-                    monitor = sct.monitors[0]  # All monitors
-                    screenshot = sct.grab(monitor)
-                    img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
-                    img.save(temp_path)
-                return temp_path
-            except Exception as e:
-                print(f"Error capturing screen: {e}")
-                return None
-        elif self._capture_tool == 'scrot':
-            result = subprocess.run(
-                ['scrot', '-z', temp_path],
-                capture_output=True
-            )
-        elif self._capture_tool == 'import':
-            result = subprocess.run(
-                ['import', '-window', 'root', temp_path],
-                capture_output=True
-            )
-        else:
-            print("No screenshot tool available")
-            return None
-
-        if os.path.exists(temp_path):
+        try:
+            sct = self._get_backend()
+            with span('grab_screen', scope='all', backend=sct.name):
+                img = sct.grab_image(sct.monitors[0])  # All monitors
+            img.save(temp_path)
             return temp_path
-        return None
+        except Exception as e:
+            print(f"Error capturing screen: {e}")
+            return None
 
     def capture_window(self) -> Optional[str]:
         """Capture the currently focused window."""
@@ -285,20 +186,20 @@ class LinuxScreenshotCapture(BaseScreenshotCapture):
         if os.path.exists(temp_path):
             os.remove(temp_path)
 
-        if self._capture_tool == 'scrot':
+        if shutil.which('scrot'):
             # scrot -u: focused window
             result = subprocess.run(
                 ['scrot', '-u', '-z', temp_path],
                 capture_output=True
             )
-        elif self._capture_tool == 'import':
+        elif shutil.which('import'):
             # Select window by clicking
             result = subprocess.run(
                 ['import', temp_path],
                 capture_output=True
             )
         else:
-            # Not supported with mss alone
+            # Needs scrot or import
             print("Window capture not supported. Use full screen or region selection.")
             return None
 
@@ -307,30 +208,80 @@ class LinuxScreenshotCapture(BaseScreenshotCapture):
         return None
 
 
+# Clipboard command-line tools found on PATH, detected once per process
+_clipboard_backends: Optional[List[str]] = None
+
+
+def detect_clipboard_backends() -> List[str]:
+    """
+    Detect installed clipboard tools, in order of preference.
+
+    Uses a PATH lookup instead of spawning ``which``, and caches the
+    result for the lifetime of the process.
+
+    Returns:
+        List of tool names ('xclip', 'xsel').
+    """
+    global _clipboard_backends
+    if _clipboard_backends is None:
+        _clipboard_backends = [tool for tool in ('xclip', 'xsel') if shutil.which(tool)]
+    return _clipboard_backends
+
+
 class LinuxClipboardManager(BaseClipboardManager):
-    """Linux clipboard manager using xclip, xsel, or pyperclip."""
+    """Linux clipboard manager using an in-process X11 owner, xclip, xsel, or pyperclip."""
+
+    # Command lines per backend
+    _COPY_COMMANDS = {
+        'xclip': ['xclip', '-selection', 'clipboard'],
+        'xsel': ['xsel', '--clipboard', '--input'],
+    }
+    _PASTE_COMMANDS = {
+        'xclip': ['xclip', '-selection', 'clipboard', '-o'],
+        'xsel': ['xsel', '--clipboard', '--output'],
+    }
+
+    def __init__(self, resident: bool = False):
+        """
+        Initialize Linux clipboard manager.
 
-    def copy(self, text: str) -> bool:
-        """Copy text to clipboard."""
-        # Try xclip first (most reliable)
-        result = subprocess.run(['which', 'xclip'], capture_output=True)
-        if result.returncode == 0:
+        Args:
+            resident: Whether the process stays alive (daemon mode). A
+                resident process owns the X11 clipboard itself instead of
+                forking xclip/xsel on every copy.
+        """
+        self._resident = resident
+        self._owner = None
+        self._owner_failed = False
+        self._monitor = None
+        self._monitor_failed = False
+
+    def _get_owner(self):
+        """Get the in-process X11 clipboard owner, or None if unavailable."""
+        if not self._resident or self._owner_failed or not os.environ.get('DISPLAY'):
+            return None
+        if self._owner is None:
             try:
-                subprocess.run(
-                    ['xclip', '-selection', 'clipboard'],
-                    input=text.encode('utf-8'),
-                    check=True
-                )
-                return True
-            except Exception:
-                pass
+                from .x11_clipboard import X11ClipboardOwner
+                owner = X11ClipboardOwner()
+                owner.start()
+                self._owner = owner
+            except Exception as e:
+                print(f"Warning: In-process clipboard unavailable, using external tools: {e}")
+                self._owner_failed = True
+                return None
+        return self._owner
 
-        # Try xsel
-        result = subprocess.run(['which', 'xsel'], capture_output=True)
-        if result.returncode == 0:
+    def copy(self, text: str, latex: Optional[str] = None) -> bool:
+        """Copy text to clipboard."""
+        owner = self._get_owner()
+        if owner is not None and owner.set_text(text, latex=latex):
+            return True
+
+        for backend in detect_clipboard_backends():
             try:
                 subprocess.run(
-                    ['xsel', '--clipboard', '--input'],
+                    self._COPY_COMMANDS[backend],
                     input=text.encode('utf-8'),
                     check=True
                 )
@@ -351,26 +302,14 @@ class LinuxClipboardManager(BaseClipboardManager):
 
     def paste(self) -> str:
         """Get text from clipboard."""
-        # Try xclip
-        result = subprocess.run(['which', 'xclip'], capture_output=True)
-        if result.returncode == 0:
-            try:
-                result = subprocess.run(
-                    ['xclip', '-selection', 'clipboard', '-o'],
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode == 0:
-                    return result.stdout
-            except Exception:
-                pass
+        owner = self._owner
+        if owner is not None and owner.owns_selection:
+            return owner.get_text()
 
-        # Try xsel
-        result = subprocess.run(['which', 'xsel'], capture_output=True)
-        if result.returncode == 0:
+        for backend in detect_clipboard_backends():
             try:
                 result = subprocess.run(
-                    ['xsel', '--clipboard', '--output'],
+                    self._PASTE_COMMANDS[backend],
                     capture_output=True,
                     text=True
                 )
@@ -387,3 +326,83 @@ class LinuxClipboardManager(BaseClipboardManager):
             pass
 
         return ""
+
+    def _get_monitor(self):
+        """Get the XFixes clipboard monitor, or None if unavailable."""
+        if self._monitor_failed or not os.environ.get('DISPLAY'):
+            return None
+        if self._monitor is None:
+            try:
+                from .x11_clipboard import X11SelectionMonitor
+                self._monitor = X11SelectionMonitor()
+            except Exception:
+                self._monitor_failed = True
+                return None
+        return self._monitor
+
+    def change_count(self) -> Optional[int]:
+        """
+        Get a counter that changes whenever another client takes the clipboard.
+
+        Uses XFixes notifications when python-xlib is installed; otherwise
+        asks xclip for the selection's TIMESTAMP, which is far cheaper than
+        reading and hashing the image.
+
+        Returns:
+            The counter, or None where neither is available (Wayland, or an
+            owner that does not answer TIMESTAMP).
+        """
+        if os.environ.get('WAYLAND_DISPLAY'):
+            return None  # The X selection need not follow the Wayland clipboard
+        monitor = self._get_monitor()
+        if monitor is not None:
+            return monitor.change_count()
+        if 'xclip' not in detect_clipboard_backends():
+            return None
+        try:
+            result = subprocess.run(
+                ['xclip', '-selection', 'clipboard', '-t', 'TIMESTAMP', '-o'],
+                capture_output=True,
+                timeout=2
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if result.returncode != 0 or not result.stdout:
+            return None
+        return zlib.crc32(result.stdout)
+
+    # Clipboard image MIME types, in order of preference
+    _IMAGE_TYPES = ('image/png', 'image/bmp', 'image/jpeg', 'image/tiff')
+
+    def _image_commands(self):
+        """Yield (list-types command, read command builder) for each available image tool."""
+        if os.environ.get('WAYLAND_DISPLAY') and shutil.which('wl-paste'):
+            yield ['wl-paste', '--list-types'], lambda t: ['wl-paste', '--no-newline', '--type', t]
+        if 'xclip' in detect_clipboard_backends():
+            yield (
+                ['xclip', '-selection', 'clipboard', '-t', 'TARGETS', '-o'],
+                lambda t: ['xclip', '-selection', 'clipboard', '-t', t, '-o'],
+            )
+
+    def paste_image(self):
+        """Get an image from the clipboard with wl-paste or xclip, in memory."""
+        import io
+        from PIL import Image
+
+        for list_command, read_command in self._image_commands():
+            try:
+                listed = subprocess.run(list_command, capture_output=True, text=True, timeout=2)
+                if listed.returncode != 0:
+                    continue
+                types = listed.stdout.split()
+                image_type = next((t for t in self._IMAGE_TYPES if t in types), None)
+                if image_type is None:
+                    return None  # The clipboard holds something else
+                with span('clipboard_read_image', type=image_type):
+                    data = subprocess.run(read_command(image_type), capture_output=True, timeout=5).stdout
+                image = Image.open(io.BytesIO(data))
+                image.load()
+                return image
+            except Exception:
+                continue
+        return None
@@ -12,13 +12,21 @@ from .base import (
     BaseClipboardManager,
     SelectionResult,
 )
+from .monitors import SCOPE_MONITOR
 
 
 class MacOSScreenshotCapture(BaseScreenshotCapture):
     """macOS screenshot capture using mss with tkinter selection overlay."""
 
-    def __init__(self):
-        """Initialize macOS screenshot capture."""
+    def __init__(self, capture_scope: str = SCOPE_MONITOR):
+        """
+        Initialize macOS screenshot capture.
+
+        Args:
+            capture_scope: SCOPE_MONITOR to grab only the monitor under the
+                pointer, or SCOPE_ALL for the whole virtual screen.
+        """
+        self._capture_scope = capture_scope
         self._temp_dir = tempfile.gettempdir()
 
     def _get_temp_path(self) -> str:
@@ -33,103 +41,14 @@ class MacOSScreenshotCapture(BaseScreenshotCapture):
             SelectionResult with image path and region info, or None if cancelled.
         """
         try:
-            import mss
-            import tkinter as tk
-            from PIL import Image
+            import mss  # noqa: F401
+            import tkinter  # noqa: F401
+            import PIL  # noqa: F401
         except ImportError:
             print("Error: mss, tkinter, and Pillow required for region selection")
             return None
 
-        # Capture full screen first for overlay
-        try:
-            with mss.mss() as sct:
-                monitor = sct.monitors[0]  # All monitors combined
-                screenshot = sct.grab(monitor)
-                screen_img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
-                screen_width, screen_height = screenshot.size
-        except Exception as e:
-            print(f"Error capturing screen: {e}")
-            return None
-
-        # Selection state
-        selection = {'start': None, 'end': None, 'done': False, 'cancelled': False}
-
-        def on_press(event):
-            selection['start'] = (event.x, event.y)
-
-        def on_release(event):
-            selection['end'] = (event.x, event.y)
-            selection['done'] = True
-            root.destroy()
-
-        def on_motion(event):
-            if selection['start']:
-                # Update selection rectangle
-                canvas.delete("selection")
-                x1, y1 = selection['start']
-                x2, y2 = event.x, event.y
-                canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    outline='#00BFFF', width=2, tag="selection"
-                )
-
-        def on_escape(event):
-            selection['cancelled'] = True
-            root.destroy()
-
-        # Create fullscreen transparent window
-        root = tk.Tk()
-        root.attributes('-fullscreen', True)
-        root.attributes('-alpha', 0.3)
-        root.attributes('-topmost', True)
-        root.configure(bg='black', cursor='cross')
-
-        canvas = tk.Canvas(root, bg='black', highlightthickness=0)
-        canvas.pack(fill=tk.BOTH, expand=True)
-
-        canvas.bind('<ButtonPress-1>', on_press)
-        canvas.bind('<ButtonRelease-1>', on_release)
-        canvas.bind('<B1-Motion>', on_motion)
-        canvas.bind('<Escape>', on_escape)
-        root.bind('<Escape>', on_escape)
-
-        print("Select a region with your mouse (drag to select, Esc to cancel)...")
-
-        root.mainloop()
-
-        if selection['cancelled'] or not selection['done'] or not selection['start'] or not selection['end']:
-            return None
-
-        # Calculate region bounds
-        x1, y1 = selection['start']
-        x2, y2 = selection['end']
-        left = int(min(x1, x2))
-        top = int(min(y1, y2))
-        right = int(max(x1, x2))
-        bottom = int(max(y1, y2))
-
-        if right - left < 5 or bottom - top < 5:
-            return None
-
-        width = right - left
-        height = bottom - top
-
-        # Crop the selected region from the full screen capture
-        temp_path = self._get_temp_path()
-        try:
-            region_img = screen_img.crop((left, top, right, bottom))
-            region_img.save(temp_path)
-        except Exception as e:
-            print(f"Error saving selection: {e}")
-            return None
-
-        return SelectionResult(
-            image_path=temp_path,
-            rect=(left, top, width, height),
-            screen_image=screen_img,
-            screen_width=screen_width,
-            screen_height=screen_height
-        )
+        return self._select_with_overlay()
 
     def capture_full_screen(self) -> Optional[str]:
         """Capture the full screen."""
@@ -174,7 +93,7 @@ class MacOSScreenshotCapture(BaseScreenshotCapture):
 class MacOSClipboardManager(BaseClipboardManager):
     """macOS clipboard manager using pbcopy and pbpaste."""
 
-    def copy(self, text: str) -> bool:
+    def copy(self, text: str, latex: Optional[str] = None) -> bool:
         """Copy text to clipboard using pbcopy."""
         try:
             process = subprocess.Popen(
@@ -201,3 +120,37 @@ class MacOSClipboardManager(BaseClipboardManager):
         except Exception as e:
             print(f"Error reading clipboard: {e}")
             return ""
+
+    # Pasteboard types read as images, in order of preference
+    _IMAGE_TYPES = ('public.png', 'public.tiff')
+
+    @staticmethod
+    def _pasteboard():
+        """Get the general pasteboard, or None without pyobjc."""
+        try:
+            from AppKit import NSPasteboard
+        except ImportError:
+            return None
+        return NSPasteboard.generalPasteboard()
+
+    def paste_image(self):
+        """Get an image from the pasteboard without a temporary file."""
+        pasteboard = self._pasteboard()
+        if pasteboard is None:
+            return super().paste_image()
+
+        import io
+        from PIL import Image
+
+        for image_type in self._IMAGE_TYPES:
+            data = pasteboard.dataForType_(image_type)
+            if data is not None:
+                image = Image.open(io.BytesIO(bytes(data)))
+                image.load()
+                return image
+        return None
+
+    def change_count(self) -> Optional[int]:
+        """Get the pasteboard change count."""
+        pasteboard = self._pasteboard()
+        return int(pasteboard.changeCount()) if pasteboard is not None else None
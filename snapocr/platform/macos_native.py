@@ -196,7 +196,7 @@ class MacOSNativeClipboardManager:
             )
         self._pasteboard = NSPasteboard.generalPasteboard()
 
-    def copy(self, text: str) -> bool:
+    def copy(self, text: str, latex: Optional[str] = None) -> bool:
         """Copy text to clipboard using native Cocoa APIs."""
         try:
             self._pasteboard.clearContents()
@@ -0,0 +1,189 @@
+"""
+Monitor-aware screen grabbing shared by the platform implementations.
+
+Grabbing ``sct.monitors[0]`` copies every monitor combined, which on
+multi-monitor desks is tens of megabytes per capture before the overlay
+even appears. By default only the monitor under the pointer is grabbed;
+a selection dragged onto another monitor is completed lazily by grabbing
+just the missing part when the mouse is released.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from ..core.trace import span
+
+
+# Grab only the monitor under the pointer
+SCOPE_MONITOR = 'monitor'
+# Grab the whole virtual screen (all monitors combined)
+SCOPE_ALL = 'all'
+
+
+def find_monitor(monitors: List[Dict[str, int]], x: int, y: int) -> Dict[str, int]:
+    """
+    Find the monitor containing a point.
+
+    Args:
+        monitors: mss monitor list (index 0 is the combined virtual screen).
+        x: Horizontal position in virtual screen coordinates.
+        y: Vertical position in virtual screen coordinates.
+
+    Returns:
+        The containing monitor, or the primary monitor if none contains the point.
+    """
+    for monitor in monitors[1:]:
+        if (monitor['left'] <= x < monitor['left'] + monitor['width']
+                and monitor['top'] <= y < monitor['top'] + monitor['height']):
+            return monitor
+    return monitors[1] if len(monitors) > 1 else monitors[0]
+
+
+def shot_to_image(shot):
+    """
+    Convert an mss screenshot to a PIL RGB image.
+
+    Decodes the raw BGRA buffer directly instead of going through
+    ``shot.rgb``, which builds an extra full-size copy.
+    """
+    from PIL import Image
+    return Image.frombytes('RGB', shot.size, shot.bgra, 'raw', 'BGRX')
+
+
+def grab_image(sct, monitor: Dict[str, int]):
+    """
+    Grab a screen rectangle as a PIL RGB image.
+
+    Args:
+        sct: ``mss.mss()`` instance or capture backend (see capture_backends).
+        monitor: Dict with left/top/width/height.
+    """
+    if hasattr(sct, 'grab_image'):
+        return sct.grab_image(monitor)
+    return shot_to_image(sct.grab(monitor))
+
+
+def grab_screen(sct, pointer: Optional[Tuple[int, int]], scope: str = SCOPE_MONITOR):
+    """
+    Grab the screen for the selection overlay.
+
+    Args:
+        sct: Open ``mss.mss()`` instance or capture backend.
+        pointer: Pointer position in virtual screen coordinates, if known.
+        scope: SCOPE_MONITOR or SCOPE_ALL.
+
+    Returns:
+        Tuple of (PIL image, monitor dict with left/top/width/height).
+    """
+    if scope == SCOPE_ALL or pointer is None:
+        monitor = sct.monitors[0]
+    else:
+        monitor = find_monitor(sct.monitors, *pointer)
+    return grab_image(sct, monitor), dict(monitor)
+
+
+def image_scale(screen_img, monitor: Dict[str, int]) -> Tuple[float, float]:
+    """
+    Get the image pixels per screen point of a grabbed monitor.
+
+    HiDPI (Retina) grabs have more pixels than the monitor has points.
+
+    Args:
+        screen_img: PIL image of ``monitor``.
+        monitor: Grabbed monitor (left/top/width/height).
+
+    Returns:
+        (horizontal, vertical) scale; (1.0, 1.0) without HiDPI.
+    """
+    return screen_img.size[0] / monitor['width'], screen_img.size[1] / monitor['height']
+
+
+def crop_selection(screen_img, monitor: Dict[str, int], box: Tuple[int, int, int, int], sct=None):
+    """
+    Crop a selection from the grabbed monitor image.
+
+    If the selection extends beyond the grabbed monitor, the selection
+    rectangle is grabbed live and the frozen part is pasted over it.
+
+    Args:
+        screen_img: PIL image of ``monitor``.
+        monitor: Grabbed monitor (left/top/width/height).
+        box: (left, top, right, bottom) in virtual screen coordinates.
+        sct: Optional grabber for the extension. Opens mss if not provided.
+
+    Returns:
+        PIL image of the selection.
+    """
+    left, top, right, bottom = box
+    m_left, m_top = monitor['left'], monitor['top']
+    m_right, m_bottom = m_left + monitor['width'], m_top + monitor['height']
+
+    sx, sy = image_scale(screen_img, monitor)
+
+    if left >= m_left and top >= m_top and right <= m_right and bottom <= m_bottom:
+        return screen_img.crop((
+            round((left - m_left) * sx), round((top - m_top) * sy),
+            round((right - m_left) * sx), round((bottom - m_top) * sy),
+        ))
+
+    # Lazy extension: the drag crossed onto another monitor
+    rect = {'left': left, 'top': top, 'width': right - left, 'height': bottom - top}
+    with span('grab_extension'):
+        if sct is not None:
+            region = grab_image(sct, rect)
+        else:
+            import mss
+            with mss.mss() as sct:
+                region = grab_image(sct, rect)
+
+    ix1, iy1 = max(left, m_left), max(top, m_top)
+    ix2, iy2 = min(right, m_right), min(bottom, m_bottom)
+    if ix1 < ix2 and iy1 < iy2:
+        frozen = screen_img.crop((
+            round((ix1 - m_left) * sx), round((iy1 - m_top) * sy),
+            round((ix2 - m_left) * sx), round((iy2 - m_top) * sy),
+        ))
+        # The live grab has its own scale; match the frozen part to it
+        rx, ry = image_scale(region, rect)
+        size = (round((ix2 - ix1) * rx), round((iy2 - iy1) * ry))
+        if frozen.size != size:
+            frozen = frozen.resize(size)
+        region.paste(frozen, (round((ix1 - left) * rx), round((iy1 - top) * ry)))
+    return region
+
+
+def parse_rect(text: str) -> Tuple[int, int, int, int]:
+    """
+    Parse a rectangle given as ``x,y,w,h``.
+
+    Args:
+        text: Four integers separated by commas (spaces allowed).
+
+    Returns:
+        (x, y, width, height).
+
+    Raises:
+        ValueError: If the text is not four integers or the size is not positive.
+    """
+    parts = [p.strip() for p in text.split(',')]
+    if len(parts) != 4:
+        raise ValueError(f"expected x,y,w,h, got {text!r}")
+    x, y, w, h = (int(p) for p in parts)
+    if w <= 0 or h <= 0:
+        raise ValueError(f"width and height must be positive, got {w}x{h}")
+    return x, y, w, h
+
+
+def monitor_geometry(monitor: Dict[str, int]) -> str:
+    """Get a Tk geometry string covering a monitor."""
+    return f"{monitor['width']}x{monitor['height']}+{monitor['left']}+{monitor['top']}"
+
+
+def get_pointer_position(root) -> Optional[Tuple[int, int]]:
+    """Get the pointer position from a Tk root, or None if unavailable."""
+    try:
+        x, y = root.winfo_pointerxy()
+    except Exception:
+        return None
+    if (x, y) == (-1, -1):
+        return None  # Pointer on another X screen
+    return x, y
@@ -0,0 +1,50 @@
+"""
+Desktop notifications.
+
+Used where a result arrives after the command that asked for it has
+returned (queued captures in daemon mode). Notifications go through the
+system's command-line tools, so no extra dependency is needed:
+``osascript`` on macOS and ``notify-send`` (libnotify) on Linux.
+"""
+
+import shutil
+import subprocess
+import sys
+
+
+# Longest message passed to the notification (the rest is cut off)
+MAX_MESSAGE_CHARS = 200
+
+
+def _applescript_string(text: str) -> str:
+    """Quote text as an AppleScript string literal."""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def show_notification(title: str, message: str) -> bool:
+    """
+    Show a desktop notification without waiting for it.
+
+    Args:
+        title: Notification title.
+        message: Notification body; shortened to ``MAX_MESSAGE_CHARS``.
+
+    Returns:
+        True if a notification tool was started, False if none is available.
+    """
+    if len(message) > MAX_MESSAGE_CHARS:
+        message = message[:MAX_MESSAGE_CHARS - 3] + '...'
+
+    if sys.platform == 'darwin':
+        script = f"display notification {_applescript_string(message)} with title {_applescript_string(title)}"
+        command = ['osascript', '-e', script]
+    elif sys.platform.startswith('linux') and shutil.which('notify-send'):
+        command = ['notify-send', '--app-name=SnapOCR', title, message]
+    else:
+        return False
+
+    try:
+        subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
+        return False
+    return True
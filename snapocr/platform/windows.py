@@ -11,13 +11,21 @@ from .base import (
     BaseClipboardManager,
     SelectionResult,
 )
+from .monitors import SCOPE_MONITOR
 
 
 class WindowsScreenshotCapture(BaseScreenshotCapture):
     """Windows screenshot capture using mss with tkinter selection overlay."""
 
-    def __init__(self):
-        """Initialize Windows screenshot capture."""
+    def __init__(self, capture_scope: str = SCOPE_MONITOR):
+        """
+        Initialize Windows screenshot capture.
+
+        Args:
+            capture_scope: SCOPE_MONITOR to grab only the monitor under the
+                pointer, or SCOPE_ALL for the whole virtual screen.
+        """
+        self._capture_scope = capture_scope
         self._temp_dir = tempfile.gettempdir()
 
     def _get_temp_path(self) -> str:
@@ -47,17 +55,14 @@ class WindowsScreenshotCapture(BaseScreenshotCapture):
             SelectionResult with image path and region info, or None if cancelled.
         """
         try:
-            import mss
-            import tkinter as tk
-            from PIL import Image
+            import mss  # noqa: F401
+            import tkinter  # noqa: F401
+            import PIL  # noqa: F401
             import ctypes
         except ImportError:
             print("Error: mss, tkinter, and Pillow required for region selection")
             return None
 
-        # Get DPI scaling factor
-        dpi_scale = self._get_dpi_scale()
-
         # Make the process DPI aware to get correct coordinates
         try:
             ctypes.windll.shcore.SetProcessDpiAwareness(2)  # PROCESS_PER_MONITOR_DPI_AWARE
@@ -67,96 +72,7 @@ class WindowsScreenshotCapture(BaseScreenshotCapture):
             except Exception:
                 pass
 
-        # Capture full screen first for overlay
-        try:
-            with mss.mss() as sct:
-                monitor = sct.monitors[0]  # All monitors combined
-                screenshot = sct.grab(monitor)
-                screen_img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
-                screen_width, screen_height = screenshot.size
-        except Exception as e:
-            print(f"Error capturing screen: {e}")
-            return None
-
-        # Selection state
-        selection = {'start': None, 'end': None, 'done': False, 'cancelled': False}
-
-        def on_press(event):
-            selection['start'] = (event.x_root, event.y_root)
-
-        def on_release(event):
-            selection['end'] = (event.x_root, event.y_root)
-            selection['done'] = True
-            root.destroy()
-
-        def on_motion(event):
-            if selection['start']:
-                # Update selection rectangle
-                canvas.delete("selection")
-                x1, y1 = selection['start']
-                x2, y2 = event.x_root, event.y_root
-                canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    outline='#00BFFF', width=2, tag="selection"
-                )
-
-        def on_escape(event):
-            selection['cancelled'] = True
-            root.destroy()
-
-        # Create fullscreen transparent window
-        root = tk.Tk()
-        root.attributes('-fullscreen', True)
-        root.attributes('-alpha', 0.3)
-        root.attributes('-topmost', True)
-        root.configure(bg='black', cursor='cross')
-
-        canvas = tk.Canvas(root, bg='black', highlightthickness=0)
-        canvas.pack(fill=tk.BOTH, expand=True)
-
-        canvas.bind('<ButtonPress-1>', on_press)
-        canvas.bind('<ButtonRelease-1>', on_release)
-        canvas.bind('<B1-Motion>', on_motion)
-        canvas.bind('<Escape>', on_escape)
-        root.bind('<Escape>', on_escape)
-
-        print("Select a region with your mouse (drag to select, Esc to cancel)...")
-
-        root.mainloop()
-
-        if selection['cancelled'] or not selection['done'] or not selection['start'] or not selection['end']:
-            return None
-
-        # Calculate region bounds (coordinates from tkinter should be in physical pixels)
-        x1, y1 = selection['start']
-        x2, y2 = selection['end']
-        left = int(min(x1, x2))
-        top = int(min(y1, y2))
-        right = int(max(x1, x2))
-        bottom = int(max(y1, y2))
-
-        if right - left < 5 or bottom - top < 5:
-            return None
-
-        width = right - left
-        height = bottom - top
-
-        # Crop the selected region from the full screen capture
-        temp_path = self._get_temp_path()
-        try:
-            region_img = screen_img.crop((left, top, right, bottom))
-            region_img.save(temp_path)
-        except Exception as e:
-            print(f"Error saving selection: {e}")
-            return None
-
-        return SelectionResult(
-            image_path=temp_path,
-            rect=(left, top, width, height),
-            screen_image=screen_img,
-            screen_width=screen_width,
-            screen_height=screen_height
-        )
+        return self._select_with_overlay()
 
     def capture_full_screen(self) -> Optional[str]:
         """Capture the full screen."""
@@ -217,7 +133,7 @@ class WindowsClipboardManager(BaseClipboardManager):
         """Initialize Windows clipboard manager."""
         pass
 
-    def copy(self, text: str) -> bool:
+    def copy(self, text: str, latex: Optional[str] = None) -> bool:
         """Copy text to clipboard using Windows API."""
         try:
             import ctypes
@@ -308,3 +224,11 @@ class WindowsClipboardManager(BaseClipboardManager):
                 user32.CloseClipboard()
         except Exception:
             return ""
+
+    def change_count(self) -> Optional[int]:
+        """Get the clipboard sequence number."""
+        try:
+            import ctypes
+            return int(ctypes.windll.user32.GetClipboardSequenceNumber())
+        except Exception:
+            return None
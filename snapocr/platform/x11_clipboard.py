@@ -0,0 +1,269 @@
+"""
+In-process X11 clipboard owner using python-xlib.
+
+On X11 the clipboard is owned by a running client that answers
+SelectionRequest events; nothing is stored by the server. xclip and xsel
+therefore fork a process that lingers to serve the data. A resident
+SnapOCR (daemon mode) can own the CLIPBOARD selection itself and serve
+text and LaTeX flavours without launching any process.
+
+The owner runs its own X connection on a background thread. It can be
+exercised headless under Xvfb (``xvfb-run python ...``).
+
+``X11SelectionMonitor`` tells when the clipboard changed without reading
+it, from XFixes selection-owner notifications.
+"""
+
+import os
+import select
+import threading
+from typing import Dict, Optional
+
+try:
+    from Xlib import X, Xatom, display as xdisplay
+    from Xlib.ext import xfixes
+    from Xlib.protocol import event as xevent
+    XLIB_AVAILABLE = True
+except ImportError:
+    XLIB_AVAILABLE = False
+
+
+# Clipboard flavour of the LaTeX result
+LATEX_TARGET = 'text/x-tex'
+
+# Targets served with the plain text, UTF-8 encoded
+_UTF8_TARGETS = ('UTF8_STRING', 'text/plain;charset=utf-8', 'TEXT')
+
+
+class X11ClipboardOwner:
+    """
+    Owns the X11 CLIPBOARD selection and serves its contents in-process.
+
+    Usage:
+        owner = X11ClipboardOwner()
+        owner.start()
+        owner.set_text("hello", latex="x^{2}")
+    """
+
+    # Seconds to wait for the event thread to acquire the selection
+    ACQUIRE_TIMEOUT = 1.0
+
+    def __init__(self, display_name: Optional[str] = None):
+        """
+        Initialize the clipboard owner.
+
+        Args:
+            display_name: X display to connect to. Uses $DISPLAY if not provided.
+        """
+        if not XLIB_AVAILABLE:
+            raise ImportError(
+                "python-xlib is required for the in-process clipboard. "
+                "Install with: pip install python-xlib"
+            )
+        self._display_name = display_name
+        self._display = None
+        self._window = None
+        self._atoms: Dict[str, int] = {}
+        self._data: Dict[str, bytes] = {}
+        self._pending: Optional[Dict[str, bytes]] = None
+        self._owned = False
+        self._max_bytes = 0
+        self._lock = threading.Lock()
+        self._acquired = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._wake_r, self._wake_w = os.pipe()
+        self._running = False
+
+    def start(self) -> None:
+        """Connect to the X server and start the event thread."""
+        if self._thread is not None:
+            return
+        self._display = xdisplay.Display(self._display_name)
+        screen = self._display.screen()
+        self._window = screen.root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+        for name in ('CLIPBOARD', 'TARGETS', 'TIMESTAMP', 'MULTIPLE', LATEX_TARGET) + _UTF8_TARGETS:
+            self._atoms[name] = self._display.intern_atom(name)
+        self._atoms['STRING'] = Xatom.STRING
+        # Leave room for the ChangeProperty request header
+        self._max_bytes = self._display.info.max_request_length * 4 - 64
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='snapocr-x11-clipboard', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the event thread and release the selection."""
+        if self._thread is None:
+            return
+        self._running = False
+        os.write(self._wake_w, b'q')
+        self._thread.join()
+        self._thread = None
+        self._display.close()
+        self._display = None
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    @property
+    def owns_selection(self) -> bool:
+        """Whether this process currently owns the clipboard."""
+        return self._owned
+
+    def get_text(self) -> str:
+        """Get the plain text currently served."""
+        return self._data.get('UTF8_STRING', b'').decode('utf-8')
+
+    def set_text(self, text: str, latex: Optional[str] = None) -> bool:
+        """
+        Take ownership of the clipboard and serve ``text`` (and ``latex``).
+
+        Args:
+            text: Plain text flavour.
+            latex: Optional LaTeX flavour, served as text/x-tex.
+
+        Returns:
+            True if the selection was acquired. False if the data is too
+            large to serve without INCR transfers or another client won
+            the selection; callers should fall back to xclip/xsel.
+        """
+        if self._thread is None:
+            return False
+
+        encoded = text.encode('utf-8')
+        if len(encoded) > self._max_bytes:
+            return False
+
+        data = {name: encoded for name in _UTF8_TARGETS}
+        data['text/plain'] = encoded
+        data['STRING'] = text.encode('latin-1', errors='replace')
+        if latex:
+            latex_bytes = latex.encode('utf-8')
+            if len(latex_bytes) <= self._max_bytes:
+                data[LATEX_TARGET] = latex_bytes
+
+        with self._lock:
+            self._pending = data
+            self._acquired.clear()
+        os.write(self._wake_w, b's')
+        return self._acquired.wait(self.ACQUIRE_TIMEOUT) and self._owned
+
+    def _run(self) -> None:
+        """Event loop: apply pending data and answer selection requests."""
+        fd = self._display.fileno()
+        while self._running:
+            readable, _, _ = select.select([fd, self._wake_r], [], [])
+            if self._wake_r in readable:
+                os.read(self._wake_r, 64)
+                self._apply_pending()
+            while self._display.pending_events():
+                self._handle_event(self._display.next_event())
+        if self._owned:
+            self._window.set_selection_owner(X.NONE, X.CurrentTime)
+            self._display.flush()
+
+    def _apply_pending(self) -> None:
+        with self._lock:
+            data, self._pending = self._pending, None
+        if data is None:
+            return
+        self._data = data
+        clipboard = self._atoms['CLIPBOARD']
+        self._window.set_selection_owner(clipboard, X.CurrentTime)
+        owner = self._display.get_selection_owner(clipboard)
+        self._owned = getattr(owner, 'id', owner) == self._window.id
+        self._acquired.set()
+
+    def _targets(self):
+        atoms = [self._atoms['TARGETS'], self._atoms['TIMESTAMP']]
+        for name in self._data:
+            atoms.append(self._atoms.get(name) or self._display.intern_atom(name))
+        return atoms
+
+    def _handle_event(self, e) -> None:
+        if e.type == X.SelectionClear:
+            if e.atom == self._atoms['CLIPBOARD']:
+                self._owned = False
+            return
+        if e.type != X.SelectionRequest:
+            return
+
+        prop = e.property if e.property != X.NONE else e.target  # Obsolete clients
+        target_name = self._display.get_atom_name(e.target)
+
+        if not self._owned:
+            prop = X.NONE
+        elif e.target == self._atoms['TARGETS']:
+            e.requestor.change_property(prop, Xatom.ATOM, 32, self._targets())
+        elif e.target == self._atoms['TIMESTAMP']:
+            e.requestor.change_property(prop, Xatom.INTEGER, 32, [X.CurrentTime])
+        elif target_name in self._data:
+            e.requestor.change_property(prop, e.target, 8, self._data[target_name])
+        else:
+            prop = X.NONE  # Unsupported target (including MULTIPLE)
+
+        notify = xevent.SelectionNotify(
+            time=e.time,
+            requestor=e.requestor,
+            selection=e.selection,
+            target=e.target,
+            property=prop,
+        )
+        e.requestor.send_event(notify, event_mask=0)
+        self._display.flush()
+
+
+class X11SelectionMonitor:
+    """
+    Count changes of the CLIPBOARD owner with XFixes notifications.
+
+    Every copy makes a client acquire the selection, so the count moves with
+    each new clipboard content. Queued notifications are drained without
+    blocking whenever the count is read; no thread or subprocess is needed.
+
+    Usage:
+        monitor = X11SelectionMonitor()
+        count = monitor.change_count()
+    """
+
+    def __init__(self, display_name: Optional[str] = None):
+        """
+        Connect to the X server and subscribe to clipboard owner changes.
+
+        Args:
+            display_name: X display to connect to. Uses $DISPLAY if not provided.
+
+        Raises:
+            ImportError: If python-xlib is not installed.
+            OSError: If the X server has no XFIXES extension.
+        """
+        if not XLIB_AVAILABLE:
+            raise ImportError(
+                "python-xlib is required to watch the clipboard. "
+                "Install with: pip install python-xlib"
+            )
+        self._display = xdisplay.Display(display_name)
+        if not self._display.has_extension('XFIXES'):
+            self._display.close()
+            raise OSError("X server does not support XFIXES")
+        # The version handshake is required before any other XFixes request
+        self._display.xfixes_query_version()
+        mask = (xfixes.XFixesSetSelectionOwnerNotifyMask
+                | xfixes.XFixesSelectionWindowDestroyNotifyMask
+                | xfixes.XFixesSelectionClientCloseNotifyMask)
+        self._display.xfixes_select_selection_input(
+            self._display.screen().root, self._display.intern_atom('CLIPBOARD'), mask
+        )
+        self._display.sync()
+        self._count = 0
+
+    def change_count(self) -> int:
+        """Get the number of clipboard owner changes seen so far."""
+        # Only the selected notifications arrive on this connection
+        for _ in range(self._display.pending_events()):
+            self._display.next_event()
+            self._count += 1
+        return self._count
+
+    def close(self) -> None:
+        """Close the X connection."""
+        self._display.close()
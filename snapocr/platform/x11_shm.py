@@ -0,0 +1,400 @@
+"""
+X11 MIT-SHM screen grabber.
+
+XGetImage (used by mss) sends every frame through the X socket and into a
+freshly allocated buffer. With the MIT-SHM extension the X server writes
+the pixels straight into a shared-memory segment instead. The grabber
+allocates one segment per monitor rectangle on first use and reuses it for
+every later grab, so a resident process (daemon mode, watch) does no
+per-frame allocation at all.
+
+The grabber mimics the small part of the mss API used by ``monitors.py``
+(``monitors`` and ``grab()`` returning an object with ``size`` and
+``bgra``), so it can be passed anywhere an ``mss.mss()`` instance is.
+It only works against a local X server and can be exercised headless
+under Xvfb (``xvfb-run python ...``).
+"""
+
+import ctypes
+import ctypes.util
+import threading
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+# X11 constants
+_Z_PIXMAP = 2
+_ALL_PLANES = 0xFFFFFFFFFFFFFFFF if ctypes.sizeof(ctypes.c_ulong) == 8 else 0xFFFFFFFF
+
+# System V IPC constants
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_RMID = 0
+
+
+class _XImage(ctypes.Structure):
+    """Leading fields of Xlib's XImage (only what is read here)."""
+
+    _fields_ = [
+        ('width', ctypes.c_int),
+        ('height', ctypes.c_int),
+        ('xoffset', ctypes.c_int),
+        ('format', ctypes.c_int),
+        ('data', ctypes.c_void_p),
+        ('byte_order', ctypes.c_int),
+        ('bitmap_unit', ctypes.c_int),
+        ('bitmap_bit_order', ctypes.c_int),
+        ('bitmap_pad', ctypes.c_int),
+        ('depth', ctypes.c_int),
+        ('bytes_per_line', ctypes.c_int),
+        ('bits_per_pixel', ctypes.c_int),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ('shmseg', ctypes.c_ulong),
+        ('shmid', ctypes.c_int),
+        ('shmaddr', ctypes.c_void_p),
+        ('readOnly', ctypes.c_int),
+    ]
+
+
+_ErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+# Loaded libraries (libX11, libXext, libc), or None until first use
+_libs = None
+
+# The Xlib error handler is process-wide; held while it is swapped for a checked call
+_error_handler_lock = threading.Lock()
+
+# Closed segments still mapped because frame arrays were viewing them
+_deferred: List['_Segment'] = []
+_deferred_lock = threading.Lock()
+
+
+def _load_libs():
+    """Load libX11, libXext and libc and declare the functions used."""
+    global _libs
+    if _libs is not None:
+        return _libs
+
+    libs = []
+    for name, soname in (('X11', 'libX11.so.6'), ('Xext', 'libXext.so.6'), ('c', 'libc.so.6')):
+        try:
+            # Load by soname first: find_library spawns ldconfig
+            libs.append(ctypes.CDLL(soname))
+        except OSError:
+            path = ctypes.util.find_library(name)
+            if not path:
+                raise OSError("libX11 and libXext are required for MIT-SHM capture")
+            libs.append(ctypes.CDLL(path))
+    x11, xext, libc = libs
+
+    x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    x11.XOpenDisplay.restype = ctypes.c_void_p
+    x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+    x11.XDefaultScreen.argtypes = [ctypes.c_void_p]
+    x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+    x11.XDefaultRootWindow.restype = ctypes.c_ulong
+    x11.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    x11.XDefaultVisual.restype = ctypes.c_void_p
+    x11.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    x11.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    x11.XDestroyImage.argtypes = [ctypes.POINTER(_XImage)]
+    x11.XSetErrorHandler.argtypes = [ctypes.c_void_p]
+    x11.XSetErrorHandler.restype = ctypes.c_void_p
+
+    xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+    xext.XShmCreateImage.argtypes = [
+        ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int,
+        ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint,
+    ]
+    xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+    xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+    xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+    xext.XShmGetImage.argtypes = [
+        ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XImage),
+        ctypes.c_int, ctypes.c_int, ctypes.c_ulong,
+    ]
+
+    libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+    libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+    libc.shmat.restype = ctypes.c_void_p
+    libc.shmdt.argtypes = [ctypes.c_void_p]
+    libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+    _libs = (x11, xext, libc)
+    return _libs
+
+
+def is_shm_available() -> bool:
+    """Check whether the libraries for MIT-SHM capture can be loaded."""
+    try:
+        _load_libs()
+        return True
+    except OSError:
+        return False
+
+
+class ShmFrame:
+    """
+    A grabbed frame backed by a shared-memory segment.
+
+    The pixel views are zero-copy and only valid until the next grab of
+    the same rectangle; copy them (``to_image()``, ``array().copy()``) to
+    keep a frame. A closed segment stays mapped while a view of it is
+    alive and is unmapped by a later close once the views are gone.
+    """
+
+    def __init__(self, segment: '_Segment'):
+        self._segment = segment
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Frame size as (width, height)."""
+        return self._segment.width, self._segment.height
+
+    @property
+    def bgra(self) -> memoryview:
+        """Raw BGRA pixels (zero-copy view of the segment)."""
+        return self._segment.view
+
+    def array(self):
+        """Get the pixels as a zero-copy NumPy array of shape (height, width, 4), BGRA order."""
+        import numpy as np
+        seg = self._segment
+        pixels = np.frombuffer(seg.view, dtype=np.uint8)
+        # Every view derived from the result keeps this base array alive
+        seg.track(pixels)
+        return pixels.reshape(seg.height, seg.width, 4)
+
+    def to_image(self):
+        """Convert the frame to a PIL RGB image (copies the pixels)."""
+        from PIL import Image
+        return Image.frombuffer('RGB', self.size, self.bgra, 'raw', 'BGRX', 0, 1)
+
+
+class _Segment:
+    """One shared-memory segment attached to the X server."""
+
+    def __init__(self, grabber: 'X11ShmGrabber', width: int, height: int):
+        x11, xext, libc = _load_libs()
+        dpy = grabber._display
+
+        self.width = width
+        self.height = height
+        self._info = _XShmSegmentInfo()
+        self._image = xext.XShmCreateImage(
+            dpy, grabber._visual, grabber._depth, _Z_PIXMAP, None,
+            ctypes.byref(self._info), width, height
+        )
+        if not self._image:
+            raise OSError("XShmCreateImage failed")
+
+        image = self._image.contents
+        if image.bits_per_pixel != 32 or image.bytes_per_line != width * 4:
+            self._destroy_image()
+            raise OSError(f"unsupported pixel layout ({image.bits_per_pixel} bpp)")
+
+        nbytes = image.bytes_per_line * height
+        self._info.shmid = libc.shmget(_IPC_PRIVATE, nbytes, _IPC_CREAT | 0o600)
+        if self._info.shmid < 0:
+            self._destroy_image()
+            raise OSError("shmget failed")
+
+        addr = libc.shmat(self._info.shmid, None, 0)
+        if addr in (None, ctypes.c_void_p(-1).value):
+            libc.shmctl(self._info.shmid, _IPC_RMID, None)
+            self._destroy_image()
+            raise OSError("shmat failed")
+        self._info.shmaddr = addr
+        self._info.readOnly = 0
+        image.data = addr
+
+        attached = grabber._checked(lambda: xext.XShmAttach(dpy, ctypes.byref(self._info)))
+        # Mark for removal now: the segment is freed once both sides detach
+        libc.shmctl(self._info.shmid, _IPC_RMID, None)
+        if not attached:
+            libc.shmdt(addr)
+            self._destroy_image()
+            raise OSError("XShmAttach failed (remote X server?)")
+
+        self.view = memoryview((ctypes.c_ubyte * nbytes).from_address(addr)).cast('B')
+        self._arrays: List[weakref.ref] = []  # Arrays handed out by ShmFrame.array()
+        self._grabber = grabber
+
+    def grab(self, x: int, y: int) -> bool:
+        """Copy the root window area at (x, y) into the segment."""
+        x11, xext, _ = _load_libs()
+        grabber = self._grabber
+        return grabber._checked(lambda: xext.XShmGetImage(
+            grabber._display, grabber._root, self._image, x, y, _ALL_PLANES
+        ))
+
+    def _destroy_image(self) -> None:
+        x11, _, _ = _load_libs()
+        if self._image:
+            self._image.contents.data = None
+            x11.XDestroyImage(self._image)
+            self._image = None
+
+    def track(self, array) -> None:
+        """Remember an array viewing the segment, so close() does not unmap it under it."""
+        self._arrays = [ref for ref in self._arrays if ref() is not None]
+        self._arrays.append(weakref.ref(array))
+
+    def _unmap(self) -> bool:
+        """Unmap the segment, unless NumPy arrays still view it."""
+        _, _, libc = _load_libs()
+        if any(ref() is not None for ref in self._arrays):
+            return False
+        try:
+            self.view.release()
+        except BufferError:
+            return False
+        libc.shmdt(self._info.shmaddr)
+        return True
+
+    def close(self) -> None:
+        x11, xext, _ = _load_libs()
+        xext.XShmDetach(self._grabber._display, ctypes.byref(self._info))
+        x11.XSync(self._grabber._display, 0)
+        self._destroy_image()
+        with _deferred_lock:
+            # Retry segments closed earlier whose arrays may be gone by now
+            _deferred[:] = [segment for segment in _deferred if not segment._unmap()]
+            if not self._unmap():
+                _deferred.append(self)
+
+
+class X11ShmGrabber:
+    """
+    Screen grabber reusing one MIT-SHM segment per monitor.
+
+    Usage:
+        grabber = X11ShmGrabber()
+        frame = grabber.grab(grabber.monitors[1])
+        pixels = frame.array()   # zero-copy (height, width, 4) BGRA
+        grabber.close()
+
+    ``with`` blocks do not close the grabber, so a long-lived instance
+    can stand in for ``mss.mss()`` and keep its segments between grabs.
+    """
+
+    # Segments kept for rectangles other than whole monitors
+    MAX_EXTRA_SEGMENTS = 4
+
+    def __init__(self, display_name: Optional[str] = None):
+        """
+        Open the display and check for the MIT-SHM extension.
+
+        Args:
+            display_name: X display to connect to. Uses $DISPLAY if not provided.
+
+        Raises:
+            OSError: If the libraries, the display or the extension are unavailable.
+        """
+        x11, xext, _ = _load_libs()
+        # Set before any early exit, so close() works on a half-initialized grabber
+        self._segments: Dict[Tuple[int, int], _Segment] = {}
+        self._monitor_sizes = set()
+        self._monitors: Optional[List[Dict[str, int]]] = None
+        self._error = False
+        self._error_handler = _ErrorHandler(self._on_error)
+
+        self._display = x11.XOpenDisplay(display_name.encode() if display_name else None)
+        if not self._display:
+            raise OSError("cannot open X display")
+        if not xext.XShmQueryExtension(self._display):
+            x11.XCloseDisplay(self._display)
+            self._display = None
+            raise OSError("X server does not support MIT-SHM")
+
+        screen = x11.XDefaultScreen(self._display)
+        self._root = x11.XDefaultRootWindow(self._display)
+        self._visual = x11.XDefaultVisual(self._display, screen)
+        self._depth = x11.XDefaultDepth(self._display, screen)
+        if self._depth not in (24, 32):
+            self.close()
+            raise OSError(f"unsupported screen depth {self._depth}")
+
+    def _on_error(self, display, event) -> int:
+        self._error = True
+        return 0
+
+    def _checked(self, call) -> bool:
+        """Run an Xlib call and sync, trapping X errors instead of exiting."""
+        x11, _, _ = _load_libs()
+        with _error_handler_lock:
+            self._error = False
+            previous = x11.XSetErrorHandler(ctypes.cast(self._error_handler, ctypes.c_void_p))
+            try:
+                ok = call()
+                x11.XSync(self._display, 0)
+            finally:
+                x11.XSetErrorHandler(previous)
+            return bool(ok) and not self._error
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        """Monitor list in mss layout (index 0 is the combined virtual screen)."""
+        if self._monitors is None:
+            import mss
+            with mss.mss() as sct:
+                self._monitors = [dict(m) for m in sct.monitors]
+            self._monitor_sizes = {(m['width'], m['height']) for m in self._monitors}
+        return self._monitors
+
+    def refresh(self) -> None:
+        """Drop cached monitors and segments (e.g. after a monitor layout change)."""
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+        self._monitors = None
+
+    def _get_segment(self, width: int, height: int) -> _Segment:
+        key = (width, height)
+        segment = self._segments.get(key)
+        if segment is None:
+            extra = [k for k in self._segments if k not in self._monitor_sizes]
+            if key not in self._monitor_sizes and len(extra) >= self.MAX_EXTRA_SEGMENTS:
+                self._segments.pop(extra[0]).close()
+            segment = _Segment(self, width, height)
+            self._segments[key] = segment
+        return segment
+
+    def grab(self, monitor: Dict[str, int]) -> ShmFrame:
+        """
+        Grab a screen rectangle.
+
+        Args:
+            monitor: Dict with left/top/width/height in root window coordinates.
+
+        Returns:
+            ShmFrame viewing the reused segment.
+
+        Raises:
+            OSError: If the grab fails (e.g. the rectangle is off screen).
+        """
+        if self._display is None:
+            raise OSError("grabber is closed")
+        self.monitors  # Make sure monitor sizes are known before choosing segments
+        segment = self._get_segment(monitor['width'], monitor['height'])
+        if not segment.grab(monitor['left'], monitor['top']):
+            raise OSError("XShmGetImage failed")
+        return ShmFrame(segment)
+
+    def close(self) -> None:
+        """Release all segments and close the display."""
+        if self._display is None:
+            return
+        x11, _, _ = _load_libs()
+        self.refresh()
+        x11.XCloseDisplay(self._display)
+        self._display = None
+
+    def __enter__(self) -> 'X11ShmGrabber':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass  # Kept open: segments are reused by the next grab
@@ -6,16 +6,22 @@ This module provides:
 - ResultPanel: Panel to display OCR results next to selection
 - ButtonBar: Action buttons (Pin, Accept, Cancel)
 - PinnedWindow: Floating always-on-top window for pinned screenshots
+- ResultDialog: Reusable result window with Pin/Accept/Cancel
+- UISession: Hidden Tk root shared by all windows, with pre-built windows
 """
 
 from .selection_overlay import SelectionOverlay
 from .result_panel import ResultPanel
 from .button_bar import ButtonBar
 from .pinned_window import PinnedWindow
+from .result_dialog import ResultDialog
+from .session import UISession
 
 __all__ = [
     'SelectionOverlay',
     'ResultPanel',
     'ButtonBar',
     'PinnedWindow',
+    'ResultDialog',
+    'UISession',
 ]
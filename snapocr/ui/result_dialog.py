@@ -0,0 +1,162 @@
+"""
+Result dialog with Pin/Accept/Cancel buttons.
+
+The dialog is built once on a Toplevel and withdrawn between captures;
+showing a result only replaces the text, moves the window and maps it.
+"""
+
+from typing import Callable, Optional
+
+
+class ResultDialog:
+    """Reusable result window shown after a capture with ``--ui``."""
+
+    # Panel size in pixels
+    WIDTH = 350
+    HEIGHT = 200
+    # Colors
+    BG_COLOR = '#2D2D2D'
+    TEXT_BG_COLOR = '#1E1E1E'
+    TEXT_COLOR = '#FFFFFF'
+    BORDER_COLOR = '#00BFFF'
+
+    def __init__(self, window):
+        """
+        Build the dialog on a window.
+
+        Args:
+            window: Tk Toplevel to build on; it is withdrawn until ``show()``.
+        """
+        import tkinter as tk
+        from tkinter import scrolledtext
+
+        window.withdraw()
+        window.title("SnapOCR Result")
+        window.configure(bg=self.BG_COLOR)
+        self._window = window
+        self._closed = tk.BooleanVar(master=window, value=True)
+        self._on_pin: Optional[Callable[[], None]] = None
+        self._on_accept: Optional[Callable[[], None]] = None
+        self.accepted = False
+
+        # Create border frame
+        border_frame = tk.Frame(window, bg=self.BORDER_COLOR, padx=2, pady=2)
+        border_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Main content frame
+        content_frame = tk.Frame(border_frame, bg=self.BG_COLOR)
+        content_frame.pack(fill=tk.BOTH, expand=True, padx=2, pady=2)
+
+        # Text display area
+        self._text_widget = scrolledtext.ScrolledText(
+            content_frame,
+            wrap=tk.WORD,
+            font=('Arial', 11),
+            bg=self.TEXT_BG_COLOR,
+            fg=self.TEXT_COLOR,
+            insertbackground=self.TEXT_COLOR,
+            selectbackground=self.BORDER_COLOR,
+            relief=tk.FLAT,
+            padx=10,
+            pady=10
+        )
+        self._text_widget.pack(fill=tk.BOTH, expand=True)
+        self._text_widget.config(state=tk.DISABLED)
+
+        # Button frame
+        button_frame = tk.Frame(content_frame, bg=self.BG_COLOR)
+        button_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        buttons = (
+            ("Pin", self._handle_pin, '#1565C0', '#1976D2'),
+            ("Accept", self._handle_accept, '#2E7D32', '#388E3C'),
+            ("Cancel", self._handle_cancel, '#C62828', '#D32F2F'),
+        )
+        for text, command, bg, active_bg in buttons:
+            tk.Button(
+                button_frame,
+                text=text,
+                command=command,
+                bg=bg,
+                fg='#FFFFFF',
+                activebackground=active_bg,
+                activeforeground='#FFFFFF',
+                relief=tk.FLAT,
+                padx=15,
+                font=('Arial', 10, 'bold')
+            ).pack(side=tk.LEFT, padx=5)
+
+        # Bind escape for cancel
+        window.bind('<Escape>', lambda e: self._handle_cancel())
+        window.protocol('WM_DELETE_WINDOW', self._handle_cancel)
+
+    def show(
+        self,
+        result: str,
+        x: int,
+        y: int,
+        on_pin: Optional[Callable[[], None]] = None,
+        on_accept: Optional[Callable[[], None]] = None
+    ) -> bool:
+        """
+        Show a result and wait until the dialog is closed.
+
+        Args:
+            result: Text to display.
+            x: Window left edge in screen coordinates.
+            y: Window top edge in screen coordinates.
+            on_pin: Called when Pin is clicked (the dialog stays open).
+            on_accept: Called when Accept is clicked, before the dialog closes.
+
+        Returns:
+            True if accepted, False if cancelled.
+        """
+        import tkinter as tk
+
+        self._on_pin = on_pin
+        self._on_accept = on_accept
+        self.accepted = False
+
+        text_widget = self._text_widget
+        text_widget.config(state=tk.NORMAL)
+        text_widget.delete('1.0', tk.END)
+        text_widget.insert(tk.END, result)
+        text_widget.config(state=tk.DISABLED)
+
+        window = self._window
+        window.geometry(f"{self.WIDTH}x{self.HEIGHT}+{x}+{y}")
+        window.attributes('-topmost', True)
+        self._closed.set(False)
+        window.deiconify()
+        window.focus_set()
+
+        window.wait_variable(self._closed)
+        return self.accepted
+
+    @property
+    def position(self):
+        """Current window position as (x, y)."""
+        return self._window.winfo_x(), self._window.winfo_y()
+
+    def _close(self) -> None:
+        """Hide the dialog for reuse and end ``show()``."""
+        self._window.withdraw()
+        self._on_pin = None
+        self._on_accept = None
+        self._closed.set(True)
+
+    def _handle_pin(self):
+        """Handle Pin button."""
+        if self._on_pin:
+            self._on_pin()
+
+    def _handle_accept(self):
+        """Handle Accept button - run the accept callback and close."""
+        if self._on_accept:
+            self._on_accept()
+        self.accepted = True
+        self._close()
+
+    def _handle_cancel(self):
+        """Handle Cancel button - just close."""
+        self._close()
@@ -2,27 +2,68 @@
 Full-screen overlay for region selection with dimming effect.
 
 This module provides an interactive selection overlay that:
-- Captures the full screen as background
-- Creates a semi-transparent dimmed overlay
+- Captures the monitor under the pointer as background
+- Shows the frozen screenshot dimmed, with the selection at full brightness
 - Highlights the selected region in real-time
+- Shows a magnifier loupe at the pointer
 - Returns selection coordinates and captured image
+
+All canvas items are created once. Dragging only moves them with
+``coords()`` and copies pixels between Tk photo images (done in C), and
+redraws are coalesced to the display refresh rate, so large displays
+stay smooth.
 """
 
 import os
 import tempfile
-from typing import Optional, Tuple, Callable
+from typing import Callable, List, Optional, Tuple
 
-from ..platform.base import SelectionResult
+from ..core.trace import span
+from ..platform.base import SelectionResult, region_path, remove_selection_files
+from ..platform.monitors import (
+    SCOPE_MONITOR,
+    crop_selection,
+    get_pointer_position,
+    grab_screen,
+    monitor_geometry,
+)
 
 
-class SelectionOverlay:
+def dim_image(image, opacity: float):
     """
-    Full-screen overlay for interactive region selection.
+    Darken an image as if covered by black at ``opacity``.
 
-    Features:
-    - Screen dimming with clear selection area
-    - Real-time selection rectangle
-    - Cross-platform tkinter implementation
+    Args:
+        image: PIL RGB image.
+        opacity: 0.0 (unchanged) to 1.0 (black).
+
+    Returns:
+        Darkened PIL image.
+    """
+    factor = 1.0 - opacity
+    try:
+        import numpy as np
+    except ImportError:
+        return image.point(lambda v: int(v * factor))
+
+    from PIL import Image
+    # Integer multiply-shift is cheaper than a float pass over every pixel
+    scale = int(factor * 256)
+    pixels = np.asarray(image, dtype=np.uint8)
+    dimmed = ((pixels.astype(np.uint16) * scale) >> 8).astype(np.uint8)
+    return Image.fromarray(dimmed, image.mode)
+
+
+class OverlayView:
+    """
+    Drawing and input handling of the selection overlay on a Toplevel.
+
+    The window and its canvas items are built once and withdrawn between
+    selections, so opening the overlay only swaps the screenshot images:
+    - the dimmed screenshot (background)
+    - a bright patch showing the selection undimmed
+    - the selection border and a size label
+    - the magnifier loupe and its frame
     """
 
     # Dimming opacity (0.0 to 1.0)
@@ -31,11 +72,337 @@ class SelectionOverlay:
     SELECTION_COLOR = '#00BFFF'  # Deep sky blue
     # Selection border width
     SELECTION_WIDTH = 2
+    # Redraw rate limit; Tk cannot query the display refresh rate
+    REFRESH_HZ = 60
+    # Magnifier loupe size in pixels, zoom factor, and whether it starts visible
+    LOUPE_SIZE = 120
+    LOUPE_ZOOM = 4
+    LOUPE_ENABLED = True
+    # Tk event state bit of the Shift key (shift-drag adds another region)
+    SHIFT_MASK = 0x0001
+
+    def __init__(self, window):
+        """
+        Build the overlay on a window.
+
+        Args:
+            window: Tk Toplevel to draw on; it is withdrawn until ``open()``.
+        """
+        import tkinter as tk
+
+        window.withdraw()
+        window.title("SnapOCR Selection")
+        window.configure(bg='black', cursor='cross')
+        self._window = window
+        self._frame_ms = max(1, int(1000 / self.REFRESH_HZ))
+        self._closed = tk.BooleanVar(master=window, value=True)
+        self._loupe_enabled = self.LOUPE_ENABLED
+        self._reset()
+
+        self._bright = None
+        self._dimmed = None
+        self._patch = tk.PhotoImage(master=window, width=1, height=1)
+        self._loupe = tk.PhotoImage(master=window, width=self.LOUPE_SIZE, height=self.LOUPE_SIZE)
+
+        canvas = tk.Canvas(window, bg='black', highlightthickness=0, cursor='cross')
+        canvas.pack(fill=tk.BOTH, expand=True)
+        self._canvas = canvas
+
+        self._background_id = canvas.create_image(0, 0, anchor='nw')
+        self._patch_id = canvas.create_image(0, 0, image=self._patch, anchor='nw', state='hidden')
+        self._border_id = canvas.create_rectangle(
+            0, 0, 0, 0, outline=self.SELECTION_COLOR,
+            width=self.SELECTION_WIDTH, state='hidden'
+        )
+        self._label_id = canvas.create_text(
+            0, 0, anchor='sw', fill=self.SELECTION_COLOR,
+            font=('Arial', 11), state='hidden'
+        )
+        self._loupe_id = canvas.create_image(0, 0, image=self._loupe, anchor='nw', state='hidden')
+        self._loupe_frame_id = canvas.create_rectangle(
+            0, 0, 0, 0, outline=self.SELECTION_COLOR, width=1, state='hidden'
+        )
+
+        canvas.bind('<ButtonPress-1>', self._on_press)
+        canvas.bind('<B1-Motion>', self._on_motion)
+        canvas.bind('<Motion>', self._on_motion)
+        canvas.bind('<ButtonRelease-1>', self._on_release)
+        canvas.bind('<ButtonPress-3>', self._on_cancel)  # Right-click
+        window.bind('<Escape>', self._on_cancel)
+        window.bind('<Return>', self._on_confirm)
+        window.bind('<KeyPress-z>', self._on_toggle_loupe)
+        window.protocol('WM_DELETE_WINDOW', lambda: self._finish(cancelled=True))
+
+    def _reset(self) -> None:
+        """Clear the selection state for a new selection."""
+        self._redraw_pending = False
+        self._pointer = None
+        self.start: Optional[Tuple[int, int]] = None
+        self.end: Optional[Tuple[int, int]] = None
+        self.regions: List[Tuple[int, int, int, int]] = []  # Completed boxes, window coordinates
+        self._region_items: List[int] = []
+        self._region_images = []
+        self.done = False
+        self.cancelled = False
+
+    def open(self, screen_img, monitor) -> None:
+        """
+        Show the overlay on a monitor with a frozen screenshot.
+
+        Returns once the window is visible and accepts input.
+
+        Args:
+            screen_img: PIL RGB image of ``monitor``.
+            monitor: Dict with left/top/width/height.
+        """
+        from PIL import Image, ImageTk
+
+        self._clear_regions()
+        self._reset()
+        self._origin = (monitor['left'], monitor['top'])
+        self._view_size = (monitor['width'], monitor['height'])
+
+        # Precompute bright and dimmed copies at display size once per selection
+        with span('overlay_prepare'):
+            display_img = screen_img
+            if screen_img.size != self._view_size:
+                # HiDPI: the screenshot has more pixels than the window has points
+                display_img = screen_img.resize(self._view_size, Image.BILINEAR)
+            self._bright = ImageTk.PhotoImage(display_img, master=self._window)
+            self._dimmed = ImageTk.PhotoImage(dim_image(display_img, self.DIM_OPACITY), master=self._window)
+
+        canvas = self._canvas
+        canvas.configure(width=monitor['width'], height=monitor['height'])
+        canvas.itemconfigure(self._background_id, image=self._dimmed)
+        for item in (self._patch_id, self._border_id, self._label_id,
+                     self._loupe_id, self._loupe_frame_id):
+            canvas.itemconfigure(item, state='hidden')
+
+        # Cover the grabbed monitor
+        window = self._window
+        window.geometry(monitor_geometry(monitor))
+        window.attributes('-fullscreen', True)
+        window.attributes('-topmost', True)
+        self._closed.set(False)
+        window.deiconify()
+        window.focus_force()
+        window.wait_visibility()
+        window.update_idletasks()
+
+    def wait(self) -> None:
+        """Process events until the selection is completed or cancelled."""
+        if not self._closed.get():
+            self._window.wait_variable(self._closed)
+
+    def _finish(self, cancelled: bool = False) -> None:
+        """Hide the window for reuse and end ``wait()``."""
+        self.cancelled = cancelled
+        self.done = not cancelled and bool(self.regions)
+        window = self._window
+        window.attributes('-fullscreen', False)
+        window.withdraw()
+        # Drop the screenshot images; only the window and items are kept
+        self._canvas.itemconfigure(self._background_id, image='')
+        self._clear_regions()
+        self._bright = None
+        self._dimmed = None
+        self._closed.set(True)
+
+    def _clear_regions(self) -> None:
+        """Delete the markers of completed regions."""
+        for item in self._region_items:
+            self._canvas.delete(item)
+        self._region_items = []
+        self._region_images = []
+
+    def _commit_region(self) -> None:
+        """Add the current box to the completed regions and mark it on screen."""
+        import tkinter as tk
+
+        left, top, right, bottom = self._selection_box()
+        if right - left < 1 or bottom - top < 1:
+            return
+        self.regions.append((left, top, right, bottom))
+
+        # Keep the region bright, outlined and numbered while further regions are drawn
+        canvas = self._canvas
+        patch = tk.PhotoImage(master=self._window, width=right - left, height=bottom - top)
+        patch.tk.call(patch, 'copy', self._bright, '-from', left, top, right, bottom, '-to', 0, 0)
+        self._region_images.append(patch)
+        self._region_items.extend((
+            canvas.create_image(left, top, image=patch, anchor='nw'),
+            canvas.create_rectangle(
+                left, top, right, bottom, outline=self.SELECTION_COLOR, width=self.SELECTION_WIDTH
+            ),
+            canvas.create_text(
+                left + 4, top + 2, anchor='nw', text=str(len(self.regions)),
+                fill=self.SELECTION_COLOR, font=('Arial', 12, 'bold')
+            ),
+        ))
+
+    def _on_press(self, event):
+        """Handle mouse press - start selection."""
+        self.start = (event.x, event.y)
+        self.end = None
+        self._pointer = (event.x, event.y)
+        self._schedule_redraw()
+
+    def _on_motion(self, event):
+        """Handle mouse motion - remember the position and redraw on the next frame."""
+        self._pointer = (event.x, event.y)
+        if self.start:
+            self.end = (event.x, event.y)
+        self._schedule_redraw()
+
+    def _on_release(self, event):
+        """Handle mouse release - complete selection, or add a region with Shift held."""
+        if not self.start:
+            return
+        self.end = (event.x, event.y)
+        self._commit_region()
+        if event.state & self.SHIFT_MASK:
+            self.start = None
+            self.end = None
+            for item in (self._patch_id, self._border_id, self._label_id):
+                self._canvas.itemconfigure(item, state='hidden')
+        else:
+            self._finish()
+
+    def _on_confirm(self, event):
+        """Handle Enter - finish with the regions added so far."""
+        if self.regions:
+            self._finish()
+
+    def _on_cancel(self, event):
+        """Handle escape key or right-click - cancel selection."""
+        self._finish(cancelled=True)
+
+    def _on_toggle_loupe(self, event):
+        """Show or hide the magnifier."""
+        self._loupe_enabled = not self._loupe_enabled
+        self._schedule_redraw()
+
+    def _schedule_redraw(self):
+        """Coalesce input events into at most one redraw per display frame."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self._window.after(self._frame_ms, self._redraw)
+
+    def _redraw(self):
+        """Move the existing canvas items to the current selection and pointer."""
+        self._redraw_pending = False
+        if self._closed.get():
+            return
+        canvas = self._canvas
+
+        if self.start and self.end:
+            left, top, right, bottom = self._selection_box()
+            if right > left and bottom > top:
+                # Copy the bright pixels under the selection into the patch (in Tcl, no Python loop)
+                self._patch.configure(width=right - left, height=bottom - top)
+                self._patch.tk.call(
+                    self._patch, 'copy', self._bright,
+                    '-from', left, top, right, bottom, '-to', 0, 0
+                )
+                canvas.coords(self._patch_id, left, top)
+                canvas.itemconfigure(self._patch_id, state='normal')
+            canvas.coords(self._border_id, left, top, right, bottom)
+            canvas.coords(self._label_id, left, max(top - 4, 14))
+            canvas.itemconfigure(self._label_id, text=f"{right - left} x {bottom - top}")
+            canvas.itemconfigure(self._border_id, state='normal')
+            canvas.itemconfigure(self._label_id, state='normal')
+            for item in (self._patch_id, self._border_id, self._label_id):
+                canvas.tag_raise(item)
+
+        self._draw_loupe()
+
+    def _draw_loupe(self):
+        """Render the magnifier next to the pointer with Tk's native zoomed copy."""
+        canvas = self._canvas
+        if not self._loupe_enabled or self._pointer is None:
+            canvas.itemconfigure(self._loupe_id, state='hidden')
+            canvas.itemconfigure(self._loupe_frame_id, state='hidden')
+            return
+
+        size = self.LOUPE_SIZE
+        zoom = self.LOUPE_ZOOM
+        half = size // zoom // 2
+        x, y = self._pointer
+        width, height = self._view_size
+        src_left = min(max(0, x - half), max(0, width - 2 * half))
+        src_top = min(max(0, y - half), max(0, height - 2 * half))
+
+        self._loupe.blank()
+        self._loupe.tk.call(
+            self._loupe, 'copy', self._bright,
+            '-from', src_left, src_top, src_left + 2 * half, src_top + 2 * half,
+            '-zoom', zoom, zoom, '-to', 0, 0
+        )
+
+        # Keep the loupe on screen: below-right of the pointer, flipped near edges
+        gap = 24
+        lx = x + gap if x + gap + size <= width else x - gap - size
+        ly = y + gap if y + gap + size <= height else y - gap - size
+        canvas.coords(self._loupe_id, lx, ly)
+        canvas.coords(self._loupe_frame_id, lx, ly, lx + size, ly + size)
+        canvas.itemconfigure(self._loupe_id, state='normal')
+        canvas.itemconfigure(self._loupe_frame_id, state='normal')
+        canvas.tag_raise(self._loupe_id)
+        canvas.tag_raise(self._loupe_frame_id)
+
+    def _selection_box(self) -> Tuple[int, int, int, int]:
+        """Selection as (left, top, right, bottom) in window coordinates."""
+        x1, y1 = self.start
+        x2, y2 = self.end
+        width, height = self._view_size
+        return (
+            max(0, int(min(x1, x2))), max(0, int(min(y1, y2))),
+            min(width, int(max(x1, x2))), min(height, int(max(y1, y2))),
+        )
+
+    def selection_boxes(self) -> List[Tuple[int, int, int, int]]:
+        """
+        Get the completed regions in the order they were selected.
+
+        Returns:
+            List of (left, top, right, bottom) in screen coordinates; empty if cancelled.
+        """
+        if self.cancelled or not self.done:
+            return []
+        ox, oy = self._origin
+        return [(left + ox, top + oy, right + ox, bottom + oy)
+                for left, top, right, bottom in self.regions]
+
+
+class SelectionOverlay:
+    """
+    Full-screen overlay for interactive region selection.
+
+    Features:
+    - Frozen screenshot dimmed, with the selection shown at full brightness
+    - Real-time selection rectangle with size label
+    - Magnifier loupe (toggle with Z)
+    - Cross-platform tkinter implementation
+    """
+
     # Minimum selection size
     MIN_SELECTION_SIZE = 5
 
-    def __init__(self):
-        """Initialize the selection overlay."""
+    def __init__(self, capture_scope: str = SCOPE_MONITOR, frame_source=None, ui=None):
+        """
+        Initialize the selection overlay.
+
+        Args:
+            capture_scope: SCOPE_MONITOR to grab only the monitor under the
+                pointer, or SCOPE_ALL for the whole virtual screen.
+            frame_source: Optional FrameRingBuffer to open on instead of grabbing.
+            ui: Optional UISession whose pre-built overlay window is reused.
+                A temporary session is used if not provided.
+        """
+        self._capture_scope = capture_scope
+        self.frame_source = frame_source
+        self.ui = ui
+        self.screen_listener = None
         self._temp_dir = tempfile.gettempdir()
         self._result: Optional[SelectionResult] = None
         self._callback: Optional[Callable[[SelectionResult], None]] = None
@@ -44,12 +411,32 @@ class SelectionOverlay:
         """Get a temporary file path for screenshot."""
         return os.path.join(self._temp_dir, 'snapocr_selection.png')
 
-    def select(self, callback: Optional[Callable[[SelectionResult], None]] = None) -> Optional[SelectionResult]:
+    def _buffered_frame(self):
+        """Get a snapshot of the frame source, or None to grab the live screen."""
+        return self.frame_source.snapshot() if self.frame_source is not None else None
+
+    def _notify_screen(self, screen_img, monitor, pointer) -> None:
+        """Pass the frozen screenshot to the screen listener, if any."""
+        if self.screen_listener is not None:
+            self.screen_listener(screen_img, monitor, pointer)
+
+    def select(
+        self,
+        callback: Optional[Callable[[SelectionResult], None]] = None,
+        open_grabber: Optional[Callable] = None,
+        temp_path: Optional[str] = None,
+        save: bool = True
+    ) -> Optional[SelectionResult]:
         """
         Show the selection overlay and wait for user to select a region.
 
         Args:
             callback: Optional callback to receive the selection result.
+            open_grabber: Optional callable returning a grabber for a ``with``
+                block (capture backend or mss instance). Uses mss if not provided.
+            temp_path: Where to save the selected region.
+            save: Whether to save the regions to files. Without saving,
+                results only carry the in-memory ``image`` (``image_path`` is empty).
 
         Returns:
             SelectionResult with the captured region, or None if cancelled.
@@ -58,224 +445,95 @@ class SelectionOverlay:
         self._result = None
 
         try:
-            import mss
-            import tkinter as tk
-            from PIL import Image, ImageTk
+            import tkinter  # noqa: F401
+            import PIL  # noqa: F401  (used by grab_screen)
+            if open_grabber is None:
+                import mss
+                open_grabber = mss.mss
         except ImportError as e:
             print(f"Error: Required libraries not available: {e}")
             return None
 
-        # Capture full screen
+        from .session import UISession
+
+        ui = self.ui or UISession()
+        try:
+            return self._select(ui, open_grabber, temp_path if save else None, save)
+        finally:
+            if ui is not self.ui:
+                ui.close()
+
+    def _select(
+        self, ui, open_grabber: Callable, temp_path: Optional[str], save: bool
+    ) -> Optional[SelectionResult]:
+        """Run one selection on a UI session."""
+        # The hidden root's pointer position picks the monitor to grab
+        pointer = get_pointer_position(ui.root)
+
+        # Capture the screen
         try:
-            with mss.mss() as sct:
-                # Get combined virtual screen (all monitors)
-                monitor = sct.monitors[0]  # All monitors combined
-                screenshot = sct.grab(monitor)
-                screen_img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
-                screen_width, screen_height = screenshot.size
+            sct = self._buffered_frame() or open_grabber()
+            backend = getattr(sct, 'name', 'mss')
+            with span('grab_screen', scope=self._capture_scope, backend=backend), sct:
+                screen_img, monitor = grab_screen(sct, pointer, self._capture_scope)
+                screen_width, screen_height = screen_img.size
         except Exception as e:
             print(f"Error capturing screen: {e}")
             return None
 
-        # Selection state
-        selection = {
-            'start': None,
-            'end': None,
-            'done': False,
-            'cancelled': False
-        }
-
-        # Create fullscreen window
-        root = tk.Tk()
-        root.title("SnapOCR Selection")
-        root.attributes('-fullscreen', True)
-        root.attributes('-topmost', True)
-        root.configure(bg='black', cursor='cross')
-
-        # Platform-specific transparency
-        if hasattr(root, 'attributes'):
-            # On macOS, use -transparent to allow click-through in dimmed areas
-            # On Windows/Linux, we use alpha blending
-            import platform
-            if platform.system() == 'Darwin':
-                # macOS: use standard alpha
-                root.attributes('-alpha', 0.3)
-            else:
-                root.attributes('-alpha', self.DIM_OPACITY)
-
-        # Create canvas covering the entire screen
-        canvas = tk.Canvas(
-            root,
-            width=screen_width,
-            height=screen_height,
-            bg='black',
-            highlightthickness=0
-        )
-        canvas.pack(fill=tk.BOTH, expand=True)
-
-        # Selection rectangle ID
-        selection_rect_id = [None]
-        dim_rect_ids = []  # IDs for dimmed areas
-
-        def draw_dimmed_overlay():
-            """Draw dimmed overlay outside selection area."""
-            # Clear previous dim rects
-            for rect_id in dim_rect_ids:
-                canvas.delete(rect_id)
-            dim_rect_ids.clear()
-
-            # If no selection yet, entire screen is dimmed
-            if not selection['start'] or not selection['end']:
-                return
-
-            x1, y1 = selection['start']
-            x2, y2 = selection['end']
-            left, top = min(x1, x2), min(y1, y2)
-            right, bottom = max(x1, x2), max(y1, y2)
-
-            # Draw semi-transparent overlay on areas outside selection
-            # Top strip
-            if top > 0:
-                rect = canvas.create_rectangle(
-                    0, 0, screen_width, top,
-                    fill='#000000',
-                    stipple='gray50',  # Creates semi-transparent effect
-                    outline='',
-                    tags='dim'
-                )
-                dim_rect_ids.append(rect)
-
-            # Bottom strip
-            if bottom < screen_height:
-                rect = canvas.create_rectangle(
-                    0, bottom, screen_width, screen_height,
-                    fill='#000000',
-                    stipple='gray50',
-                    outline='',
-                    tags='dim'
-                )
-                dim_rect_ids.append(rect)
-
-            # Left strip
-            if left > 0:
-                rect = canvas.create_rectangle(
-                    0, top, left, bottom,
-                    fill='#000000',
-                    stipple='gray50',
-                    outline='',
-                    tags='dim'
-                )
-                dim_rect_ids.append(rect)
-
-            # Right strip
-            if right < screen_width:
-                rect = canvas.create_rectangle(
-                    right, top, screen_width, bottom,
-                    fill='#000000',
-                    stipple='gray50',
-                    outline='',
-                    tags='dim'
-                )
-                dim_rect_ids.append(rect)
-
-        def on_press(event):
-            """Handle mouse press - start selection."""
-            selection['start'] = (event.x, event.y)
-            selection['end'] = None
-
-        def on_motion(event):
-            """Handle mouse motion - update selection rectangle."""
-            if selection['start']:
-                selection['end'] = (event.x, event.y)
-
-                # Delete previous selection rectangle
-                if selection_rect_id[0]:
-                    canvas.delete(selection_rect_id[0])
-
-                # Draw new selection rectangle
-                x1, y1 = selection['start']
-                x2, y2 = selection['end']
-
-                # Draw selection border
-                selection_rect_id[0] = canvas.create_rectangle(
-                    min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2),
-                    outline=self.SELECTION_COLOR,
-                    width=self.SELECTION_WIDTH,
-                    tags='selection'
-                )
-
-                # Update dimmed overlay
-                draw_dimmed_overlay()
-
-        def on_release(event):
-            """Handle mouse release - complete selection."""
-            if selection['start']:
-                selection['end'] = (event.x, event.y)
-                selection['done'] = True
-                root.destroy()
-
-        def on_escape(event):
-            """Handle escape key - cancel selection."""
-            selection['cancelled'] = True
-            root.destroy()
+        origin_x, origin_y = monitor['left'], monitor['top']
+        self._notify_screen(screen_img, monitor, pointer)
 
-        def on_right_click(event):
-            """Handle right-click - cancel selection."""
-            selection['cancelled'] = True
-            root.destroy()
+        # Cover the grabbed monitor with the frozen screenshot
+        with span('overlay_open'):
+            view = ui.overlay_view()
+            view.open(screen_img, monitor)
+        ui.mark_overlay_ready()
 
-        # Bind events
-        canvas.bind('<ButtonPress-1>', on_press)
-        canvas.bind('<B1-Motion>', on_motion)
-        canvas.bind('<ButtonRelease-1>', on_release)
-        canvas.bind('<Escape>', on_escape)
-        canvas.bind('<ButtonPress-3>', on_right_click)  # Right-click
-
-        # Also bind on the root for escape key
-        root.bind('<Escape>', on_escape)
+        print("Select a region with your mouse (drag to select, Esc to cancel, Z toggles magnifier)...")
 
         # Run the selection loop
-        root.mainloop()
-
-        # Check if cancelled or invalid
-        if selection['cancelled'] or not selection['done']:
+        with span('overlay'):
+            view.wait()
+
+        # Drop regions below the minimum size (stray clicks)
+        boxes = [
+            box for box in view.selection_boxes()
+            if box[2] - box[0] >= self.MIN_SELECTION_SIZE and box[3] - box[1] >= self.MIN_SELECTION_SIZE
+        ]
+        if not boxes:
             return None
 
-        if not selection['start'] or not selection['end']:
-            return None
-
-        # Calculate selection bounds
-        x1, y1 = selection['start']
-        x2, y2 = selection['end']
-        left = int(min(x1, x2))
-        top = int(min(y1, y2))
-        right = int(max(x1, x2))
-        bottom = int(max(y1, y2))
-
-        width = right - left
-        height = bottom - top
-
-        # Check minimum size
-        if width < self.MIN_SELECTION_SIZE or height < self.MIN_SELECTION_SIZE:
-            return None
-
-        # Crop the selected region from the full screen capture
+        # Crop the selected regions from the screen capture; a persistent
+        # grabber (capture backend) can also fill in parts outside the monitor
+        extension = sct if hasattr(sct, 'grab_image') else None
+        temp_path = temp_path or self._get_temp_path()
+        results = []
         try:
-            region_img = screen_img.crop((left, top, right, bottom))
-            temp_path = self._get_temp_path()
-            region_img.save(temp_path)
+            with span('save_png' if save else 'crop', regions=len(boxes)):
+                for i, (left, top, right, bottom) in enumerate(boxes):
+                    path = region_path(temp_path, i) if save else ''
+                    region_img = crop_selection(screen_img, monitor, (left, top, right, bottom), extension)
+                    if save:
+                        region_img.save(path)
+                    results.append(SelectionResult(
+                        image_path=path,
+                        rect=(left, top, right - left, bottom - top),
+                        screen_image=screen_img,
+                        screen_width=screen_width,
+                        screen_height=screen_height,
+                        screen_origin=(origin_x, origin_y),
+                        image=region_img
+                    ))
         except Exception as e:
             print(f"Error saving selection: {e}")
+            for result in results:
+                remove_selection_files(result)
             return None
 
-        # Create result
-        self._result = SelectionResult(
-            image_path=temp_path,
-            rect=(left, top, width, height),
-            screen_image=screen_img,
-            screen_width=screen_width,
-            screen_height=screen_height
-        )
+        # Create result: the first region, carrying the others
+        self._result = results[0]
+        self._result.regions = results[1:]
 
         if self._callback:
             self._callback(self._result)
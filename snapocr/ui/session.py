@@ -0,0 +1,81 @@
+"""
+Long-lived hidden Tk root shared by all SnapOCR windows.
+
+Every ``tk.Tk()`` starts a new Tcl interpreter and every new window has
+to be built and mapped from scratch, which adds up to a visible delay
+between the hotkey and the overlay. A UISession creates the hidden root
+once and builds the selection overlay and result dialog as withdrawn
+Toplevels that are only repositioned and shown when needed. In resident
+mode the session lives as long as the daemon.
+"""
+
+import time
+from typing import Optional
+
+from ..core.trace import span
+
+
+class UISession:
+    """Hidden Tk root with reusable, pre-built windows."""
+
+    def __init__(self):
+        """Initialize the session. Tk is started on first use."""
+        self._root = None
+        self._overlay_view = None
+        self._result_dialog = None
+        # time.time() when the overlay last became visible and interactive
+        self.last_overlay_ready: Optional[float] = None
+
+    @property
+    def root(self):
+        """Get the hidden Tk root, created on first use."""
+        if self._root is None:
+            import tkinter as tk
+            with span('tk_root'):
+                self._root = tk.Tk()
+                self._root.withdraw()
+        return self._root
+
+    def overlay_view(self):
+        """Get the selection overlay window, built on first use."""
+        if self._overlay_view is None:
+            import tkinter as tk
+            from .selection_overlay import OverlayView
+            with span('build_window', window='overlay'):
+                self._overlay_view = OverlayView(tk.Toplevel(self.root))
+        return self._overlay_view
+
+    def result_dialog(self):
+        """Get the result dialog window, built on first use."""
+        if self._result_dialog is None:
+            import tkinter as tk
+            from .result_dialog import ResultDialog
+            with span('build_window', window='result'):
+                self._result_dialog = ResultDialog(tk.Toplevel(self.root))
+        return self._result_dialog
+
+    def prebuild(self) -> None:
+        """Start Tk and build all windows ahead of the first capture."""
+        self.overlay_view()
+        self.result_dialog()
+        self.root.update_idletasks()
+
+    def mark_overlay_ready(self) -> None:
+        """Record that the overlay is visible and accepts input."""
+        self.last_overlay_ready = time.time()
+
+    def process_events(self) -> None:
+        """Handle pending Tk events (keeps pinned windows alive between captures)."""
+        if self._root is not None:
+            self._root.update()
+
+    def close(self) -> None:
+        """Destroy the root and every window built on it."""
+        if self._root is not None:
+            try:
+                self._root.destroy()
+            except Exception:
+                pass
+        self._root = None
+        self._overlay_view = None
+        self._result_dialog = None
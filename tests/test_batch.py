@@ -0,0 +1,156 @@
+"""Tests for resumable batch OCR with a manifest."""
+
+import json
+import os
+
+import pytest
+
+from snapocr.core.batch import BatchRunner, Manifest, input_root, iter_images
+from snapocr.core.ocr import Word
+
+
+class FakeRecognizer:
+    """Recognizes a file as its contents; records the calls."""
+
+    def __init__(self, fail=(), interrupt_after=None):
+        self.calls = []
+        self.fail = set(fail)
+        self.interrupt_after = interrupt_after
+
+    def __call__(self, path):
+        if self.interrupt_after is not None and len(self.calls) >= self.interrupt_after:
+            raise KeyboardInterrupt
+        self.calls.append(os.path.basename(path))
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        if content in self.fail:
+            raise RuntimeError(f"cannot read {content}")
+        return content.upper(), None
+
+
+def _images(folder, contents):
+    """Write small files standing in for images; returns the folder as batch inputs."""
+    os.makedirs(folder, exist_ok=True)
+    for name, content in contents.items():
+        with open(os.path.join(folder, name), 'w', encoding='utf-8') as f:
+            f.write(content)
+    return [str(folder)]
+
+
+def _run(tmp_path, inputs, recognize, params=None, **kwargs):
+    manifest = Manifest(str(tmp_path / 'manifest.db'))
+    runner = BatchRunner(
+        recognize, manifest, params or {'language': 'eng'}, workers=1, report=lambda message: None, **kwargs
+    )
+    try:
+        return runner.run(iter_images(inputs))
+    finally:
+        manifest.close()
+
+
+EIGHT_FILES = {f'{i}.png': 'abc'[i % 3] for i in range(8)}
+
+
+def test_duplicates_then_unchanged(tmp_path):
+    inputs = _images(tmp_path / 'in', EIGHT_FILES)
+
+    recognize = FakeRecognizer()
+    stats = _run(tmp_path, inputs, recognize)
+    assert (stats.files, stats.recognized, stats.duplicates, stats.failed) == (8, 3, 5, 0)
+    assert sorted(recognize.calls) == ['0.png', '1.png', '2.png']
+    with open(tmp_path / 'in' / '4.txt', encoding='utf-8') as f:
+        assert f.read() == 'B'
+
+    recognize = FakeRecognizer()
+    stats = _run(tmp_path, inputs, recognize)
+    assert (stats.recognized, stats.unchanged, stats.duplicates) == (0, 8, 0)
+    assert recognize.calls == []
+
+
+def test_same_content_under_new_name_is_not_recognized_again(tmp_path):
+    inputs = _images(tmp_path / 'in', {'a.png': 'x'})
+    _run(tmp_path, inputs, FakeRecognizer())
+
+    _images(tmp_path / 'in', {'copy.png': 'x'})
+    recognize = FakeRecognizer()
+    stats = _run(tmp_path, inputs, recognize)
+    assert (stats.recognized, stats.unchanged, stats.duplicates) == (0, 1, 1)
+    assert recognize.calls == []
+    with open(tmp_path / 'in' / 'copy.json', encoding='utf-8') as f:
+        assert json.load(f)['text'] == 'X'
+
+
+def test_changed_file_is_recognized_again(tmp_path):
+    inputs = _images(tmp_path / 'in', {'a.png': 'x'})
+    _run(tmp_path, inputs, FakeRecognizer())
+
+    _images(tmp_path / 'in', {'a.png': 'yy'})
+    recognize = FakeRecognizer()
+    stats = _run(tmp_path, inputs, recognize)
+    assert (stats.recognized, stats.unchanged) == (1, 0)
+
+
+def test_other_params_recognize_again(tmp_path):
+    inputs = _images(tmp_path / 'in', {'a.png': 'x', 'b.png': 'y'})
+    _run(tmp_path, inputs, FakeRecognizer(), {'language': 'eng'})
+
+    recognize = FakeRecognizer()
+    stats = _run(tmp_path, inputs, recognize, {'language': 'deu'})
+    assert stats.recognized == 2
+
+    # The first settings' results are still in the manifest
+    stats = _run(tmp_path, inputs, FakeRecognizer(), {'language': 'eng'})
+    assert stats.unchanged == 2
+
+
+def test_failures_are_not_recorded(tmp_path):
+    inputs = _images(tmp_path / 'in', {'a.png': 'x', 'b.png': 'bad'})
+    stats = _run(tmp_path, inputs, FakeRecognizer(fail={'bad'}))
+    assert (stats.recognized, stats.failed) == (1, 1)
+    assert not os.path.exists(tmp_path / 'in' / 'b.txt')
+
+    recognize = FakeRecognizer()
+    stats = _run(tmp_path, inputs, recognize)
+    assert (stats.recognized, stats.unchanged, stats.failed) == (1, 1, 0)
+    assert recognize.calls == ['b.png']
+
+
+def test_resume_after_interrupt(tmp_path):
+    inputs = _images(tmp_path / 'in', {f'{i}.png': str(i) for i in range(6)})
+    with pytest.raises(KeyboardInterrupt):
+        _run(tmp_path, inputs, FakeRecognizer(interrupt_after=2))
+
+    recognize = FakeRecognizer()
+    stats = _run(tmp_path, inputs, recognize)
+    assert (stats.recognized, stats.unchanged) == (4, 2)
+    assert sorted(recognize.calls) == ['2.png', '3.png', '4.png', '5.png']
+
+
+def test_output_dir_mirrors_input_folders(tmp_path):
+    _images(tmp_path / 'in' / 'a', {'scan.png': 'a'})
+    _images(tmp_path / 'in' / 'b', {'scan.png': 'b'})
+    inputs = [str(tmp_path / 'in' / 'a'), str(tmp_path / 'in' / 'b')]
+    out = tmp_path / 'out'
+    _run(tmp_path, inputs, FakeRecognizer(), output_dir=str(out), root=input_root(inputs))
+
+    for name in 'ab':
+        with open(out / name / 'scan.txt', encoding='utf-8') as f:
+            assert f.read() == name.upper()
+
+
+def test_words_are_kept_in_the_manifest(tmp_path):
+    inputs = _images(tmp_path / 'in', {'a.png': 'x', 'b.png': 'x'})
+    word = Word('X', 1, 2, 3, 4, 91.5, (1, 1, 1), 1)
+
+    def recognize(path):
+        return 'X', None, [word]
+
+    rows = []
+    _run(tmp_path, inputs, recognize, words=True, on_result=lambda *args: rows.append(args))
+    assert len(rows) == 2
+
+    # A re-run passes every path on again, with the words from the manifest
+    rows = []
+    stats = _run(tmp_path, inputs, FakeRecognizer(), words=True, on_result=lambda *args: rows.append(args))
+    assert stats.unchanged == 2
+    assert [row[2] for row in rows] == [('X', None, [word])] * 2
@@ -0,0 +1,63 @@
+"""Tests for cropping selections from grabbed monitors."""
+
+from PIL import Image
+
+from snapocr.platform.monitors import crop_selection, image_scale
+
+
+class FakeGrabber:
+    """Grabs a solid-colour image at a fixed scale."""
+
+    def __init__(self, color, scale):
+        self.color = color
+        self.scale = scale
+        self.grabbed = []
+
+    def grab_image(self, monitor):
+        self.grabbed.append(monitor)
+        size = (monitor['width'] * self.scale, monitor['height'] * self.scale)
+        return Image.new('RGB', size, self.color)
+
+
+def _screen(monitor, scale):
+    """Red monitor image with a blue pixel block at logical (10, 10)."""
+    image = Image.new('RGB', (monitor['width'] * scale, monitor['height'] * scale), 'red')
+    image.paste('blue', (10 * scale, 10 * scale, 20 * scale, 20 * scale))
+    return image
+
+
+def test_image_scale():
+    monitor = {'left': 0, 'top': 0, 'width': 100, 'height': 50}
+    assert image_scale(Image.new('RGB', (200, 100)), monitor) == (2.0, 2.0)
+    assert image_scale(Image.new('RGB', (100, 50)), monitor) == (1.0, 1.0)
+
+
+def test_crop_inside_monitor_hidpi():
+    monitor = {'left': 100, 'top': 0, 'width': 100, 'height': 50}
+    crop = crop_selection(_screen(monitor, 2), monitor, (110, 10, 120, 20))
+    assert crop.size == (20, 20)
+    assert crop.getpixel((0, 0)) == (0, 0, 255)
+
+
+def test_crop_extension_hidpi():
+    monitor = {'left': 100, 'top': 0, 'width': 100, 'height': 50}
+    grabber = FakeGrabber('green', scale=2)
+    # From the blue block on the grabbed monitor onto the monitor to its left
+    crop = crop_selection(_screen(monitor, 2), monitor, (90, 10, 120, 20), sct=grabber)
+
+    assert grabber.grabbed == [{'left': 90, 'top': 10, 'width': 30, 'height': 10}]
+    assert crop.size == (60, 20)
+    assert crop.getpixel((5, 5)) == (0, 128, 0)      # Live grab
+    assert crop.getpixel((25, 5)) == (255, 0, 0)     # Frozen red
+    assert crop.getpixel((45, 5)) == (0, 0, 255)     # Frozen blue block
+
+
+def test_crop_extension_mixed_scale():
+    monitor = {'left': 100, 'top': 0, 'width': 100, 'height': 50}
+    grabber = FakeGrabber('green', scale=1)
+    crop = crop_selection(_screen(monitor, 2), monitor, (90, 10, 120, 20), sct=grabber)
+
+    assert crop.size == (30, 10)
+    assert crop.getpixel((5, 5)) == (0, 128, 0)
+    assert crop.getpixel((15, 5)) == (255, 0, 0)
+    assert crop.getpixel((25, 5)) == (0, 0, 255)
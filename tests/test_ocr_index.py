@@ -0,0 +1,70 @@
+"""Tests for the background word index of the selection screenshot."""
+
+from concurrent.futures import wait
+
+from snapocr.core import ocr_index
+from snapocr.core.ocr import Word
+from snapocr.core.ocr_index import OCRIndex
+
+
+def _fake_extract_words(words_by_band):
+    """extract_words stand-in returning fixed words (band coordinates) per band top."""
+    def extract_words(band, language, tesseract_path, config):
+        return [
+            Word(text, left, top, width, height, 90.0, (1, 1, line))
+            for text, left, top, width, height, line in words_by_band.get(band.top, [])
+        ]
+    return extract_words
+
+
+class _Band:
+    """Crop result remembering which rows it came from."""
+
+    def __init__(self, top):
+        self.top = top
+
+
+class _Screen:
+    """Screenshot stand-in that records band crops."""
+
+    def __init__(self, size):
+        self.size = size
+
+    def crop(self, box):
+        return _Band(box[1])
+
+
+def _start(index, pointer):
+    """Start the index and let every band finish, so none is cancelled."""
+    index.start(pointer)
+    wait([tile.future for tile in index._tiles])
+
+
+def test_words_in_screen_points_hidpi(monkeypatch):
+    # 2x screenshot of a 400x200-point monitor at (1000, 500); words in image pixels
+    monkeypatch.setattr(ocr_index, 'extract_words', _fake_extract_words({
+        0: [('hello', 200, 100, 80, 20, 1), ('world', 300, 100, 80, 20, 1)],
+    }))
+    index = OCRIndex(_Screen((800, 300)), origin=(1000, 500), scale=(2.0, 2.0), workers=1)
+    _start(index, (1100, 550))
+
+    words = index.words_in((1090, 540, 200, 20))
+    index.close()
+
+    assert [w.text for w in words] == ['hello', 'world']
+    assert (words[0].left, words[0].top, words[0].width, words[0].height) == (1100, 550, 40, 10)
+
+
+def test_text_in_selects_bands_in_pixels(monkeypatch):
+    # Selection near the bottom of the monitor: its band is found from image rows
+    monkeypatch.setattr(ocr_index, 'extract_words', _fake_extract_words({
+        0: [('top', 10, 10, 40, 20, 1)],
+        288: [('bottom', 10, 400 - 288, 80, 20, 1)],
+    }))
+    screen = _Screen((800, 600))
+    index = OCRIndex(screen, origin=(0, 0), scale=(2.0, 2.0), workers=1)
+    _start(index, None)
+
+    assert index.text_in((0, 195, 100, 20)) == 'bottom'
+    assert index.text_in((0, 0, 100, 20)) == 'top'
+    index.close()
@@ -0,0 +1,114 @@
+"""Tests for overlap detection and stitching of scrolled frames."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from snapocr.core.scroll_capture import ScrollStitcher, find_shift, row_signatures
+
+
+WIDTH = 40
+HEIGHT = 60
+
+
+def _document(rows=400, seed=0):
+    """Tall page of random pixel rows, so every row is distinct."""
+    return np.random.default_rng(seed).integers(0, 256, size=(rows, WIDTH, 3), dtype=np.uint8)
+
+
+def _frame(page, top, header=None, footer=None):
+    """The visible window of the page scrolled to ``top``, with fixed bars painted over it."""
+    rows = page[top:top + HEIGHT].copy()
+    if header is not None:
+        rows[:len(header)] = header
+    if footer is not None:
+        rows[HEIGHT - len(footer):] = footer
+    return Image.fromarray(rows, 'RGB')
+
+
+def _stitch(frames):
+    """Feed frames to a stitcher and join everything it returns."""
+    stitcher = ScrollStitcher()
+    strips = [stitcher.add(frame) for frame in frames]
+    strips.append(stitcher.flush())
+    rows = [np.asarray(strip) for strip in strips if strip is not None]
+    stitched = np.concatenate(rows) if rows else np.empty((0, WIDTH, 3), dtype=np.uint8)
+    assert stitcher.height == len(stitched)
+    return stitcher, stitched
+
+
+@pytest.mark.parametrize('shift', [1, 17, 30, HEIGHT - 16])
+def test_find_shift_down_and_up(shift):
+    page = _document()
+    previous = row_signatures(_frame(page, 100))
+    assert find_shift(previous, row_signatures(_frame(page, 100 + shift))) == shift
+    assert find_shift(previous, row_signatures(_frame(page, 100 - shift))) == -shift
+
+
+def test_find_shift_unchanged():
+    page = _document()
+    frame = row_signatures(_frame(page, 50))
+    assert find_shift(frame, frame) == 0
+
+
+def test_find_shift_too_far():
+    page = _document()
+    previous = row_signatures(_frame(page, 0))
+    assert find_shift(previous, row_signatures(_frame(page, HEIGHT - 10))) is None
+    assert find_shift(previous, row_signatures(_frame(page, 200))) is None
+
+
+def test_stitch_plain_scroll():
+    page = _document()
+    stitcher, stitched = _stitch([_frame(page, top) for top in (0, 10, 35, 35, 70)])
+    assert np.array_equal(stitched, page[:70 + HEIGHT])
+    assert stitcher.gaps == 0
+
+
+def test_stitch_ignores_scrolling_back_up():
+    page = _document()
+    stitcher, stitched = _stitch([_frame(page, top) for top in (0, 30, 10, 30, 50)])
+    assert np.array_equal(stitched, page[:50 + HEIGHT])
+    assert stitcher.gaps == 0
+
+
+def test_stitch_sticky_header():
+    page = _document()
+    header = _document(8, seed=1)
+    frames = [_frame(page, top, header=header) for top in (0, 20, 45)]
+    stitcher, stitched = _stitch(frames)
+    # The header is kept once, above the rows scrolled under it
+    assert np.array_equal(stitched[:8], header)
+    assert np.array_equal(stitched[8:], page[8:45 + HEIGHT])
+
+
+def test_stitch_sticky_footer_flushed_last():
+    page = _document()
+    footer = _document(6, seed=2)
+    frames = [_frame(page, top, footer=footer) for top in (0, 20, 45)]
+    stitcher = ScrollStitcher()
+    strips = [stitcher.add(frame) for frame in frames]
+    body = np.concatenate([np.asarray(strip) for strip in strips if strip is not None])
+    assert np.array_equal(body, page[:45 + HEIGHT - 6])
+
+    # The footer is held back until the end and appears exactly once
+    tail = stitcher.flush()
+    assert np.array_equal(np.asarray(tail), footer)
+    assert stitcher.flush() is None
+    assert stitcher.height == len(body) + len(footer)
+
+
+def test_flush_without_scroll_returns_first_frame():
+    page = _document()
+    frame = _frame(page, 0)
+    stitcher, stitched = _stitch([frame, frame])
+    assert np.array_equal(stitched, page[:HEIGHT])
+
+
+def test_stitch_too_far_counts_gap():
+    page = _document()
+    stitcher, stitched = _stitch([_frame(page, top) for top in (0, 20, 200, 210)])
+    assert stitcher.gaps == 1
+    # Rows skipped over are missing; both visible runs are kept whole
+    assert np.array_equal(stitched[:20 + HEIGHT], page[:20 + HEIGHT])
+    assert np.array_equal(stitched[20 + HEIGHT:], page[200:210 + HEIGHT])
@@ -0,0 +1,51 @@
+"""Tests that the CLI entry point stays cheap to import."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from snapocr.core.startup import (
+    ENTRY_MODULE, HEAVY_MODULES, IMPORT_BUDGET_MS, measure_cold_import, total_import_ms,
+)
+
+
+# Repository root, so the child interpreter imports this checkout
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _imported_modules(module):
+    """Import a module in a fresh interpreter and get every module it loaded."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    assert result.returncode == 0, result.stderr
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            name = line.rsplit('|', 1)[1].strip()
+            if name != 'imported package':
+                modules.add(name)
+    return modules
+
+
+@pytest.mark.parametrize('heavy', HEAVY_MODULES)
+def test_main_does_not_import_heavy_modules(heavy):
+    modules = _imported_modules(ENTRY_MODULE)
+    assert ENTRY_MODULE in modules
+    assert not [name for name in modules if name == heavy or name.startswith(heavy + '.')]
+
+
+def test_main_imports_within_budget(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    # Best of a few cold imports, so a busy machine does not fail the budget
+    times = []
+    for _ in range(3):
+        timings = measure_cold_import(ENTRY_MODULE)
+        assert timings is not None
+        times.append(total_import_ms(ENTRY_MODULE, timings))
+    assert min(times) <= IMPORT_BUDGET_MS, f"{ENTRY_MODULE} imports in {min(times):.1f} ms"
@@ -0,0 +1,130 @@
+"""Tests for splitting image streams into frames and emitting their results."""
+
+import io
+import struct
+import threading
+
+import pytest
+from PIL import Image
+
+from snapocr.core import stream_filter
+from snapocr.core.stream_filter import StreamFilter, detect_framing, read_frames
+
+
+def _png(color, size=(8, 4)):
+    """Encode a small solid PNG."""
+    data = io.BytesIO()
+    Image.new('RGB', size, color).save(data, 'PNG')
+    return data.getvalue()
+
+
+def _stream(data):
+    """Buffered binary stream like sys.stdin.buffer."""
+    return io.BufferedReader(io.BytesIO(data))
+
+
+def _length_prefixed(*frames):
+    return b''.join(struct.pack('>I', len(frame)) + frame for frame in frames)
+
+
+def test_png_framing_splits_concatenated_files():
+    frames = [_png('red'), _png('green', (16, 9)), _png('blue')]
+    assert list(read_frames(_stream(b''.join(frames)), 'png')) == frames
+
+
+def test_length_framing():
+    frames = [_png('red'), b'not an image']
+    assert list(read_frames(_stream(_length_prefixed(*frames)), 'length')) == frames
+
+
+def test_detect_framing_does_not_consume():
+    png = _stream(_png('red') * 2)
+    assert detect_framing(png) == 'png'
+    assert len(list(read_frames(png))) == 2
+
+    prefixed = _stream(_length_prefixed(_png('red')))
+    assert detect_framing(prefixed) == 'length'
+    assert len(list(read_frames(prefixed))) == 1
+
+
+def test_empty_stream_has_no_frames():
+    assert list(read_frames(_stream(b''), 'auto')) == []
+
+
+@pytest.mark.parametrize('framing, data', [
+    ('png', _png('red')[:-6]),                                    # Inside the IEND chunk
+    ('png', _png('red') + _png('red')[:20]),                      # Second file cut short
+    ('length', struct.pack('>I', 100) + b'short'),
+    ('length', b'\x00\x00'),
+])
+def test_truncated_stream(framing, data):
+    with pytest.raises(ValueError):
+        list(read_frames(_stream(data), framing))
+
+
+def test_png_framing_rejects_other_data():
+    with pytest.raises(ValueError):
+        list(read_frames(_stream(_png('red') + b'garbage!' * 4), 'png'))
+
+
+def test_frame_size_limit(monkeypatch):
+    monkeypatch.setattr(stream_filter, 'MAX_FRAME_BYTES', 64)
+    with pytest.raises(ValueError, match='larger'):
+        list(read_frames(_stream(struct.pack('>I', 65)), 'length'))
+    with pytest.raises(ValueError, match='larger'):
+        list(read_frames(_stream(_png('red', (64, 64))), 'png'))
+
+
+def _recognizer(wait_for=None, release=None, gate=None):
+    """Recognizer returning the image colour; one colour waits until another was recognized."""
+    def recognize(image):
+        color = image.getpixel((0, 0))
+        if color == wait_for:
+            assert gate.wait(5)
+        if color == release:
+            gate.set()
+        return str(color), None
+    return recognize
+
+
+RED, BLUE = (255, 0, 0), (0, 0, 255)
+
+
+def test_ordered_emission_keeps_input_order():
+    gate = threading.Event()
+    emitted = []
+    frames = [_png('red'), _png('green'), _png('blue')]
+    stream = StreamFilter(_recognizer(RED, BLUE, gate), emitted.append, workers=3, ordered=True)
+    assert stream.run(iter(frames)) == 3
+    assert [result['frame'] for result in emitted] == [0, 1, 2]
+
+
+def test_unordered_emission_as_finished():
+    gate = threading.Event()
+    emitted = []
+
+    def emit(result):
+        emitted.append(result)
+        gate.set()  # The red frame finishes only after another frame was emitted
+
+    frames = [_png('red'), _png('blue')]
+    StreamFilter(_recognizer(RED, None, gate), emit, workers=2).run(iter(frames))
+    assert [result['frame'] for result in emitted] == [1, 0]
+
+
+def test_unreadable_frame_is_reported():
+    emitted = []
+    stream = StreamFilter(_recognizer(), emitted.append, workers=1)
+    stream.run(iter([b'not an image', _png('red')]))
+    assert stream.failed == 1
+    assert 'error' in emitted[0] and emitted[1]['text'] == '(255, 0, 0)'
+
+
+def test_emit_error_stops_the_run():
+    def emit(result):
+        raise BrokenPipeError
+
+    stream = StreamFilter(_recognizer(), emit, workers=1)
+    with pytest.raises(BrokenPipeError):
+        stream.run(iter([_png('red')] * 10))
+    assert stream.frames < 10